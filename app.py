@@ -1,10 +1,34 @@
 import time
 import json
+import hashlib
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
-import g4f
-from PyPDF2 import PdfReader
-import plotly.express as px
-import pandas as pd
+from response_cache import get_response_cache, make_key
+from pdf_extract import PDFLimitError, extract_text
+from llm_client import get_llm_client, iterate_sync, run_sync
+from skill_extractor import extract_profile, top_skill_names
+from match_scoring import score_match
+from resume_index import APPLICANT_POOL_ENABLED, get_resume_index
+from job_queue import DONE, FAILED, get_job_queue
+from prompt_budget import (compact_json, compress_job_description, compress_resume, get_usage_log,
+                           normalize_prompt, record_usage)
+from mcq_parser import QUESTIONS_PER_SKILL, parse_mcq_output
+from question_bank import get_question_bank, normalize_skill
+from metrics import METRICS_RESET_ENABLED, get_registry, start_metrics_server, timed
+from quiz_scoring import RESULT_COLUMNS, question_key, score_quiz
+from shared_cache import get_shared_cache
+from report_builder import FORMATS as REPORT_FORMATS, build_report, preview_text, quiz_section, text_section
+from warmup import start_warmup
+from similarity_cache import (REFRESH_THRESHOLD, REUSE_THRESHOLD, SIMILARITY_ENABLED, get_similarity_cache,
+                              input_diff)
+
+MODEL = "gpt-4o"
+TEMPERATURE = 0.6
+TOP_P = 0.9
+LLM_ERROR_PREFIXES = ("Chatbot: Error", "Chatbot: Sorry")
+MAX_QUIZ_SKILLS = 6
+MCQ_REPAIR_ATTEMPTS = 1
 
 #############################################
 # Custom CSS for Modern, Attractive UI
@@ -69,48 +93,250 @@ def local_css():
 # Utility Functions
 #############################################
 def extract_text_from_pdf(file):
-    """Extract text from a PDF file."""
-    pdf_reader = PdfReader(file)
-    text = ""
-    for page in pdf_reader.pages:
-        page_text = page.extract_text()
-        if page_text:
-            text += page_text
-    return text.strip()
-
-def generate_response(prompt):
-    """Generate a response using GPT-4 (via g4f)."""
-    try:
-        response = g4f.ChatCompletion.create(
-            model="gpt-4o",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.6,
-            top_p=0.9
-        )
-        return response.strip() if response else "Chatbot: Sorry, I didn't understand that."
-    except Exception as e:
-        return f"Chatbot: Error: {e}"
-
-def simulate_typing(text, delay=0.005):
-    """Simulate a typing effect in the Streamlit UI."""
-    message_placeholder = st.empty()
-    full_response = ""
-    for char in text:
-        full_response += char
-        time.sleep(delay)
-        message_placeholder.markdown(full_response + "▌")
-    message_placeholder.markdown(full_response)
+    """Extract text from a PDF file (cached by content hash, page-parallel for large files)."""
+    with timed("extract_text_from_pdf") as span:
+        text = extract_text(file)
+        span["chars"] = len(text)
+        return text
+
+def generate_response(prompt, use_cache=True, stream=False, label=None):
+    """Generate a response using GPT-4 (via the async g4f client), served from the response cache when possible.
+
+    With ``stream=True`` a generator of text chunks is returned instead of a string.
+    Token counts are recorded under ``label`` for the usage report.
+    """
+    # Prompt templates are indented with the code; the model does not need that.
+    prompt = normalize_prompt(prompt)
+    if stream:
+        return stream_response(prompt, use_cache=use_cache, label=label)
+    with timed("generate_response", label=label or "generate_response") as span:
+        span["prompt_chars"] = len(prompt)
+        cache = get_response_cache()
+        cache_key = make_key(MODEL, prompt, TEMPERATURE, TOP_P)
+        if use_cache:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                span.update(cached=True, response_chars=len(cached))
+                span.update(_usage_fields(record_usage(label, prompt, cached, cached=True)))
+                return cached
+        try:
+            with timed("llm_provider", label=label or "generate_response"):
+                response = run_sync(get_llm_client().complete(prompt, MODEL, TEMPERATURE, TOP_P))
+            # A blank reply is not an answer; it must not be cached as one.
+            response = (response or "").strip()
+            if not response:
+                span["error"] = True
+                return "Chatbot: Sorry, I didn't understand that."
+            cache.set(cache_key, response)
+            span["response_chars"] = len(response)
+            span.update(_usage_fields(record_usage(label, prompt, response)))
+            return response
+        except Exception as e:
+            span["error"] = True
+            return f"Chatbot: Error: {e}"
+
+def stream_response(prompt, use_cache=True, label=None):
+    """Yield response chunks as the provider produces them; the joined text is cached."""
+    with timed("generate_response", label=label or "generate_response") as span:
+        span["prompt_chars"] = len(prompt)
+        cache = get_response_cache()
+        cache_key = make_key(MODEL, prompt, TEMPERATURE, TOP_P)
+        if use_cache:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                span.update(cached=True, response_chars=len(cached))
+                span.update(_usage_fields(record_usage(label, prompt, cached, cached=True)))
+                yield cached
+                return
+        chunks = []
+        started = time.perf_counter()
+        try:
+            for chunk in iterate_sync(get_llm_client().stream(prompt, MODEL, TEMPERATURE, TOP_P)):
+                if not chunks:
+                    span["first_chunk_seconds"] = time.perf_counter() - started
+                chunks.append(chunk)
+                yield chunk
+        except Exception as e:
+            span["error"] = True
+            yield f"Chatbot: Error: {e}"
+            return
+        response = "".join(chunks).strip()
+        if not response:
+            span["error"] = True
+            yield "Chatbot: Sorry, I didn't understand that."
+            return
+        cache.set(cache_key, response)
+        span["response_chars"] = len(response)
+        span.update(_usage_fields(record_usage(label, prompt, response)))
+
+def _usage_fields(usage):
+    """Pick the token counts of a usage record for a metrics span."""
+    return {"prompt_tokens": usage["prompt_tokens"], "response_tokens": usage["response_tokens"]}
+
+def similar_response(label, inputs, input_names, prompt, stream=False, owner=None):
+    """Generate ``prompt`` unless the same or a near-duplicate ``inputs`` was analyzed before.
+
+    Exact repeats are served from the process-wide shared cache, so sessions
+    asking for the same analysis at once share a single generation. Near
+    duplicates are only looked up among earlier inputs of the same ``owner``
+    (see ``session_owner``), so one candidate never receives an analysis of
+    another's resume: one at or above ``REUSE_THRESHOLD`` is served as is,
+    and one at or above ``REFRESH_THRESHOLD`` is updated from a diff of the
+    inputs instead of being generated from scratch. Without an ``owner``
+    (batch screening) every input is generated on its own. ``input_names``
+    label the inputs in the refresh prompt.
+    """
+    shared = get_shared_cache()
+    shared_key = ("analysis", job_key(label, *inputs))
+    cached = shared.get(shared_key)
+    if cached is not None:
+        return iter([cached]) if stream else cached
+    derived = _derived_response(label, inputs, input_names, owner, stream)
+    if derived is not None:
+        return derived
+    # Only fresh generations go into the shared cache: they depend on nothing but the inputs.
+    if not stream:
+        return shared.get_or_compute(shared_key, lambda: _fresh_response(label, inputs, prompt, owner),
+                                     cache_if=lambda response: not response.startswith(LLM_ERROR_PREFIXES))
+    return shared.iter_or_compute(shared_key, lambda: _fresh_response(label, inputs, prompt, owner, stream=True),
+                                  cache_if=lambda text: text.strip() and not text.strip().startswith(LLM_ERROR_PREFIXES))
+
+def _derived_response(label, inputs, input_names, owner, stream):
+    """Reuse or refresh the owner's earlier analysis of near-duplicate inputs; ``None`` if there is none."""
+    if not SIMILARITY_ENABLED or owner is None:
+        return None
+    cache = get_similarity_cache()
+    kind = f"{label}:{MODEL}"
+    with timed("similarity_lookup", label=label) as span:
+        match = cache.lookup(kind, inputs, owner)
+        if match and match["similarity"] >= REUSE_THRESHOLD:
+            span["cached"] = True
+            cache.record("reused")
+            return iter([match["result"]]) if stream else match["result"]
+        if not match or match["similarity"] < REFRESH_THRESHOLD:
+            cache.record("misses")
+            return None
+        span["refreshed"] = 1
+        cache.record("refreshed")
+    response = generate_response(refresh_prompt(match, inputs, input_names), stream=stream, label=f"{label}_refresh")
+    return _store_similar(kind, inputs, owner, response, stream)
+
+def _fresh_response(label, inputs, prompt, owner, stream=False):
+    response = generate_response(prompt, stream=stream, label=label)
+    return _store_similar(f"{label}:{MODEL}", inputs, owner, response, stream)
+
+def _store_similar(kind, inputs, owner, response, stream):
+    """Index a generated analysis for the owner's later near-duplicate lookups; return ``response``."""
+    def store(text):
+        if SIMILARITY_ENABLED and owner is not None:
+            get_similarity_cache().store(kind, inputs, text, owner)
+
+    if not stream:
+        if not response.startswith(LLM_ERROR_PREFIXES):
+            store(response)
+        return response
+
+    def store_when_done(chunks):
+        parts = []
+        for chunk in chunks:
+            parts.append(chunk)
+            yield chunk
+        text = "".join(parts).strip()
+        if text and not text.startswith(LLM_ERROR_PREFIXES):
+            store(text)
+    return store_when_done(response)
+
+def refresh_prompt(match, inputs, input_names):
+    """Build the prompt that updates an earlier analysis to the changed inputs."""
+    changes = "\n\n".join(
+        f"Changes to the {name}:\n{input_diff(old, new) or '(unchanged)'}"
+        for name, old, new in zip(input_names, match["inputs"], inputs)
+    )
+    return f"""
+    Below is an analysis you wrote earlier, followed by the changes made since then to the {" and ".join(input_names)} it was based on, as unified diffs. Update the analysis so that it reflects these changes, keep everything that is still accurate, and reply with the complete updated analysis only.
+    
+    Previous analysis:
+    {match["result"]}
+    
+    {changes}
+    """
+
+def resume_fingerprint(resume_text):
+    """Return a stable fingerprint used to memoize per-resume results."""
+    return hashlib.sha256(resume_text.encode("utf-8")).hexdigest()
+
+def raise_on_llm_error(result):
+    """Turn the error replies of ``generate_response`` into exceptions so background jobs fail visibly."""
+    if isinstance(result, str):
+        if result.startswith(LLM_ERROR_PREFIXES):
+            raise RuntimeError(result)
+        return result
+
+    def checked(chunks):
+        for chunk in chunks:
+            if chunk.startswith(LLM_ERROR_PREFIXES):
+                raise RuntimeError(chunk)
+            yield chunk
+    return checked(result)
+
+def job_key(kind, *inputs):
+    """Return the deduplication key for a background job over ``inputs``."""
+    payload = json.dumps([kind, MODEL, TEMPERATURE, TOP_P, *inputs], ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def render_bar_chart(df, x, y, title, **options):
+    """Render a Plotly bar chart in the app's style; ``options`` are passed to ``px.bar``."""
+    import plotly.express as px
+
+    fig = px.bar(df, x=x, y=y, title=title, template="plotly_white", **options)
+    st.plotly_chart(fig)
+    return fig
+
+def session_owner():
+    """Return the id of this browser session, which scopes near-duplicate reuse to one uploader."""
+    return st.session_state.setdefault("owner_id", uuid.uuid4().hex)
+
+def start_job(slot, kind, key, task):
+    """Submit a background job and remember its id in session state under ``slot``."""
+    job_id = get_job_queue().submit(kind, key, task)
+    st.session_state.setdefault("jobs", {})[slot] = job_id
+    return job_id
+
+def render_job(job_id, poll_interval=0.1):
+    """Render a background job, showing streamed text as it arrives; return the result or ``None``.
+
+    Leaving the page only stops this polling loop; the job keeps running and
+    the page picks it up again on the next visit.
+    """
+    queue = get_job_queue()
+    placeholder = st.empty()
+    while True:
+        job = queue.get(job_id)
+        if job is None:
+            placeholder.warning("This result is no longer available. Please generate it again.")
+            return None
+        if job["status"] == DONE:
+            placeholder.markdown(job["result"])
+            return job["result"]
+        if job["status"] == FAILED:
+            placeholder.error(f"Generation failed: {job['error']}")
+            return None
+        placeholder.markdown((job["partial"] or "_Working on it..._") + "▌")
+        time.sleep(poll_interval)
 
 #############################################
 # Core Functionalities
 #############################################
-def analyze_resume(resume_text):
+def analyze_resume(resume_text, stream=False, owner=None):
     """Analyze resume text using GPT-4."""
+    detected_skills = ", ".join(top_skill_names(resume_text, limit=20)) or "None detected"
     prompt = f"""
     Analyze the following resume text and provide comprehensive insights on the candidate's skills, experience, education, and potential career opportunities:
     
     Resume Text:
-    {resume_text}
+    {compress_resume(resume_text)}
+    
+    Skills detected by keyword extraction: {detected_skills}
     
     Please provide a detailed analysis covering:
     1. Key Technical Skills
@@ -119,12 +345,25 @@ def analyze_resume(resume_text):
     4. Potential Career Growth Areas
     5. Recommended Skill Development Paths
     """
-    return generate_response(prompt)
+    return similar_response("analyze_resume", [resume_text], ["resume"], prompt, stream=stream, owner=owner)
 
-def generate_mcq_for_skills(resume_text):
-    """Generate multiple-choice questions (MCQs) for key skills extracted from the resume."""
+def generate_mcq_for_skills(resume_text, use_cache=True, skills=None):
+    """Generate multiple-choice questions (MCQs) for key skills extracted from the resume.
+
+    Pass ``skills`` to generate questions for just those skills.
+    """
+    if skills is None:
+        skills = top_skill_names(resume_text, limit=MAX_QUIZ_SKILLS)
+    if skills:
+        # Skills come from the local extractor, so the model only needs the
+        # compact list instead of the whole resume.
+        instructions = f"The candidate's key technical skills are: {', '.join(skills)}. For each of these skills"
+        resume_context = ""
+    else:
+        instructions = "Based on the following resume text, identify the candidate's key technical skills. For each key skill"
+        resume_context = f"Resume Text:\n    {compress_resume(resume_text)}"
     prompt = f"""
-    Based on the following resume text, identify the candidate's key technical skills. For each key skill, generate 3 multiple-choice questions (MCQs) that test the candidate's knowledge about that skill. Each question must have one correct answer and three plausible incorrect options.
+    {instructions}, generate {QUESTIONS_PER_SKILL} multiple-choice questions (MCQs) that test the candidate's knowledge about that skill. Each question must have one correct answer and three plausible incorrect options, and a difficulty of "easy", "medium" or "hard"; cover a range of difficulties.
 
     **IMPORTANT:** Output ONLY valid JSON (no explanations, no markdown) in the exact format below.
 
@@ -141,36 +380,109 @@ def generate_mcq_for_skills(resume_text):
                  "c": "Deletes an object",
                  "d": "None of the above"
              }},
-             "correct": "a"
+             "correct": "a",
+             "difficulty": "easy"
           }},
-          ... (2 more questions)
+          ... ({QUESTIONS_PER_SKILL - 1} more questions)
         ]
       }},
       ... (other skills)
     ]
 
-    Resume Text:
-    {resume_text}
+    {resume_context}
     """
-    return generate_response(prompt)
+    return generate_response(prompt, use_cache=use_cache, label="generate_mcq_for_skills")
+
+def generate_skill_questions(resume_text, skill, use_cache=True):
+    """Generate validated questions for a single skill, retrying once if they come back incomplete.
+
+    Returns the skill block, or ``None`` if no usable question was produced.
+    """
+    best = None
+    for attempt in range(1 + MCQ_REPAIR_ATTEMPTS):
+        response = generate_mcq_for_skills(resume_text, use_cache=use_cache and attempt == 0, skills=[skill])
+        if response.startswith(LLM_ERROR_PREFIXES):
+            continue
+        blocks = parse_mcq_output(response)["blocks"]
+        if blocks and (best is None or len(blocks[0]["questions"]) > len(best["questions"])):
+            best = {"skill": skill, "questions": blocks[0]["questions"]}
+        if best is not None and len(best["questions"]) >= QUESTIONS_PER_SKILL:
+            break
+    return best
+
+def generate_quiz(resume_text, use_cache=True):
+    """Assemble a validated quiz, serving known skills from the question bank.
+
+    Skills the bank cannot cover are generated one call per skill, all
+    concurrently, and the new questions are added to the bank. With
+    ``use_cache=False`` every skill is generated fresh. Returns the quiz as
+    JSON text; raises if no usable question was produced.
+    """
+    skills = top_skill_names(resume_text, limit=MAX_QUIZ_SKILLS)
+    blocks = {}
+    if not skills:
+        # Without detected skills the model has to pick them from the resume
+        # in one call; only the skills it got wrong are regenerated below.
+        parsed = parse_mcq_output(raise_on_llm_error(generate_mcq_for_skills(resume_text, use_cache=use_cache)))
+        skills = [block["skill"] for block in parsed["blocks"]]
+        skills += [skill for skill in parsed["incomplete_skills"] if skill not in skills]
+        blocks = {block["skill"]: block for block in parsed["blocks"]
+                  if len(block["questions"]) >= QUESTIONS_PER_SKILL}
+    bank = get_question_bank()
+    unseen = []
+    for skill in skills:
+        if skill in blocks:
+            continue
+        questions = bank.sample(skill, QUESTIONS_PER_SKILL) if use_cache else []
+        if len(questions) >= QUESTIONS_PER_SKILL:
+            blocks[skill] = {"skill": skill, "questions": questions}
+        else:
+            unseen.append(skill)
+    def generate(skill):
+        if not use_cache:
+            return generate_skill_questions(resume_text, skill, use_cache=False)
+        # Sessions that need the same skill at once share one generation; the
+        # question bank keeps the result, so it is not held in memory too.
+        return get_shared_cache().get_or_compute(("skill_questions", normalize_skill(skill)),
+                                                 lambda: generate_skill_questions(resume_text, skill),
+                                                 cache_if=lambda block: False)
+
+    if unseen:
+        with ThreadPoolExecutor(max_workers=len(unseen)) as executor:
+            generated = executor.map(generate, unseen)
+            for skill, block in zip(unseen, generated):
+                if block is not None:
+                    bank.add(skill, block["questions"])
+                    blocks[skill] = block
+    quiz = [blocks[skill] for skill in skills if skill in blocks]
+    if not quiz:
+        raise ValueError("No quiz questions could be generated.")
+    return compact_json(quiz)
 
 def parse_mcq_json(mcq_json_text):
-    """Parse the JSON output of the MCQs."""
-    try:
-        mcq_data = json.loads(mcq_json_text)
-        return mcq_data
-    except Exception as e:
-        st.error(f"JSON parsing error: {e}")
+    """Parse the JSON output of the MCQs, keeping every valid skill block."""
+    with timed("parse_mcq_json") as span:
+        parsed = parse_mcq_output(mcq_json_text)
+        span.update(chars=len(mcq_json_text), skills=len(parsed["blocks"]), error=not parsed["blocks"])
+    if not parsed["blocks"]:
+        st.error(f"JSON parsing error: {'; '.join(parsed['errors'])}")
         st.text_area("Raw MCQ JSON", mcq_json_text, height=300)
         return None
+    return parsed["blocks"]
 
-def suggest_learning_platforms(resume_text, mcq_data, score, total_questions):
+def suggest_learning_platforms(resume_text, mcq_data, score, total_questions, stream=False):
     """Generate personalized learning recommendations based on quiz performance."""
+    # Only the skill names and question texts matter here; options and answer
+    # keys would roughly triple the prompt size.
+    skills_tested = compact_json([
+        {"skill": block.get("skill"), "questions": [q.get("question") for q in block.get("questions", [])]}
+        for block in mcq_data
+    ])
     prompt = f"""
     Based on the following resume and MCQ test results, provide comprehensive learning platform recommendations:
 
     Resume Text:
-    {resume_text}
+    {compress_resume(resume_text)}
 
     MCQ Test Performance:
     - Total Questions: {total_questions}
@@ -178,7 +490,7 @@ def suggest_learning_platforms(resume_text, mcq_data, score, total_questions):
     - Performance Percentage: {(score/total_questions)*100:.2f}%
 
     Skills Tested:
-    {json.dumps(mcq_data, indent=2)}
+    {skills_tested}
 
     Please provide:
     1. A detailed analysis of the candidate's skill gaps
@@ -190,38 +502,39 @@ def suggest_learning_platforms(resume_text, mcq_data, score, total_questions):
     The recommendations should be comprehensive, actionable, and personalized. Consider both free and paid platforms, online courses, and certification programs.
     """
     try:
-        recommendations = generate_response(prompt)
+        recommendations = generate_response(prompt, stream=stream, label="suggest_learning_platforms")
         return recommendations
     except Exception as e:
         return f"Error generating recommendations: {e}"
 
-def generate_cover_letter(resume_text, job_description):
+def generate_cover_letter(resume_text, job_description, stream=False):
     """Generate a tailored cover letter based on resume and job description."""
     prompt = f"""
     Using the following resume and job description, generate a tailored cover letter for the candidate.
     
     Resume:
-    {resume_text}
+    {compress_resume(resume_text)}
     
     Job Description:
-    {job_description}
+    {compress_job_description(job_description)}
     
     Please include the candidate's key strengths, relevant experience, and motivation for the role.
     """
-    return generate_response(prompt)
+    return generate_response(prompt, stream=stream, label="generate_cover_letter")
 
-def analyze_job_description(resume_text, job_description):
+def analyze_job_description(resume_text, job_description, stream=False, owner=None):
     """Compare resume with a job description and suggest improvements."""
     prompt = f"""
     Compare the following resume and job description. Highlight how well the candidate's skills match the job requirements and provide suggestions on how to better align the resume with the job requirements.
     
     Resume:
-    {resume_text}
+    {compress_resume(resume_text)}
     
     Job Description:
-    {job_description}
+    {compress_job_description(job_description)}
     """
-    return generate_response(prompt)
+    return similar_response("analyze_job_description", [resume_text, job_description],
+                            ["resume", "job description"], prompt, stream=stream, owner=owner)
 
 #############################################
 # Main Application with Sidebar Navigation
@@ -231,6 +544,7 @@ def main():
     
     # Inject custom CSS for modern UI
     local_css()
+    start_metrics_server()
     
     # App header
     st.markdown("<h1 style='text-align: center;'>Modern Resume Analyzer & Learning Path</h1>", unsafe_allow_html=True)
@@ -239,25 +553,65 @@ def main():
     # Sidebar Navigation and File Uploads
     st.sidebar.title("Navigation")
     app_mode = st.sidebar.selectbox("Choose a Module", 
-                                    ["About", "Resume Analysis", "Skills Quiz", "Learning Recommendations", "Cover Letter Generator", "Job Description Analyzer", "Download Report"])
+                                    ["About", "Resume Analysis", "Skills Quiz", "Learning Recommendations", "Cover Letter Generator", "Job Description Analyzer", "Download Report", "Cohort Analytics", "Metrics"])
     
     st.sidebar.subheader("Upload Files")
     uploaded_resume = st.sidebar.file_uploader("Upload your resume (PDF or TXT)", type=["pdf", "txt"], key="resume")
     if uploaded_resume:
         if "resume_text" not in st.session_state:
+            resume_upload_text = ""
             if uploaded_resume.type == "application/pdf":
-                st.session_state.resume_text = extract_text_from_pdf(uploaded_resume)
+                try:
+                    resume_upload_text = extract_text_from_pdf(uploaded_resume)
+                except PDFLimitError as e:
+                    st.sidebar.error(f"Could not read resume: {e}")
             elif uploaded_resume.type == "text/plain":
-                st.session_state.resume_text = uploaded_resume.read().decode("utf-8")
+                resume_upload_text = uploaded_resume.read().decode("utf-8")
+                if not resume_upload_text.strip():
+                    st.sidebar.error("Could not read resume: the file is empty.")
+            # An empty resume is never stored, so no page sends it to the model.
+            if resume_upload_text.strip():
+                st.session_state.resume_text = resume_upload_text
     
     uploaded_job_desc = st.sidebar.file_uploader("Upload Job Description (optional)", type=["pdf", "txt"], key="jobdesc")
     job_desc_text = ""
     if uploaded_job_desc:
         if uploaded_job_desc.type == "application/pdf":
-            job_desc_text = extract_text_from_pdf(uploaded_job_desc)
+            try:
+                job_desc_text = extract_text_from_pdf(uploaded_job_desc)
+            except PDFLimitError as e:
+                st.sidebar.error(f"Could not read job description: {e}")
         elif uploaded_job_desc.type == "text/plain":
             job_desc_text = uploaded_job_desc.read().decode("utf-8")
     
+    cache_stats = get_response_cache().stats()
+    st.sidebar.caption(
+        f"Response cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+        f"({cache_stats['hit_rate'] * 100:.0f}% hit rate, {cache_stats['disk_entries']} stored)"
+    )
+    shared_stats = get_shared_cache().stats()
+    st.sidebar.caption(
+        f"Shared cache: {shared_stats['hits']} hits / {shared_stats['waits']} shared / {shared_stats['misses']} misses "
+        f"({shared_stats['bytes'] / 2 ** 20:.1f} of {shared_stats['max_bytes'] / 2 ** 20:.0f} MB)"
+    )
+    similarity_stats = get_similarity_cache().stats()
+    st.sidebar.caption(
+        f"Similar-input cache: {similarity_stats['reused']} reused / {similarity_stats['refreshed']} refreshed / "
+        f"{similarity_stats['misses']} misses ({similarity_stats['hit_rate'] * 100:.0f}% hit rate)"
+    )
+    usage_log = get_usage_log()
+    if usage_log:
+        with st.sidebar.expander("Token usage"):
+            import pandas as pd
+            st.dataframe(pd.DataFrame(usage_log[-20:][::-1])[["label", "prompt_tokens", "response_tokens", "cached"]])
+    
+    with timed("page", page=app_mode):
+        render_module(app_mode, job_desc_text, uploaded_resume)
+    # The first page is on screen; load what the other pages need in the background.
+    start_warmup()
+
+def render_module(app_mode, job_desc_text, uploaded_resume):
+    """Render the module selected in the sidebar."""
     # ------------------------ About Page ------------------------
     if app_mode == "About":
         st.markdown("<h2>About This App</h2>", unsafe_allow_html=True)
@@ -275,6 +629,75 @@ def main():
         - **Downloadable Report:** Compile all your insights and results into a downloadable report.
         """)
     
+    # ------------------------ Cohort Analytics ------------------------
+    if app_mode == "Cohort Analytics":
+        st.markdown("<h2>Cohort Analytics</h2>", unsafe_allow_html=True)
+        st.write("Skill-gap trends across every quiz submitted to this server.")
+        import pandas as pd
+        from cohort_store import PASS_PERCENTAGE, get_cohort_store
+
+        pass_percentage = st.slider("Pass mark per skill (%)", 0, 100, PASS_PERCENTAGE, step=5)
+        started = time.perf_counter()
+        cohort = get_cohort_store().summary(pass_percentage)
+        elapsed = time.perf_counter() - started
+        if not cohort["attempts"]:
+            st.info("No quiz attempts have been recorded yet.")
+            return
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Attempts", f"{cohort['attempts']:,}")
+        col2.metric("Answers", f"{cohort['answers']:,}")
+        col3.metric("Median Score", f"{cohort['percentiles'][50]:.0f}%")
+        st.caption(f"Aggregated in {elapsed * 1000:.0f} ms.")
+        skills_df = cohort["skills"]
+        render_bar_chart(skills_df.rename(columns={"skill": "Skill", "pass_rate": "Pass Rate (%)"}),
+                         x="Skill", y="Pass Rate (%)",
+                         title=f"Pass Rate by Skill (pass mark {pass_percentage}%)",
+                         range_y=[0, 100],
+                         color="Skill",
+                         hover_data=["attempts", "mean_percentage"])
+        render_bar_chart(cohort["distribution"], x="range", y="attempts",
+                         title="Score Distribution",
+                         labels={"range": "Score", "attempts": "Attempts"})
+        st.subheader("Score Percentiles")
+        st.dataframe(pd.DataFrame([{f"p{p}": f"{value:.1f}%" for p, value in cohort["percentiles"].items()}]))
+        st.dataframe(skills_df.rename(columns={"skill": "Skill", "attempts": "Attempts", "pass_rate": "Pass Rate (%)",
+                                               "mean_percentage": "Mean Score (%)"}).round(1))
+        return
+
+    # ------------------------ Metrics ------------------------
+    if app_mode == "Metrics":
+        st.markdown("<h2>Metrics</h2>", unsafe_allow_html=True)
+        st.write("Latency, cache hits and error rates of model calls, PDF extraction, quiz parsing and page renders since the server started.")
+        registry = get_registry()
+        summary = registry.summary()
+        if not summary:
+            st.info("Nothing has been recorded yet.")
+            return
+        import pandas as pd
+
+        metrics_df = pd.DataFrame(summary)
+        metrics_df.insert(0, "operation", [
+            " / ".join(str(row[key]) for key in ("op", "label", "page") if row.get(key)) for row in summary
+        ])
+        st.dataframe(metrics_df.drop(columns=[c for c in ("op", "label", "page") if c in metrics_df]))
+        render_bar_chart(metrics_df.melt(id_vars="operation", value_vars=["p50_ms", "p95_ms", "p99_ms"]),
+                         x="operation", y="value", title="Latency by Operation (ms)",
+                         color="variable", barmode="group", labels={"value": "ms", "operation": "Operation"})
+        route_stats = getattr(get_llm_client().provider, "tracker", None)
+        if route_stats is not None:
+            st.subheader("Provider Routes")
+            st.dataframe(pd.DataFrame(route_stats.stats()))
+        prometheus = registry.prometheus_text()
+        with st.expander("Prometheus text"):
+            st.code(prometheus, language="text")
+        st.download_button("Download Prometheus metrics", data=prometheus, file_name="metrics.prom", mime="text/plain")
+        if registry.trace_path:
+            st.caption(f"Every span is also appended to {registry.trace_path}.")
+        # Metrics are server-wide, so one session may only wipe them when the operator allows it.
+        if METRICS_RESET_ENABLED and st.button("Reset metrics"):
+            registry.reset()
+        return
+
     # For modules requiring a resume upload, warn the user if not available.
     if app_mode != "About" and "resume_text" not in st.session_state:
         st.warning("Please upload your resume using the sidebar to continue.")
@@ -287,109 +710,120 @@ def main():
         st.markdown("<h2>Resume Analysis</h2>", unsafe_allow_html=True)
         st.subheader("Extracted Resume Text")
         st.text_area("Resume Content", resume_text, height=300)
+        
+        # Skill chart from the local extractor; no LLM call needed.
+        profile = extract_profile(resume_text)
+        if profile["skills"]:
+            st.subheader("Detected Skills")
+            import pandas as pd
+            skills_df = pd.DataFrame([
+                {"Skill": skill["name"], "Category": skill["category"], "Mentions": skill["count"]}
+                for skill in profile["skills"]
+            ])
+            render_bar_chart(skills_df, x="Skill", y="Mentions",
+                             title="Skills Detected in Resume",
+                             color="Category")
+        
         if st.button("Analyze Resume"):
-            with st.spinner("Analyzing your resume..."):
-                analysis = analyze_resume(resume_text)
+            owner = session_owner()
+            start_job("resume_analysis", "resume_analysis", job_key("resume_analysis", resume_text, owner),
+                      lambda: raise_on_llm_error(analyze_resume(resume_text, stream=True, owner=owner)))
+        job_id = st.session_state.get("jobs", {}).get("resume_analysis")
+        if job_id:
             st.subheader("Analysis Result")
-            simulate_typing(analysis)
+            result = render_job(job_id)
+            if result is not None:
+                st.session_state.resume_analysis = result
     
     # ------------------------ Skills Quiz ------------------------
     if app_mode == "Skills Quiz":
         st.markdown("<h2>Skills Assessment Quiz</h2>", unsafe_allow_html=True)
-        st.info("Generating a quiz based on your resume skills...")
-        with st.spinner("Generating skills quiz..."):
-            mcq_json_text = generate_mcq_for_skills(resume_text)
+        # The quiz is generated once per resume and kept in session state so that
+        # widget toggles and the form submit rerun against the same questions.
+        fingerprint = resume_fingerprint(resume_text)
+        regenerate = st.button("Regenerate Quiz")
+        quiz = st.session_state.get("quiz")
+        if regenerate or quiz is None or quiz["fingerprint"] != fingerprint:
+            # A regenerated quiz gets a fresh job key so it is not deduplicated
+            # against the previous one.
+            key = job_key("quiz", resume_text, time.time() if regenerate else None)
+            job_id = get_job_queue().submit(
+                "quiz", key, lambda: generate_quiz(resume_text, use_cache=not regenerate)
+            )
+            quiz = {"fingerprint": fingerprint, "job_id": job_id, "raw": None, "mcq_data": None}
+            st.session_state.quiz = quiz
+        if quiz["raw"] is None:
+            st.info("Generating a quiz based on your resume skills...")
+            with st.spinner("Generating skills quiz..."):
+                job = get_job_queue().wait(quiz["job_id"])
+            if job is None or job["status"] != DONE:
+                st.error(f"Quiz generation failed: {job['error'] if job else 'job not found'}. Use Regenerate Quiz to try again.")
+            else:
+                quiz["raw"] = job["result"]
+        mcq_json_text = quiz["raw"] or ""
         if st.checkbox("Show raw MCQ JSON output for debugging"):
             st.text_area("Raw MCQ JSON", mcq_json_text, height=300)
         
-        mcq_data = parse_mcq_json(mcq_json_text)
+        mcq_data = parse_mcq_json(mcq_json_text) if mcq_json_text else None
+        quiz["mcq_data"] = mcq_data
         if mcq_data:
             st.write("Answer the following questions:")
             quiz_form = st.form("quiz_form")
             for skill_block in mcq_data:
                 skill_name = skill_block.get("skill", "Unknown Skill")
-                skill_key = skill_name.replace(" ", "_")
                 quiz_form.markdown(f"<h3>Skill: {skill_name}</h3>", unsafe_allow_html=True)
                 questions = skill_block.get("questions", [])
                 for idx, q in enumerate(questions):
-                    q_key = f"{skill_key}_{idx}"
-                    quiz_form.markdown(f"<b>Question:</b> {q.get('question', 'No question provided')}", unsafe_allow_html=True)
+                    q_key = question_key(skill_name, idx)
+                    difficulty = f" ({q['difficulty']})" if q.get("difficulty") else ""
+                    quiz_form.markdown(f"<b>Question{difficulty}:</b> {q.get('question', 'No question provided')}", unsafe_allow_html=True)
                     options = q.get("options", {})
                     options_display = { key: f"{key}) {value}" for key, value in options.items() }
                     quiz_form.radio("Select an answer:", list(options_display.keys()),
-                                    index=0, format_func=lambda x: options_display[x],
+                                    index=0, format_func=lambda x, display=options_display: display[x],
                                     key=q_key)
                     quiz_form.markdown("<hr>", unsafe_allow_html=True)
             submitted = quiz_form.form_submit_button("Submit Answers")
             if submitted:
-                score = 0
-                question_count = 0
-                detailed_results = []
-                skill_scores = {}
+                scored = score_quiz(mcq_data, st.session_state)
+                results = scored["results"]
                 st.markdown("<h3>Quiz Results</h3>", unsafe_allow_html=True)
-                for skill_block in mcq_data:
-                    skill_name = skill_block.get("skill", "Unknown Skill")
-                    skill_key = skill_name.replace(" ", "_")
-                    questions = skill_block.get("questions", [])
-                    for idx, q in enumerate(questions):
-                        question_count += 1
-                        q_key = f"{skill_key}_{idx}"
-                        user_answer = st.session_state.get(q_key)
-                        correct_answer = q.get("correct", "").lower()
-                        question_text = q.get("question", "No question provided")
-                        result = {
-                            "skill": skill_name,
-                            "question": question_text,
-                            "user_answer": user_answer,
-                            "correct_answer": correct_answer
-                        }
-                        st.markdown(f"<b>Question:</b> {question_text}", unsafe_allow_html=True)
-                        if user_answer == correct_answer:
-                            score += 1
-                            st.success(f"Your answer: {user_answer} (Correct)")
-                            result["status"] = "Correct"
-                            skill_scores.setdefault(skill_name, {"correct": 0, "total": 0})
-                            skill_scores[skill_name]["correct"] += 1
-                        else:
-                            st.error(f"Your answer: {user_answer} (Incorrect). Correct answer: {correct_answer}")
-                            result["status"] = "Incorrect"
-                            skill_scores.setdefault(skill_name, {"correct": 0, "total": 0})
-                        skill_scores[skill_name]["total"] = skill_scores[skill_name].get("total", 0) + 1
-                        detailed_results.append(result)
-                        st.markdown("<hr>", unsafe_allow_html=True)
-                performance_percentage = (score / question_count) * 100
-                st.info(f"Overall Score: {score} out of {question_count} ({performance_percentage:.2f}%)")
-                if performance_percentage >= 80:
+                # One markdown element for the whole result list instead of
+                # three Streamlit calls per question.
+                st.markdown("\n".join(
+                    f"<p><b>Question:</b> {question}<br>" + (
+                        f"<span style='color: #1e7e34;'>&#10004; Your answer: {user_answer} (Correct)</span>"
+                        if correct else
+                        f"<span style='color: #c82333;'>&#10008; Your answer: {user_answer} (Incorrect). "
+                        f"Correct answer: {correct_answer}</span>"
+                    ) + "</p><hr>"
+                    for question, user_answer, correct_answer, correct in zip(
+                        results["question"], results["user_answer"], results["correct_answer"], results["is_correct"])
+                ), unsafe_allow_html=True)
+                st.info(f"Overall Score: {scored['score']} out of {scored['total']} ({scored['percentage']:.2f}%)")
+                if scored["percentage"] >= 80:
                     st.balloons()
-                    performance_rating = "Excellent"
-                elif performance_percentage >= 60:
-                    performance_rating = "Good"
-                elif performance_percentage >= 40:
-                    performance_rating = "Average"
-                else:
-                    performance_rating = "Needs Improvement"
-                st.markdown(f"<h4>Performance Rating: {performance_rating}</h4>", unsafe_allow_html=True)
+                st.markdown(f"<h4>Performance Rating: {scored['rating']}</h4>", unsafe_allow_html=True)
                 
-                if skill_scores:
-                    df = pd.DataFrame([
-                        {"Skill": skill,
-                         "Correct": data["correct"],
-                         "Total": data["total"],
-                         "Percentage": (data["correct"] / data["total"]) * 100}
-                        for skill, data in skill_scores.items()
-                    ])
-                    fig = px.bar(df, x="Skill", y="Percentage",
-                                 title="Skill-wise Performance (%)",
-                                 text="Percentage",
-                                 range_y=[0, 100],
-                                 color="Skill",
-                                 template="plotly_white")
-                    st.plotly_chart(fig)
+                skills_df = scored["skills"]
+                if not skills_df.empty:
+                    render_bar_chart(skills_df.rename(columns={"skill": "Skill", "percentage": "Percentage"}),
+                                     x="Skill", y="Percentage",
+                                     title="Skill-wise Performance (%)",
+                                     text="Percentage",
+                                     range_y=[0, 100],
+                                     color="Skill")
+                detailed_results = results[RESULT_COLUMNS].to_dict("records")
+                # Every submission feeds the cohort analytics dashboard.
+                from cohort_store import get_cohort_store
+                attempt_id = get_cohort_store().record_attempt(detailed_results)
                 st.session_state.quiz_results = {
-                    "score": score,
-                    "total": question_count,
+                    "attempt_id": attempt_id,
+                    "score": scored["score"],
+                    "total": scored["total"],
                     "detailed_results": detailed_results,
-                    "skill_scores": skill_scores
+                    "skill_scores": {row.skill: {"correct": int(row.correct), "total": int(row.total)}
+                                     for row in skills_df.itertuples()}
                 }
     
     # ------------------------ Learning Recommendations ------------------------
@@ -399,15 +833,18 @@ def main():
             st.warning("Please complete the Skills Quiz first.")
         else:
             quiz_results = st.session_state.quiz_results
-            with st.spinner("Generating personalized learning recommendations..."):
-                recommendations = suggest_learning_platforms(
-                    resume_text,
-                    mcq_data if 'mcq_data' in locals() else [],
-                    quiz_results["score"],
-                    quiz_results["total"]
-                )
-            simulate_typing(recommendations)
-            st.session_state.recommendations = recommendations
+            mcq_data = (st.session_state.get("quiz") or {}).get("mcq_data") or []
+            # Deduplicated by inputs, so revisiting the page reuses the same job.
+            job_id = start_job(
+                "recommendations", "recommendations",
+                job_key("recommendations", resume_text, mcq_data, quiz_results["score"], quiz_results["total"]),
+                lambda: raise_on_llm_error(suggest_learning_platforms(
+                    resume_text, mcq_data, quiz_results["score"], quiz_results["total"], stream=True
+                ))
+            )
+            recommendations = render_job(job_id)
+            if recommendations is not None:
+                st.session_state.recommendations = recommendations
     
     # ------------------------ Cover Letter Generator ------------------------
     if app_mode == "Cover Letter Generator":
@@ -418,10 +855,13 @@ def main():
             if not job_desc_input.strip():
                 st.error("Please provide a job description.")
             else:
-                with st.spinner("Generating your cover letter..."):
-                    cover_letter = generate_cover_letter(resume_text, job_desc_input)
-                st.subheader("Your Cover Letter")
-                simulate_typing(cover_letter)
+                start_job("cover_letter", "cover_letter", job_key("cover_letter", resume_text, job_desc_input),
+                          lambda: raise_on_llm_error(generate_cover_letter(resume_text, job_desc_input, stream=True)))
+        job_id = st.session_state.get("jobs", {}).get("cover_letter")
+        if job_id:
+            st.subheader("Your Cover Letter")
+            cover_letter = render_job(job_id)
+            if cover_letter is not None:
                 st.session_state.cover_letter = cover_letter
     
     # ------------------------ Job Description Analyzer ------------------------
@@ -429,35 +869,128 @@ def main():
         st.markdown("<h2>Job Description Analyzer</h2>", unsafe_allow_html=True)
         st.write("Compare your resume with a job description to identify areas for improvement.")
         job_desc_input = st.text_area("Job Description", job_desc_text, height=200)
+        if job_desc_input.strip():
+            # Instant local score; the LLM analysis below is optional.
+            match = score_match(resume_text, job_desc_input)
+            col1, col2 = st.columns([1, 3])
+            col1.metric("Match Score", f"{match['score']:.0f}%")
+            if match["missing_keywords"]:
+                col2.markdown("**Missing keywords:** " + ", ".join(match["missing_keywords"]))
+            else:
+                col2.markdown("**Missing keywords:** none - your resume covers every key term.")
         if st.button("Analyze Job Description"):
             if not job_desc_input.strip():
                 st.error("Please provide a job description.")
             else:
-                with st.spinner("Analyzing job description..."):
-                    analysis_result = analyze_job_description(resume_text, job_desc_input)
-                st.subheader("Analysis Result")
-                simulate_typing(analysis_result)
+                owner = session_owner()
+                start_job("jd_analysis", "jd_analysis", job_key("jd_analysis", resume_text, job_desc_input, owner),
+                          lambda: raise_on_llm_error(analyze_job_description(resume_text, job_desc_input, stream=True,
+                                                                             owner=owner)))
+        job_id = st.session_state.get("jobs", {}).get("jd_analysis")
+        if job_id:
+            st.subheader("Analysis Result")
+            analysis_result = render_job(job_id)
+            if analysis_result is not None:
                 st.session_state.jd_analysis = analysis_result
+        
+        if APPLICANT_POOL_ENABLED:
+            with st.expander("Applicant Pool"):
+                index = get_resume_index()
+                st.write(f"{len(index)} resumes indexed. Rank the pool against the job description above.")
+                if st.button("Add this resume to the pool"):
+                    added = index.add(resume_fingerprint(resume_text), uploaded_resume.name if uploaded_resume else "Uploaded resume", resume_text)
+                    st.success("Resume added to the pool." if added else "This resume is already in the pool.")
+                if st.button("Rank applicant pool") and job_desc_input.strip():
+                    top_matches = index.top_k(job_desc_input, k=10)
+                    if top_matches:
+                        import pandas as pd
+                        st.dataframe(pd.DataFrame([
+                            {"Resume": m["name"], "Match Score": m["score"],
+                             "Missing Keywords": ", ".join(m["missing_keywords"])}
+                            for m in top_matches
+                        ]))
+                    else:
+                        st.info("The applicant pool is empty.")
     
     # ------------------------ Download Report ------------------------
     if app_mode == "Download Report":
         st.markdown("<h2>Download Report</h2>", unsafe_allow_html=True)
+        st.write("Generate every section at once, or download what you have produced on the other pages.")
+        report_job_desc = st.text_area("Job Description (for the cover letter and job analysis)", job_desc_text, height=150)
+        if st.button("Generate Full Report"):
+            fingerprint = resume_fingerprint(resume_text)
+            owner = session_owner()
+            report_jobs = {"resume_analysis": start_job(
+                "resume_analysis", "resume_analysis", job_key("resume_analysis", resume_text, owner),
+                lambda: raise_on_llm_error(analyze_resume(resume_text, owner=owner)))}
+            if report_job_desc.strip():
+                report_jobs["jd_analysis"] = start_job(
+                    "jd_analysis", "jd_analysis", job_key("jd_analysis", resume_text, report_job_desc, owner),
+                    lambda: raise_on_llm_error(analyze_job_description(resume_text, report_job_desc, owner=owner)))
+                report_jobs["cover_letter"] = start_job(
+                    "cover_letter", "cover_letter", job_key("cover_letter", resume_text, report_job_desc),
+                    lambda: raise_on_llm_error(generate_cover_letter(resume_text, report_job_desc)))
+            quiz = st.session_state.get("quiz")
+            if quiz is None or quiz["fingerprint"] != fingerprint:
+                quiz_job_id = get_job_queue().submit(
+                    "quiz", job_key("quiz", resume_text, None),
+                    lambda: generate_quiz(resume_text))
+                st.session_state.quiz = {"fingerprint": fingerprint, "job_id": quiz_job_id, "raw": None, "mcq_data": None}
+                report_jobs["quiz"] = quiz_job_id
+            st.session_state.report_jobs = report_jobs
+        
+        report_jobs = st.session_state.get("report_jobs", {})
+        if report_jobs:
+            titles = {"resume_analysis": "Resume Analysis", "jd_analysis": "Job Description Analysis",
+                      "cover_letter": "Cover Letter", "quiz": "Skills Quiz"}
+            # The jobs were all submitted at once and run concurrently in the
+            # background; each placeholder fills in as soon as its job finishes.
+            placeholders = {}
+            for name in report_jobs:
+                st.subheader(titles[name])
+                placeholders[name] = st.empty()
+                placeholders[name].info("Generating...")
+            sections_by_job = {job_id: name for name, job_id in report_jobs.items()}
+            for job in get_job_queue().iter_finished(report_jobs.values()):
+                name = sections_by_job[job["id"]]
+                elapsed = (job["finished"] or time.time()) - (job["started"] or job["created"])
+                if job["status"] == FAILED:
+                    placeholders[name].error(f"Failed: {job['error']}")
+                elif name == "quiz":
+                    quiz = st.session_state.get("quiz")
+                    if quiz is not None and quiz["job_id"] == job["id"]:
+                        quiz["raw"] = job["result"]
+                    placeholders[name].success("Quiz ready. Take it on the Skills Quiz page.")
+                elif st.session_state.get("jobs", {}).get(name) != job["id"]:
+                    # Regenerated on its own page since; that newer result stays.
+                    placeholders[name].info(f"Superseded by a newer {titles[name]} result.")
+                else:
+                    st.session_state[name] = job["result"]
+                    with placeholders[name].container():
+                        st.caption(f"Generated in {elapsed:.1f}s")
+                        st.markdown(job["result"])
+        
         report_sections = []
         if "resume_text" in st.session_state:
-            report_sections.append("----- RESUME TEXT -----\n" + resume_text)
+            report_sections.append(text_section("resume_text", "Resume Text", resume_text))
+        if "resume_analysis" in st.session_state:
+            report_sections.append(text_section("resume_analysis", "Resume Analysis", st.session_state.resume_analysis))
         if "quiz_results" in st.session_state:
-            quiz_info = st.session_state.quiz_results
-            report_sections.append("----- QUIZ RESULTS -----\n" + f"Score: {quiz_info['score']} out of {quiz_info['total']}\nDetailed Results:\n{json.dumps(quiz_info['detailed_results'], indent=2)}")
+            report_sections.append(quiz_section(st.session_state.quiz_results))
         if "recommendations" in st.session_state:
-            report_sections.append("----- LEARNING RECOMMENDATIONS -----\n" + st.session_state.recommendations)
+            report_sections.append(text_section("recommendations", "Learning Recommendations", st.session_state.recommendations))
         if "cover_letter" in st.session_state:
-            report_sections.append("----- COVER LETTER -----\n" + st.session_state.cover_letter)
+            report_sections.append(text_section("cover_letter", "Cover Letter", st.session_state.cover_letter))
         if "jd_analysis" in st.session_state:
-            report_sections.append("----- JOB DESCRIPTION ANALYSIS -----\n" + st.session_state.jd_analysis)
+            report_sections.append(text_section("jd_analysis", "Job Description Analysis", st.session_state.jd_analysis))
         
-        report_content = "\n\n".join(report_sections)
-        st.text_area("Report Preview", report_content, height=400)
-        st.download_button("Download Report", data=report_content, file_name="resume_report.txt", mime="text/plain")
+        # The preview renders only its first few thousand characters; the
+        # download is rendered once per format and reused until a section changes.
+        st.text_area("Report Preview", preview_text(report_sections), height=400)
+        report_format = st.radio("Format", list(REPORT_FORMATS), format_func=str.upper, horizontal=True)
+        mime, file_name = REPORT_FORMATS[report_format]
+        st.download_button("Download Report", data=build_report(report_sections, report_format),
+                           file_name=file_name, mime=mime)
 
 if __name__ == "__main__":
     main()
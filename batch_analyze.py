@@ -0,0 +1,230 @@
+"""Headless batch screening of many resumes against one job description.
+
+Usage:
+    python batch_analyze.py RESUMES JOB_DESCRIPTION [--output results.jsonl]
+                            [--csv results.csv] [--workers 4] [--ledger PATH]
+                            [--index DIR] [--reports DIR] [--report-format txt|html|pdf]
+
+RESUMES is a directory (searched recursively) or a .zip archive of PDF/TXT
+resumes. Results are appended to the JSONL (and optional CSV) file as each
+resume completes. Every finished resume is recorded in a ledger file, so
+re-running the same command after a crash skips the work that already
+finished. Failed resumes are not recorded and are retried on the next run.
+With --index, every extracted resume is also added to the persistent resume
+index (see resume_index.py) for later ranking against other job descriptions.
+With --reports, a report per candidate (resume text and analysis) is streamed
+to that directory in the chosen format.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import threading
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from app import LLM_ERROR_PREFIXES, analyze_job_description, extract_text_from_pdf
+from pdf_extract import content_hash
+from report_builder import FORMATS as REPORT_FORMATS, text_section, write_report
+from resume_index import ResumeIndex
+
+RESUME_EXTENSIONS = (".pdf", ".txt")
+CSV_FIELDS = ["id", "file", "status", "chars", "elapsed", "analysis", "error"]
+
+
+#############################################
+# Input Discovery
+#############################################
+def iter_resume_sources(path):
+    """Yield ``(name, load_bytes)`` pairs for every resume in a directory or zip archive."""
+    if os.path.isdir(path):
+        for root, _, files in os.walk(path):
+            for filename in sorted(files):
+                if filename.lower().endswith(RESUME_EXTENSIONS):
+                    full_path = os.path.join(root, filename)
+                    yield os.path.relpath(full_path, path), _file_loader(full_path)
+    elif zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            names = sorted(n for n in archive.namelist() if n.lower().endswith(RESUME_EXTENSIONS))
+        for name in names:
+            yield name, _zip_loader(path, name)
+    else:
+        raise SystemExit(f"{path} is neither a directory nor a zip archive")
+
+
+def _file_loader(full_path):
+    def load():
+        with open(full_path, "rb") as fh:
+            return fh.read()
+    return load
+
+
+def _zip_loader(archive_path, name):
+    def load():
+        with zipfile.ZipFile(archive_path) as archive:
+            return archive.read(name)
+    return load
+
+
+def read_document(name, data):
+    """Return the text of a PDF or TXT document given its bytes."""
+    if name.lower().endswith(".pdf"):
+        return extract_text_from_pdf(data)
+    return data.decode("utf-8", errors="replace")
+
+
+#############################################
+# Ledger and Output
+#############################################
+def load_ledger(ledger_path):
+    """Return the set of item ids that already completed in earlier runs."""
+    if not os.path.exists(ledger_path):
+        return set()
+    with open(ledger_path, encoding="utf-8") as fh:
+        return {line.strip() for line in fh if line.strip()}
+
+
+class ResultWriter:
+    """Append results to JSONL/CSV and the ledger as they arrive (thread-safe)."""
+
+    def __init__(self, output_path, csv_path, ledger_path):
+        self._lock = threading.Lock()
+        self._jsonl = open(output_path, "a", encoding="utf-8")
+        self._ledger = open(ledger_path, "a", encoding="utf-8")
+        self._csv_file = None
+        self._csv = None
+        if csv_path:
+            write_header = not os.path.exists(csv_path) or os.path.getsize(csv_path) == 0
+            self._csv_file = open(csv_path, "a", encoding="utf-8", newline="")
+            self._csv = csv.DictWriter(self._csv_file, fieldnames=CSV_FIELDS)
+            if write_header:
+                self._csv.writeheader()
+
+    def write(self, result):
+        with self._lock:
+            self._jsonl.write(json.dumps(result, ensure_ascii=False) + "\n")
+            self._jsonl.flush()
+            if self._csv is not None:
+                self._csv.writerow({field: result.get(field, "") for field in CSV_FIELDS})
+                self._csv_file.flush()
+            # The ledger is written last: a crash in between re-processes the
+            # item on restart rather than losing it.
+            if result["status"] == "ok":
+                self._ledger.write(result["id"] + "\n")
+                self._ledger.flush()
+                os.fsync(self._ledger.fileno())
+
+    def close(self):
+        for fh in (self._jsonl, self._ledger, self._csv_file):
+            if fh is not None:
+                fh.close()
+
+
+#############################################
+# Batch Execution
+#############################################
+def report_path(report_dir, name, report_format):
+    """Return the report file for a resume, flattening archive subdirectories into the file name."""
+    stem = os.path.splitext(name)[0].replace("/", "__").replace(os.sep, "__")
+    return os.path.join(report_dir, f"{stem}.{report_format}")
+
+
+def process_resume(item_id, name, data, job_description, index=None, report_dir=None, report_format="txt"):
+    """Extract and analyze one resume, returning a result record."""
+    started = time.perf_counter()
+    result = {"id": item_id, "file": name, "status": "ok", "chars": 0, "analysis": "", "error": ""}
+    try:
+        resume_text = read_document(name, data)
+        result["chars"] = len(resume_text)
+        if not resume_text.strip():
+            raise ValueError("no text could be extracted")
+        if index is not None:
+            index.add(name, name, resume_text)
+        analysis = analyze_job_description(resume_text, job_description)
+        if analysis.startswith(LLM_ERROR_PREFIXES):
+            raise RuntimeError(analysis)
+        result["analysis"] = analysis
+        if report_dir is not None:
+            sections = [text_section("resume_text", "Resume Text", resume_text),
+                        text_section("jd_analysis", "Job Description Analysis", analysis)]
+            with open(report_path(report_dir, name, report_format), "wb") as fh:
+                write_report(sections, report_format, fh)
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = str(e)
+    result["elapsed"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def run_batch(resumes_path, job_description, writer, completed, workers=4, index=None,
+              report_dir=None, report_format="txt"):
+    """Process every pending resume with at most ``workers`` in flight; return (ok, failed, skipped)."""
+    ok = failed = skipped = 0
+    in_flight = set()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for name, load in iter_resume_sources(resumes_path):
+            data = load()
+            item_id = f"{name}:{content_hash(data)}"
+            if item_id in completed:
+                skipped += 1
+                continue
+            # Keep at most ``workers`` documents in memory at a time.
+            if len(in_flight) >= workers:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    ok, failed = _record(future.result(), writer, ok, failed)
+            in_flight.add(executor.submit(process_resume, item_id, name, data, job_description, index,
+                                         report_dir, report_format))
+        for future in wait(in_flight).done:
+            ok, failed = _record(future.result(), writer, ok, failed)
+    return ok, failed, skipped
+
+
+def _record(result, writer, ok, failed):
+    writer.write(result)
+    if result["status"] == "ok":
+        ok += 1
+    else:
+        failed += 1
+        print(f"[error] {result['file']}: {result['error']}", file=sys.stderr)
+    print(f"[{result['status']}] {result['file']} ({result['elapsed']}s)", file=sys.stderr)
+    return ok, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze a directory or zip of resumes against one job description.")
+    parser.add_argument("resumes", help="Directory or .zip archive of PDF/TXT resumes")
+    parser.add_argument("job_description", help="Job description file (PDF or TXT)")
+    parser.add_argument("--output", default="batch_results.jsonl", help="JSONL results file (appended)")
+    parser.add_argument("--csv", default=None, help="Optional CSV results file (appended)")
+    parser.add_argument("--workers", type=int, default=4, help="Maximum concurrent analyses")
+    parser.add_argument("--ledger", default=None, help="Completed-items ledger (default: OUTPUT.done)")
+    parser.add_argument("--index", default=None, help="Also add every resume to this resume index directory")
+    parser.add_argument("--reports", default=None, help="Also write a report per resume to this directory")
+    parser.add_argument("--report-format", default="txt", choices=sorted(REPORT_FORMATS), help="Report file format")
+    args = parser.parse_args(argv)
+
+    with open(args.job_description, "rb") as fh:
+        job_description = read_document(args.job_description, fh.read())
+    if not job_description.strip():
+        raise SystemExit("The job description is empty.")
+
+    ledger_path = args.ledger or args.output + ".done"
+    completed = load_ledger(ledger_path)
+    index = ResumeIndex(args.index) if args.index else None
+    if args.reports:
+        os.makedirs(args.reports, exist_ok=True)
+    writer = ResultWriter(args.output, args.csv, ledger_path)
+    try:
+        ok, failed, skipped = run_batch(args.resumes, job_description, writer, completed,
+                                        max(1, args.workers), index, args.reports, args.report_format)
+    finally:
+        writer.close()
+    print(f"Done: {ok} analyzed, {failed} failed, {skipped} skipped (already completed).", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""Import-time breakdown of the app's cold start.
+
+Usage:
+    python benchmarks/import_profile.py [--module app] [--top 25]
+
+Imports the module in a fresh interpreter with ``python -X importtime`` and
+reports the total, the slowest modules by cumulative time, and the self time
+of each top-level package. Modules the app loads lazily (see warmup.py) do
+not appear unless something imports them eagerly again.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def profile_imports(module):
+    """Return ``[(name, self_us, cumulative_us, depth)]`` for every import made by ``module``."""
+    with tempfile.TemporaryDirectory(prefix="resume-analyzer-imports-") as work_dir:
+        env = dict(os.environ, RESUME_ANALYZER_CACHE_DIR=os.path.join(work_dir, "cache"),
+                   RESUME_ANALYZER_PROVIDER="fake")
+        stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=REPO_ROOT,
+                                env=env, capture_output=True, text=True, check=True).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us), (len(name) - len(name.lstrip())) // 2))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report where the app's import time goes.")
+    parser.add_argument("--module", default="app", help="Module to import")
+    parser.add_argument("--top", type=int, default=25, help="Number of slowest modules to list")
+    args = parser.parse_args(argv)
+
+    rows = profile_imports(args.module)
+    total = next((cumulative for name, _, cumulative, _ in rows if name == args.module), 0)
+    print(f"import {args.module}: {total / 1000:.1f} ms ({len(rows)} modules)\n")
+
+    print(f"{'module':<50} {'cumulative':>12} {'self':>10}")
+    for name, self_us, cumulative_us, _ in sorted(rows, key=lambda row: -row[2])[:args.top]:
+        print(f"{name:<50} {cumulative_us / 1000:>9.1f} ms {self_us / 1000:>7.1f} ms")
+
+    packages = defaultdict(int)
+    for name, self_us, _, _ in rows:
+        packages[name.split(".")[0]] += self_us
+    print(f"\n{'package':<50} {'self total':>12}")
+    for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{package:<50} {self_us / 1000:>9.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
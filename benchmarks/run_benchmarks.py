@@ -0,0 +1,298 @@
+"""Offline performance benchmarks.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--only startup,pdf,quiz,pages,batch] [--repeat 5]
+                                        [--latency 0.05] [--output results.json]
+                                        [--compare baseline.json] [--tolerance 0.25]
+
+Every model call goes to the deterministic ``FakeProvider`` (see
+providers.py), and all caches live in a temporary directory, so runs need no
+network access and are comparable across machines and commits:
+
+- startup: cold start in a fresh process (importing the app, and the first
+  render of the About page, as a new server process serves it);
+- pdf: text extraction from synthetic multi-page PDFs;
+- quiz: parsing generated quiz JSON and scoring a submission;
+- pages: end-to-end render time of each app page (Streamlit AppTest);
+- batch: batch screening throughput at several concurrency levels.
+
+With --compare, any case slower than the baseline by more than --tolerance
+is reported and the exit status is 1.
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+# Keep every cache and trace out of the working tree, and never reach the
+# network, before any app module reads its configuration. PDF sandbox
+# workers re-import this script, and reuse the parent's directory.
+_WORK_DIR = os.environ.get("RESUME_ANALYZER_BENCH_DIR") or tempfile.mkdtemp(prefix="resume-analyzer-bench-")
+os.environ["RESUME_ANALYZER_BENCH_DIR"] = _WORK_DIR
+os.environ["RESUME_ANALYZER_CACHE_DIR"] = os.path.join(_WORK_DIR, "cache")
+os.environ["RESUME_ANALYZER_INDEX_DIR"] = os.path.join(_WORK_DIR, "index")
+os.environ["RESUME_ANALYZER_PROVIDER"] = "fake"
+# The cases vary their inputs slightly to stay uncached; near-duplicate reuse
+# would hide exactly the generation cost they measure.
+os.environ["RESUME_ANALYZER_SIMILARITY_CACHE"] = "0"
+
+from llm_client import use_provider  # noqa: E402
+from pdf_writer import build_pdf  # noqa: E402
+from providers import FakeProvider, fake_quiz  # noqa: E402
+
+BENCHMARKS = ("startup", "pdf", "quiz", "pages", "batch")
+# Each snippet runs in a fresh interpreter and prints its own timing, so
+# interpreter start-up is not counted. Streamlit itself is loaded before any
+# session is served, so the render case imports it outside the timing.
+STARTUP_CASES = {
+    "import app": (
+        "import time\n"
+        "started = time.perf_counter()\n"
+        "import app\n"
+        "print(time.perf_counter() - started)\n"
+    ),
+    "first render (About)": (
+        "import time\n"
+        "from streamlit.testing.v1 import AppTest\n"
+        "at = AppTest.from_file('app.py', default_timeout=120)\n"
+        "started = time.perf_counter()\n"
+        "at.run()\n"
+        "assert not at.exception, at.exception\n"
+        "print(time.perf_counter() - started)\n"
+    ),
+}
+PDF_PAGE_COUNTS = (4, 16, 64)
+QUIZ_SKILL_COUNTS = (6, 30)
+PAGES = ("About", "Resume Analysis", "Skills Quiz", "Job Description Analyzer", "Download Report")
+BATCH_SIZE = 32
+BATCH_WORKERS = (1, 4, 8, 16)
+
+SAMPLE_SKILLS = ["Python", "SQL", "Docker", "Kubernetes", "AWS", "React", "JavaScript", "Java",
+                 "Machine Learning", "Git", "Linux", "PostgreSQL", "TensorFlow", "Go", "Terraform"]
+SAMPLE_JOB_DESCRIPTION = (
+    "Senior Backend Engineer\nWe are looking for an engineer with strong Python, SQL and Docker "
+    "experience to build scalable APIs on AWS. Kubernetes and Terraform are a plus."
+)
+
+
+def synthetic_resume(seed, paragraphs=6):
+    """Return a plausible plain-text resume; the same seed always gives the same text."""
+    rng = random.Random(seed)
+    skills = rng.sample(SAMPLE_SKILLS, 6)
+    lines = [f"Candidate {seed}", f"candidate{seed}@example.com", "", "SUMMARY",
+             f"Engineer with {rng.randint(2, 15)} years of experience in {skills[0]} and {skills[1]}.",
+             "", "SKILLS", ", ".join(skills), "", "EXPERIENCE"]
+    for i in range(paragraphs):
+        lines.append(f"Company {rng.randint(1, 500)} - Software Engineer ({2010 + i}-{2011 + i})")
+        lines.append(f"Built services with {rng.choice(skills)} and {rng.choice(skills)}, "
+                     f"improving throughput by {rng.randint(5, 80)}% for {rng.randint(2, 90)} teams.")
+    lines += ["", "EDUCATION", "B.Sc. Computer Science, Example University"]
+    return "\n".join(lines)
+
+
+def median_time(func, repeat):
+    """Run ``func`` ``repeat`` times and return the median wall time in seconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def result(benchmark, case, seconds, throughput=None, unit=None):
+    return {"benchmark": benchmark, "case": case, "seconds": seconds, "throughput": throughput, "unit": unit}
+
+
+#############################################
+# Benchmarks
+#############################################
+def bench_startup(repeat):
+    env = dict(os.environ, RESUME_ANALYZER_WARMUP="0")
+    results = []
+    for case, code in STARTUP_CASES.items():
+        timings = []
+        for _ in range(repeat):
+            output = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, env=env,
+                                    capture_output=True, text=True, check=True).stdout
+            timings.append(float(output.split()[-1]))
+        results.append(result("startup", case, statistics.median(timings)))
+    return results
+
+
+def bench_pdf(repeat):
+    from pdf_extract import extract_text
+
+    results = []
+    extract_text(build_pdf(["warm-up"] * 16))  # start the worker pool outside the timings
+    for page_count in PDF_PAGE_COUNTS:
+        counter = iter(range(10 ** 9))
+
+        def run():
+            # A fresh nonce per run defeats the content-hash cache.
+            nonce = next(counter)
+            extract_text(build_pdf([f"{synthetic_resume(page)}\nrun {page_count}-{nonce}"
+                                    for page in range(page_count)]))
+
+        seconds = median_time(run, repeat)
+        results.append(result("pdf", f"{page_count} pages", seconds, page_count / seconds, "pages/s"))
+    return results
+
+
+def bench_quiz(repeat):
+    from mcq_parser import parse_mcq_output
+    from quiz_scoring import question_key, score_quiz
+
+    results = []
+    for skill_count in QUIZ_SKILL_COUNTS:
+        skills = [f"{SAMPLE_SKILLS[i % len(SAMPLE_SKILLS)]} {i}" for i in range(skill_count)]
+        raw = "```json\n" + fake_quiz(skills) + "\n```"
+        iterations = 200
+        seconds = median_time(lambda: [parse_mcq_output(raw) for _ in range(iterations)], repeat) / iterations
+        results.append(result("quiz", f"parse {skill_count} skills", seconds, 1 / seconds, "quizzes/s"))
+
+        quiz = parse_mcq_output(raw)["blocks"]
+        rng = random.Random(skill_count)
+        answers = {question_key(block["skill"], i): rng.choice("abcd")
+                   for block in quiz for i in range(len(block["questions"]))}
+        seconds = median_time(lambda: [score_quiz(quiz, answers) for _ in range(iterations)], repeat) / iterations
+        results.append(result("quiz", f"score {skill_count} skills", seconds, 1 / seconds, "quizzes/s"))
+    return results
+
+
+def bench_pages(repeat):
+    from streamlit.testing.v1 import AppTest
+
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    app_path = os.path.join(REPO_ROOT, "app.py")
+    results = []
+    for page in PAGES:
+        counter = iter(range(10 ** 9))
+
+        def run():
+            # A new resume per run measures the uncached path, including the
+            # model calls the page waits for.
+            at = AppTest.from_file(app_path, default_timeout=120)
+            at.session_state["resume_text"] = synthetic_resume(f"{page}-{next(counter)}")
+            at.run()
+            at.sidebar.selectbox[0].set_value(page).run()
+            buttons = {"Resume Analysis": "Analyze Resume", "Download Report": "Generate Full Report"}
+            if page in buttons:
+                next(b for b in at.button if b.label == buttons[page]).click().run()
+            if at.exception:
+                raise RuntimeError(f"{page} page failed: {at.exception[0].message}")
+
+        seconds = median_time(run, repeat)
+        results.append(result("pages", page, seconds))
+    return results
+
+
+def bench_batch(repeat):
+    from batch_analyze import ResultWriter, run_batch
+
+    resumes_dir = os.path.join(_WORK_DIR, "resumes")
+    os.makedirs(resumes_dir, exist_ok=True)
+    for i in range(BATCH_SIZE):
+        with open(os.path.join(resumes_dir, f"resume_{i:03d}.txt"), "w", encoding="utf-8") as fh:
+            fh.write(synthetic_resume(i))
+    results = []
+    for workers in BATCH_WORKERS:
+        counter = iter(range(10 ** 9))
+
+        def run():
+            # A distinct job description per run keeps the response cache cold.
+            run_id = f"{workers}-{next(counter)}"
+            out = os.path.join(_WORK_DIR, f"batch-{run_id}")
+            writer = ResultWriter(out + ".jsonl", None, out + ".done")
+            try:
+                # run_batch logs every resume to stderr; keep the report readable.
+                with contextlib.redirect_stderr(io.StringIO()):
+                    ok, failed, _ = run_batch(resumes_dir, f"{SAMPLE_JOB_DESCRIPTION}\nRef {run_id}",
+                                              writer, set(), workers=workers)
+            finally:
+                writer.close()
+            if failed:
+                raise RuntimeError(f"{failed} of {ok + failed} resumes failed")
+
+        seconds = median_time(run, repeat)
+        results.append(result("batch", f"{workers} workers", seconds, BATCH_SIZE / seconds, "resumes/s"))
+    return results
+
+
+RUNNERS = {"startup": bench_startup, "pdf": bench_pdf, "quiz": bench_quiz, "pages": bench_pages, "batch": bench_batch}
+
+
+#############################################
+# Reporting
+#############################################
+def print_table(results):
+    print(f"{'benchmark':<8} {'case':<26} {'median':>12} {'throughput':>20}")
+    for r in results:
+        throughput = f"{r['throughput']:.1f} {r['unit']}" if r["throughput"] is not None else ""
+        print(f"{r['benchmark']:<8} {r['case']:<26} {r['seconds'] * 1000:>9.2f} ms {throughput:>20}")
+
+
+def compare(results, baseline_path, tolerance):
+    """Return the cases that are slower than the baseline by more than ``tolerance``."""
+    with open(baseline_path, encoding="utf-8") as fh:
+        baseline = {(r["benchmark"], r["case"]): r["seconds"] for r in json.load(fh)["results"]}
+    regressions = []
+    for r in results:
+        before = baseline.get((r["benchmark"], r["case"]))
+        if before and r["seconds"] > before * (1 + tolerance):
+            regressions.append((r, before))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the offline performance benchmarks.")
+    parser.add_argument("--only", default=",".join(BENCHMARKS), help="Comma-separated benchmarks to run")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case (the median is reported)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated provider latency in seconds")
+    parser.add_argument("--output", default=None, help="Write the results to this JSON file")
+    parser.add_argument("--compare", default=None, help="Baseline JSON file from an earlier --output")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown against the baseline")
+    args = parser.parse_args(argv)
+
+    selected = [name.strip() for name in args.only.split(",") if name.strip()]
+    unknown = set(selected) - set(RUNNERS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+    use_provider(FakeProvider(latency=args.latency))
+
+    results = []
+    try:
+        for name in selected:
+            print(f"Running {name}...", file=sys.stderr)
+            results += RUNNERS[name](max(1, args.repeat))
+    finally:
+        shutil.rmtree(_WORK_DIR, ignore_errors=True)
+    print_table(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump({"latency": args.latency, "repeat": args.repeat, "results": results}, fh, indent=2)
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        for r, before in regressions:
+            print(f"REGRESSION {r['benchmark']} / {r['case']}: {before * 1000:.2f} ms -> {r['seconds'] * 1000:.2f} ms",
+                  file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""Columnar store of quiz attempts for cohort analytics.
+
+Every submitted quiz is appended as a small Parquet part file (one row per
+answered question) to the cohort directory; parts are written to a temporary
+name and renamed, so readers never see a half-written file. Once enough parts
+accumulate they are compacted into a single file to keep scans fast.
+Aggregations (per-skill pass rates, score percentiles and the score
+distribution) read only the columns they need and score every attempt in one
+pass with ``quiz_scoring.score_attempts``, the same rules as a single quiz.
+"""
+import os
+import threading
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from quiz_scoring import RESULT_COLUMNS, flatten_attempts, score_attempts
+from singleton import process_singleton
+
+COHORT_DIR = os.environ.get(
+    "RESUME_ANALYZER_COHORT_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cohort"),
+)
+COMPACT_AFTER_PARTS = 64
+PASS_PERCENTAGE = 60
+PERCENTILES = (10, 25, 50, 75, 90)
+SCORE_BINS = np.arange(0, 101, 10)
+
+SCHEMA = pa.schema([
+    ("attempt_id", pa.string()),
+    ("recorded", pa.float64()),
+    ("skill", pa.string()),
+    ("question", pa.string()),
+    ("user_answer", pa.string()),
+    ("correct_answer", pa.string()),
+    ("is_correct", pa.bool_()),
+])
+
+
+class CohortStore:
+    """Append-only Parquet dataset of answered quiz questions."""
+
+    def __init__(self, path=COHORT_DIR, compact_after=COMPACT_AFTER_PARTS):
+        self.path = path
+        self.compact_after = compact_after
+        os.makedirs(path, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _parts(self):
+        return sorted(os.path.join(self.path, name) for name in os.listdir(self.path) if name.endswith(".parquet"))
+
+    def _write(self, table, prefix):
+        final = os.path.join(self.path, f"{prefix}-{time.time_ns()}-{uuid.uuid4().hex[:8]}.parquet")
+        temporary = final + ".tmp"
+        pq.write_table(table, temporary)
+        os.replace(temporary, final)
+        return final
+
+    def append(self, answers):
+        """Append a flat answer table (``attempt_id`` plus the quiz result columns); return rows written."""
+        answers = pd.DataFrame(answers)
+        if answers.empty:
+            return 0
+        frame = pd.DataFrame({
+            "attempt_id": answers["attempt_id"].astype(str),
+            "recorded": answers["recorded"] if "recorded" in answers else time.time(),
+            **{column: answers[column].map(lambda v: None if v is None else str(v))
+               for column in RESULT_COLUMNS if column not in ("status",)},
+        })
+        frame["is_correct"] = frame["user_answer"].eq(frame["correct_answer"].str.lower())
+        table = pa.Table.from_pandas(frame, schema=SCHEMA, preserve_index=False)
+        with self._lock:
+            self._write(table, "part")
+            if len(self._parts()) > self.compact_after:
+                self._compact()
+        return len(frame)
+
+    def record_attempt(self, detailed_results, attempt_id=None):
+        """Append one submitted quiz (its ``detailed_results``); return the attempt id."""
+        attempt_id = attempt_id or uuid.uuid4().hex
+        self.append(flatten_attempts({attempt_id: detailed_results}))
+        return attempt_id
+
+    def compact(self):
+        """Merge every part file into one."""
+        with self._lock:
+            self._compact()
+
+    def _compact(self):
+        parts = self._parts()
+        if len(parts) < 2:
+            return
+        self._write(pq.read_table(parts, schema=SCHEMA), "compacted")
+        for part in parts:
+            os.remove(part)
+
+    def read(self, columns=None):
+        """Return the stored answers (optionally only ``columns``) as an Arrow table."""
+        with self._lock:
+            parts = self._parts()
+            if not parts:
+                return SCHEMA.empty_table().select(columns or SCHEMA.names)
+            return pq.read_table(parts, columns=columns, schema=SCHEMA)
+
+    def summary(self, pass_percentage=PASS_PERCENTAGE):
+        """Aggregate every stored attempt.
+
+        Returns a dict with ``attempts`` and ``answers`` counts, per-skill
+        ``skills`` stats (attempts, pass rate, mean score), score
+        ``percentiles``, the score ``distribution`` over 10-point bins and the
+        raw per-attempt ``scores``.
+        """
+        answers = self.read(["attempt_id", "skill", "user_answer", "correct_answer"]).to_pandas()
+        attempt_scores, skill_scores = score_attempts(answers)
+
+        skill_scores["passed"] = skill_scores["percentage"] >= pass_percentage
+        skills = skill_scores.groupby("skill", sort=False).agg(
+            attempts=("attempt_id", "size"), pass_rate=("passed", "mean"), mean_percentage=("percentage", "mean"),
+        ).reset_index()
+        skills["pass_rate"] *= 100
+        skills = skills.sort_values(["attempts", "skill"], ascending=[False, True], ignore_index=True)
+
+        scores = attempt_scores["percentage"].to_numpy(dtype=float)
+        counts, edges = np.histogram(scores, bins=SCORE_BINS)
+        distribution = pd.DataFrame({
+            "range": [f"{int(lo)}-{int(hi)}%" for lo, hi in zip(edges[:-1], edges[1:])],
+            "attempts": counts,
+        })
+        percentiles = {}
+        if len(scores):
+            percentiles = {p: float(v) for p, v in zip(PERCENTILES, np.percentile(scores, PERCENTILES))}
+        return {
+            "attempts": len(scores),
+            "answers": len(answers),
+            "skills": skills,
+            "percentiles": percentiles,
+            "distribution": distribution,
+            "scores": scores,
+        }
+
+
+@process_singleton
+def get_cohort_store():
+    """Return the process-wide cohort store."""
+    return CohortStore()
@@ -0,0 +1,143 @@
+"""Background job queue for long-running LLM work.
+
+Jobs run on a process-wide thread pool, independent of the Streamlit script
+thread, so a rerun or page switch never aborts them. Every job is recorded in
+a SQLite table with its status and result, and any page can poll it by id.
+Jobs are deduplicated by a caller-supplied key: submitting a key that is
+already queued, running or done returns the existing job instead of issuing
+the work again. A job whose task returns an iterable of text chunks exposes
+the text produced so far while it is still running.
+"""
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from response_cache import CACHE_DIR
+from singleton import process_singleton
+
+JOBS_DB_PATH = os.path.join(CACHE_DIR, "jobs.sqlite3")
+JOB_WORKERS = 8
+POLL_INTERVAL = 0.1
+JOB_TTL_SECONDS = 7 * 24 * 60 * 60
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+FINISHED_STATUSES = (DONE, FAILED)
+
+
+class JobQueue:
+    """Thread-pool job runner with a SQLite job table and key-based deduplication."""
+
+    def __init__(self, db_path=JOBS_DB_PATH, workers=JOB_WORKERS):
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self._lock = threading.Lock()
+        self._partial = {}
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY,"
+            " kind TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " status TEXT NOT NULL,"
+            " result TEXT,"
+            " error TEXT,"
+            " created REAL NOT NULL,"
+            " started REAL,"
+            " finished REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_key ON jobs (key, status)")
+        # Work that was in flight when the previous process exited cannot resume.
+        self._conn.execute(
+            "UPDATE jobs SET status = ?, error = ?, finished = ? WHERE status IN (?, ?)",
+            (FAILED, "Interrupted by a server restart.", time.time(), QUEUED, RUNNING),
+        )
+        self._conn.execute("DELETE FROM jobs WHERE finished < ?", (time.time() - JOB_TTL_SECONDS,))
+        self._conn.commit()
+
+    def submit(self, kind, key, task):
+        """Queue ``task`` unless a job with ``key`` is already queued, running or done; return the job id."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id FROM jobs WHERE key = ? AND status != ? ORDER BY created DESC LIMIT 1",
+                (key, FAILED),
+            ).fetchone()
+            if row is not None:
+                return row[0]
+            job_id = uuid.uuid4().hex
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, key, status, created) VALUES (?, ?, ?, ?, ?)",
+                (job_id, kind, key, QUEUED, time.time()),
+            )
+            self._conn.commit()
+        self._executor.submit(self._run, job_id, task)
+        return job_id
+
+    def _update(self, job_id, **fields):
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+            self._conn.commit()
+
+    def _run(self, job_id, task):
+        self._update(job_id, status=RUNNING, started=time.time())
+        try:
+            result = task()
+            if not isinstance(result, str):
+                parts = []
+                with self._lock:
+                    self._partial[job_id] = parts
+                for chunk in result:
+                    with self._lock:
+                        parts.append(chunk)
+                result = "".join(parts).strip()
+            self._update(job_id, status=DONE, result=result, finished=time.time())
+        except Exception as e:
+            self._update(job_id, status=FAILED, error=str(e) or type(e).__name__, finished=time.time())
+        finally:
+            with self._lock:
+                self._partial.pop(job_id, None)
+
+    def get(self, job_id):
+        """Return the job as a dict (with ``partial`` text while streaming), or ``None``."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, kind, key, status, result, error, created, started, finished FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+            partial = "".join(self._partial.get(job_id, ()))
+        if row is None:
+            return None
+        job = dict(zip(("id", "kind", "key", "status", "result", "error", "created", "started", "finished"), row))
+        job["partial"] = partial
+        return job
+
+    def wait(self, job_id, poll_interval=POLL_INTERVAL):
+        """Block until the job finishes and return it (``None`` if it does not exist)."""
+        for job in self.iter_finished([job_id], poll_interval):
+            return job
+        return None
+
+    def iter_finished(self, job_ids, poll_interval=POLL_INTERVAL):
+        """Yield each job (as returned by ``get``) once it finishes, in completion order."""
+        pending = list(job_ids)
+        while pending:
+            for job_id in list(pending):
+                job = self.get(job_id)
+                if job is None or job["status"] in FINISHED_STATUSES:
+                    pending.remove(job_id)
+                    if job is not None:
+                        yield job
+            if pending:
+                time.sleep(poll_interval)
+
+
+@process_singleton
+def get_job_queue():
+    """Return the process-wide queue."""
+    return JobQueue()
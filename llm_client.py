@@ -0,0 +1,200 @@
+"""Asyncio client layer around the chat-completion provider.
+
+All requests run on one long-lived event loop in a daemon thread and share a
+single provider (see ``providers``): by default the g4f ``AsyncClient`` and
+therefore its HTTP sessions, or a hedged router over several providers (see
+``provider_router``). Requests get a per-request deadline that covers every
+retry, transient failures are retried with exponential backoff and full
+jitter, and a global semaphore caps the number of in-flight provider calls.
+Synchronous wrappers let Streamlit callbacks and worker threads use the
+client without managing a loop.
+"""
+import asyncio
+import queue
+import random
+import threading
+
+from provider_router import build_default_provider
+from singleton import process_singleton
+
+DEFAULT_TIMEOUT = 90.0
+STREAM_IDLE_TIMEOUT = 30.0
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+MAX_CONCURRENCY = 8
+
+# Programming errors are never worth retrying; anything else a provider
+# raises (network errors, rate limits, empty replies) is treated as transient.
+NON_TRANSIENT_ERRORS = (TypeError, ValueError, KeyError, AttributeError, NotImplementedError)
+
+
+class LLMTimeoutError(TimeoutError):
+    """Raised when a request does not finish before its deadline."""
+
+
+class EmptyResponseError(RuntimeError):
+    """Raised when the provider answers with no content."""
+
+
+def backoff_delay(attempt, base=BACKOFF_BASE, cap=BACKOFF_MAX):
+    """Return an exponential backoff delay with full jitter for retry ``attempt`` (0-based)."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class AsyncLLMClient:
+    """Concurrency-limited, retrying async client for chat completions."""
+
+    def __init__(self, provider=None, max_concurrency=MAX_CONCURRENCY, timeout=DEFAULT_TIMEOUT,
+                 max_retries=MAX_RETRIES, stream_idle_timeout=STREAM_IDLE_TIMEOUT):
+        self.provider = provider or build_default_provider()
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.stream_idle_timeout = stream_idle_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _create(self, messages, model, temperature, top_p):
+        text = await self.provider.complete(messages, model, temperature, top_p)
+        if not text:
+            raise EmptyResponseError("The provider returned an empty response.")
+        return text
+
+    async def complete(self, prompt, model, temperature, top_p, timeout=None):
+        """Return the full completion for ``prompt``, retrying transient failures until the deadline."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (timeout or self.timeout)
+        messages = [{"role": "user", "content": prompt}]
+        attempt = 0
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise LLMTimeoutError(f"No response within {timeout or self.timeout:g}s.")
+            try:
+                async with self._semaphore:
+                    return await asyncio.wait_for(
+                        self._create(messages, model, temperature, top_p), remaining
+                    )
+            except asyncio.TimeoutError:
+                # Only the deadline itself is final; a timeout the provider
+                # raises on its own (e.g. aiohttp's) is retried while time is left.
+                if loop.time() >= deadline:
+                    raise LLMTimeoutError(f"No response within {timeout or self.timeout:g}s.") from None
+                if attempt >= self.max_retries:
+                    raise
+            except NON_TRANSIENT_ERRORS:
+                raise
+            except Exception:
+                if attempt >= self.max_retries:
+                    raise
+            delay = min(backoff_delay(attempt), max(0.0, deadline - loop.time()))
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def stream(self, prompt, model, temperature, top_p, timeout=None):
+        """Yield completion chunks; retries happen only before the first chunk arrives."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (timeout or self.timeout)
+        messages = [{"role": "user", "content": prompt}]
+        attempt = 0
+        while True:
+            yielded = False
+            try:
+                async with self._semaphore:
+                    iterator = self.provider.stream(messages, model, temperature, top_p).__aiter__()
+                    while True:
+                        # Before the first chunk the whole deadline applies; after
+                        # that, only a stall between chunks aborts the stream.
+                        wait = deadline - loop.time() if not yielded else self.stream_idle_timeout
+                        if wait <= 0:
+                            raise asyncio.TimeoutError
+                        try:
+                            chunk = await asyncio.wait_for(iterator.__anext__(), wait)
+                        except StopAsyncIteration:
+                            return
+                        if chunk:
+                            yielded = True
+                            yield chunk
+            except asyncio.TimeoutError:
+                if yielded or loop.time() >= deadline:
+                    raise LLMTimeoutError(f"The response stream stalled after {timeout or self.timeout:g}s.") from None
+                if attempt >= self.max_retries:
+                    raise
+            except NON_TRANSIENT_ERRORS:
+                raise
+            except Exception:
+                if yielded or attempt >= self.max_retries or loop.time() >= deadline:
+                    raise
+            await asyncio.sleep(min(backoff_delay(attempt), max(0.0, deadline - loop.time())))
+            attempt += 1
+
+    async def complete_many(self, prompts, model, temperature, top_p, timeout=None):
+        """Complete several prompts concurrently; failures are returned as exception objects."""
+        return await asyncio.gather(
+            *(self.complete(p, model, temperature, top_p, timeout=timeout) for p in prompts),
+            return_exceptions=True,
+        )
+
+
+#############################################
+# Background Event Loop and Sync Wrappers
+#############################################
+_DONE = object()
+
+
+@process_singleton
+def get_event_loop():
+    """Return the shared event loop, starting its daemon thread on first use."""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="llm-client-loop", daemon=True).start()
+    return loop
+
+
+def run_sync(coro):
+    """Run ``coro`` on the shared loop and block until it finishes."""
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop()).result()
+
+
+def iterate_sync(async_iterable):
+    """Consume an async iterable on the shared loop, yielding its items synchronously.
+
+    Closing the returned generator early (e.g. a Streamlit rerun) cancels the
+    underlying request.
+    """
+    items = queue.Queue()
+
+    async def pump():
+        try:
+            async for item in async_iterable:
+                items.put(item)
+        except Exception as e:
+            items.put(_Failure(e))
+        finally:
+            items.put(_DONE)
+
+    future = asyncio.run_coroutine_threadsafe(pump(), get_event_loop())
+    try:
+        while True:
+            item = items.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        future.cancel()
+
+
+class _Failure:
+    def __init__(self, error):
+        self.error = error
+
+
+@process_singleton
+def get_llm_client():
+    """Return the process-wide client."""
+    return AsyncLLMClient()
+
+
+def use_provider(provider):
+    """Replace the process-wide client with one backed by ``provider``; return the new client."""
+    return get_llm_client.replace(AsyncLLMClient(provider))
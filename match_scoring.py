@@ -0,0 +1,161 @@
+"""Local resume / job-description match scoring without an LLM call.
+
+Documents are turned into hashed feature vectors (word unigrams, word bigrams
+and taxonomy skills from ``skill_extractor``) with sublinear term frequency
+and L2 normalisation, stored as SciPy sparse rows. A match score blends the
+cosine similarity with the share of the job description's keywords that the
+resume covers. Ranking one job description against N resumes is a single
+sparse matrix product.
+"""
+import math
+import re
+import zlib
+from collections import Counter
+
+import numpy as np
+
+from skill_extractor import extract_skills
+
+N_FEATURES = 2 ** 18
+SIMILARITY_WEIGHT = 0.5
+MAX_JD_KEYWORDS = 25
+MAX_WORD_KEYWORDS = 10
+MIN_KEYWORD_LENGTH = 3
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+# English function words plus words that appear in nearly every resume or job
+# posting and say nothing about fit.
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each etc few for from further had has have
+having he her here hers him his how i if in into is it its itself just me more most my no nor not now of
+off on once only or other our ours out over own per same she should so some such than that the their
+them then there these they this those through to too under until up us very via was we were what when
+where which while who whom why will with within would you your yours
+ability able candidate candidates company experience experienced good great hiring including job join
+knowledge looking must new opportunity plus preferred required requirements responsibilities responsible
+role seeking skills strong team using work working year years
+""".split())
+
+
+#############################################
+# Vectorization
+#############################################
+def tokenize(text):
+    """Return lower-cased content tokens with stopwords removed."""
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+def feature_index(feature, n_features=N_FEATURES):
+    """Map a feature string to its (process-independent) hashed column."""
+    return zlib.crc32(feature.encode("utf-8")) % n_features
+
+
+def _feature_counts(text):
+    tokens = tokenize(text)
+    counts = Counter(tokens)
+    counts.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    for skill in extract_skills(text):
+        counts["skill:" + skill["name"]] += skill["count"]
+    return counts
+
+
+def vectorize(texts, n_features=N_FEATURES):
+    """Return an L2-normalised ``len(texts) x n_features`` CSR matrix of hashed features."""
+    # SciPy is imported on first use; most app pages never build a matrix.
+    from scipy import sparse
+
+    rows, cols, values = [], [], []
+    for row, text in enumerate(texts):
+        for feature, count in _feature_counts(text).items():
+            rows.append(row)
+            cols.append(feature_index(feature, n_features))
+            values.append(1.0 + math.log(count))
+    matrix = sparse.csr_matrix(
+        (np.asarray(values, dtype=np.float32), (np.asarray(rows), np.asarray(cols))),
+        shape=(len(texts), n_features),
+    )
+    matrix.sum_duplicates()
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms).dot(matrix).tocsr()
+
+
+def jd_keywords(jd_text, limit=MAX_JD_KEYWORDS):
+    """Return ``[(label, feature)]`` keywords a resume should cover for this job description.
+
+    Taxonomy skills come first, then the most frequent remaining content words.
+    """
+    keywords = [(skill["name"], "skill:" + skill["name"]) for skill in extract_skills(jd_text)]
+    skill_words = {label.lower() for label, _ in keywords}
+    word_counts = Counter(t for t in tokenize(jd_text)
+                          if len(t) >= MIN_KEYWORD_LENGTH and not t.isdigit() and t not in skill_words)
+    keywords.extend((word, word) for word, _ in word_counts.most_common(MAX_WORD_KEYWORDS))
+    return keywords[:limit]
+
+
+def keyword_features(text):
+    """Return the exact set of features ``jd_keywords`` can ask of a document (words and skills)."""
+    return set(tokenize(text)) | {"skill:" + skill["name"] for skill in extract_skills(text)}
+
+
+#############################################
+# Scoring
+#############################################
+def rank_resumes(jd_text, resume_texts, similarity_weight=SIMILARITY_WEIGHT):
+    """Score every resume against one job description in a single batch.
+
+    Returns a list (in input order) of dicts with ``score`` (0-100),
+    ``similarity``, ``coverage``, ``matched_keywords`` and ``missing_keywords``.
+    """
+    if not resume_texts:
+        return []
+    resumes = vectorize(resume_texts)
+    jd_vector = vectorize([jd_text])
+    similarity = np.asarray(resumes.dot(jd_vector.T).todense()).ravel()
+    return score_rows(resumes, jd_keywords(jd_text), similarity, similarity_weight)
+
+
+def keyword_presence(resumes, keywords, n_features=N_FEATURES):
+    """Return a boolean ``rows x len(keywords)`` array of which keywords each row contains.
+
+    ``resumes`` is a sparse matrix whose columns were hashed into
+    ``n_features``; at the default width collisions are negligible.
+    """
+    if not keywords:
+        return np.zeros((resumes.shape[0], 0), dtype=bool)
+    columns = [feature_index(feature, n_features) for _, feature in keywords]
+    present = resumes[:, columns]
+    return (present.toarray() if hasattr(present, "toarray") else np.asarray(present)) > 0
+
+
+def blend_scores(similarity, present, similarity_weight=SIMILARITY_WEIGHT):
+    """Return ``(scores, coverage)`` arrays from similarities and keyword presence."""
+    coverage = present.mean(axis=1) if present.shape[1] else np.zeros(present.shape[0])
+    return 100.0 * (similarity_weight * similarity + (1.0 - similarity_weight) * coverage), coverage
+
+
+def match_result(score, similarity, coverage, keywords, present_row):
+    """Build the result dict for one scored resume."""
+    labels = [label for label, _ in keywords]
+    return {
+        "score": round(float(score), 1),
+        "similarity": round(float(similarity), 4),
+        "coverage": round(float(coverage), 4),
+        "matched_keywords": [label for label, hit in zip(labels, present_row) if hit],
+        "missing_keywords": [label for label, hit in zip(labels, present_row) if not hit],
+    }
+
+
+def score_rows(resumes, keywords, similarity, similarity_weight=SIMILARITY_WEIGHT, n_features=N_FEATURES):
+    """Combine precomputed similarities with keyword coverage for every row of ``resumes``."""
+    present = keyword_presence(resumes, keywords, n_features)
+    scores, coverage = blend_scores(similarity, present, similarity_weight)
+    return [match_result(scores[row], similarity[row], coverage[row], keywords, present[row])
+            for row in range(resumes.shape[0])]
+
+
+def score_match(resume_text, jd_text):
+    """Score one resume against one job description (see ``rank_resumes``)."""
+    return rank_resumes(jd_text, [resume_text])[0]
@@ -0,0 +1,177 @@
+"""Tolerant, incremental parsing and validation of generated MCQ JSON.
+
+Model output is often wrapped in a markdown fence, prefixed with prose, or
+cut off mid-question. Instead of ``json.loads`` on the whole response, the
+top-level array is decoded one skill block at a time with
+``JSONDecoder.raw_decode``. A block that fails to decode is salvaged question
+by question, and decoding resumes at the next skill block. Every block and
+question is checked against the quiz schema, so one bad question never costs
+the whole quiz. Skills that end up incomplete are reported so that only they
+need to be regenerated.
+"""
+import json
+import re
+
+QUESTIONS_PER_SKILL = 3
+MIN_OPTIONS = 2
+DIFFICULTIES = ("easy", "medium", "hard")
+DEFAULT_DIFFICULTY = "medium"
+
+FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)(?:```|$)", re.DOTALL | re.IGNORECASE)
+BLOCK_START_RE = re.compile(r'\{\s*"skill"\s*:')
+SKILL_NAME_RE = re.compile(r'"skill"\s*:\s*"((?:[^"\\]|\\.)*)"')
+QUESTIONS_START_RE = re.compile(r'"questions"\s*:\s*\[')
+ANSWER_KEY_RE = re.compile(r"^\(?([a-z])\)?[.):]?(\s|$)")
+
+_decoder = json.JSONDecoder()
+
+
+#############################################
+# Schema Validation
+#############################################
+def validate_question(question):
+    """Return a normalised copy of a question dict, or ``None`` if it is unusable."""
+    if not isinstance(question, dict):
+        return None
+    text = question.get("question")
+    options = question.get("options")
+    correct = question.get("correct")
+    if not isinstance(text, str) or not text.strip():
+        return None
+    if not isinstance(options, dict) or len(options) < MIN_OPTIONS:
+        return None
+    normalised_options = {}
+    for key, value in options.items():
+        if not isinstance(value, (str, int, float)) or not str(value).strip():
+            return None
+        normalised_options[str(key).strip().lower()] = str(value).strip()
+    if not isinstance(correct, str):
+        return None
+    # Accept "a", "A", "a)", "(a)" and "a) Returns ..." as the answer key.
+    match = ANSWER_KEY_RE.match(correct.strip().lower())
+    correct_key = match.group(1) if match else correct.strip().lower()
+    if correct_key not in normalised_options:
+        return None
+    difficulty = str(question.get("difficulty") or "").strip().lower()
+    return {"question": text.strip(), "options": normalised_options, "correct": correct_key,
+            "difficulty": difficulty if difficulty in DIFFICULTIES else DEFAULT_DIFFICULTY}
+
+
+def validate_block(block):
+    """Return ``(skill, valid_questions, invalid_count)`` for a decoded skill block."""
+    if not isinstance(block, dict):
+        return None, [], 0
+    skill = block.get("skill")
+    skill = skill.strip() if isinstance(skill, str) and skill.strip() else None
+    questions = block.get("questions")
+    if not isinstance(questions, list):
+        return skill, [], 1
+    valid = [q for q in (validate_question(q) for q in questions) if q is not None]
+    return skill, valid, len(questions) - len(valid)
+
+
+#############################################
+# Incremental Decoding
+#############################################
+def _array_body(text):
+    """Return the text from the first ``[`` of the (possibly fenced) output, or ``None``."""
+    fenced = FENCE_RE.search(text)
+    if fenced and "[" in fenced.group(1):
+        text = fenced.group(1)
+    start = text.find("[")
+    return text[start + 1:] if start != -1 else None
+
+
+def _skip_separators(text, pos):
+    while pos < len(text) and text[pos] in " \t\r\n,":
+        pos += 1
+    return pos
+
+
+def _salvage_block(text, start, end):
+    """Recover the skill name and every complete question from a broken block in ``text[start:end]``."""
+    segment = text[start:end]
+    name_match = SKILL_NAME_RE.search(segment)
+    skill = None
+    if name_match:
+        try:
+            skill = json.loads(f'"{name_match.group(1)}"').strip() or None
+        except ValueError:
+            skill = None
+    questions = []
+    questions_match = QUESTIONS_START_RE.search(segment)
+    if questions_match:
+        pos = questions_match.end()
+        while True:
+            pos = _skip_separators(segment, pos)
+            if pos >= len(segment) or segment[pos] != "{":
+                break
+            try:
+                question, pos = _decoder.raw_decode(segment, pos)
+            except ValueError:
+                break
+            questions.append(question)
+    return {"skill": skill, "questions": questions}
+
+
+def iter_blocks(text):
+    """Yield ``(block, salvaged)`` for each skill block in model output, in order.
+
+    ``salvaged`` is true for blocks that did not decode cleanly and were
+    recovered question by question.
+    """
+    body = _array_body(text)
+    if body is None:
+        return
+    pos = 0
+    while True:
+        pos = _skip_separators(body, pos)
+        if pos >= len(body) or body[pos] == "]":
+            return
+        if body[pos] != "{":
+            next_block = BLOCK_START_RE.search(body, pos)
+            if next_block is None:
+                return
+            pos = next_block.start()
+        try:
+            block, pos = _decoder.raw_decode(body, pos)
+            yield block, False
+        except ValueError:
+            next_block = BLOCK_START_RE.search(body, pos + 1)
+            end = next_block.start() if next_block else len(body)
+            yield _salvage_block(body, pos, end), True
+            if next_block is None:
+                return
+            pos = end
+
+
+def parse_mcq_output(text, questions_per_skill=QUESTIONS_PER_SKILL):
+    """Parse and validate generated MCQ output.
+
+    Returns a dict with ``blocks`` (every skill with at least one valid
+    question, in the quiz format), ``incomplete_skills`` (named skills with
+    fewer than ``questions_per_skill`` valid questions, which should be
+    regenerated) and ``errors`` (human-readable problems found).
+    """
+    blocks, incomplete, errors = [], [], []
+    seen = set()
+    for raw_block, salvaged in iter_blocks(text or ""):
+        skill, questions, invalid = validate_block(raw_block)
+        if skill is None:
+            errors.append("Dropped a skill block without a skill name.")
+            continue
+        if skill.lower() in seen:
+            continue
+        seen.add(skill.lower())
+        if salvaged:
+            errors.append(f"Recovered {len(questions)} question(s) for {skill} from malformed output.")
+        if invalid:
+            errors.append(f"Dropped {invalid} invalid question(s) for {skill}.")
+        if questions:
+            blocks.append({"skill": skill, "questions": questions[:questions_per_skill]})
+        if len(questions) < questions_per_skill:
+            incomplete.append(skill)
+    if not blocks and not errors:
+        errors.append("No quiz questions were found in the model output.")
+    return {"blocks": blocks, "incomplete_skills": incomplete, "errors": errors}
+
@@ -0,0 +1,221 @@
+"""In-process latency and cost metrics.
+
+Instrumented operations are timed with ``timed`` (a context manager) or
+``instrument`` (a decorator). Each finished span is:
+
+- added to an in-memory registry that keeps the most recent durations per
+  operation for p50/p95/p99 latency, plus error and cache-hit counts and
+  totals of any numeric fields (prompt/response sizes, tokens, ...);
+- appended as one JSON line to the trace file (``METRICS_TRACE_PATH``). When
+  the file reaches ``TRACE_MAX_BYTES`` it is rotated to ``<path>.1``, which
+  replaces the previous backup, so traces use at most twice that on disk.
+
+``prometheus_text`` renders the registry in the Prometheus text exposition
+format. Setting ``RESUME_ANALYZER_METRICS_PORT`` serves it over HTTP at
+``/metrics``; the app's Metrics page shows the same data. Metrics are shared
+by every session, so the page only offers to reset them when
+``RESUME_ANALYZER_METRICS_RESET=1``.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from response_cache import CACHE_DIR
+
+METRICS_TRACE_PATH = os.environ.get("RESUME_ANALYZER_TRACE", os.path.join(CACHE_DIR, "trace.jsonl"))
+METRICS_PORT = os.environ.get("RESUME_ANALYZER_METRICS_PORT")
+METRICS_RESET_ENABLED = os.environ.get("RESUME_ANALYZER_METRICS_RESET", "0") == "1"
+TRACE_MAX_BYTES = int(float(os.environ.get("RESUME_ANALYZER_TRACE_MB", 50)) * 1024 * 1024)
+SAMPLE_SIZE = 2048
+QUANTILES = (0.5, 0.95, 0.99)
+METRIC_PREFIX = "resume_analyzer"
+
+
+class MetricsRegistry:
+    """Thread-safe per-operation latency samples and counters."""
+
+    def __init__(self, trace_path=METRICS_TRACE_PATH, sample_size=SAMPLE_SIZE, trace_max_bytes=TRACE_MAX_BYTES):
+        self.trace_path = trace_path
+        self.trace_max_bytes = trace_max_bytes
+        self._sample_size = sample_size
+        self._lock = threading.Lock()
+        self._ops = {}
+        self._trace = None
+        self._trace_bytes = 0
+
+    def record(self, name, seconds, error=False, cached=False, labels=None, **fields):
+        """Record one finished span of operation ``name``."""
+        labels = dict(sorted((labels or {}).items()))
+        key = (name, tuple(labels.items()))
+        event = {"time": time.time(), "op": name, **labels, "seconds": round(seconds, 6),
+                 "error": bool(error), "cached": bool(cached), **fields}
+        with self._lock:
+            op = self._ops.get(key)
+            if op is None:
+                op = self._ops[key] = {"name": name, "labels": labels, "count": 0, "errors": 0,
+                                       "cache_hits": 0, "seconds_total": 0.0, "totals": {},
+                                       "samples": deque(maxlen=self._sample_size)}
+            op["count"] += 1
+            op["errors"] += bool(error)
+            op["cache_hits"] += bool(cached)
+            op["seconds_total"] += seconds
+            op["samples"].append(seconds)
+            for field, value in fields.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    op["totals"][field] = op["totals"].get(field, 0) + value
+            self._write_trace(event)
+
+    def _write_trace(self, event):
+        if not self.trace_path:
+            return
+        try:
+            if self._trace is None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.trace_path)), exist_ok=True)
+                self._trace = open(self.trace_path, "a", encoding="utf-8")
+                self._trace_bytes = self._trace.tell()
+            line = json.dumps(event, ensure_ascii=False, default=str) + "\n"
+            size = len(line.encode("utf-8"))
+            if self.trace_max_bytes and self._trace_bytes + size > self.trace_max_bytes:
+                self._trace.close()
+                os.replace(self.trace_path, self.trace_path + ".1")
+                self._trace = open(self.trace_path, "a", encoding="utf-8")
+                self._trace_bytes = 0
+            self._trace.write(line)
+            self._trace.flush()
+            self._trace_bytes += size
+        except OSError:
+            # Tracing is best effort; it must never break the instrumented call.
+            self.trace_path = None
+
+    def summary(self):
+        """Return one dict per operation with counts, rates, totals and latency percentiles (ms)."""
+        with self._lock:
+            ops = [dict(op, samples=np.array(op["samples"]), totals=dict(op["totals"])) for op in self._ops.values()]
+        rows = []
+        for op in sorted(ops, key=lambda o: (o["name"], tuple(o["labels"].items()))):
+            p50, p95, p99 = np.percentile(op["samples"], [q * 100 for q in QUANTILES]) * 1000
+            rows.append({
+                "op": op["name"], **op["labels"],
+                "count": op["count"],
+                "errors": op["errors"],
+                "error_rate": op["errors"] / op["count"],
+                "cache_hits": op["cache_hits"],
+                "cache_hit_rate": op["cache_hits"] / op["count"],
+                "p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99),
+                "mean_ms": op["seconds_total"] / op["count"] * 1000,
+                **{f"{field}_total": value for field, value in op["totals"].items()},
+            })
+        return rows
+
+    def prometheus_text(self):
+        """Render the registry in the Prometheus text exposition format."""
+        with self._lock:
+            ops = [dict(op, samples=np.array(op["samples"]), totals=dict(op["totals"])) for op in self._ops.values()]
+        latency = f"{METRIC_PREFIX}_latency_seconds"
+        lines = [f"# HELP {latency} Latency of instrumented operations.", f"# TYPE {latency} summary"]
+        counters = {}
+        for op in ops:
+            labels = {"op": op["name"], **op["labels"]}
+            for quantile, value in zip(QUANTILES, np.percentile(op["samples"], [q * 100 for q in QUANTILES])):
+                lines.append(f"{latency}{_labels(labels, quantile=quantile)} {value:.6f}")
+            lines.append(f"{latency}_sum{_labels(labels)} {op['seconds_total']:.6f}")
+            lines.append(f"{latency}_count{_labels(labels)} {op['count']}")
+            values = {"errors": op["errors"], "cache_hits": op["cache_hits"], **op["totals"]}
+            for field, value in values.items():
+                counters.setdefault(field, []).append((labels, value))
+        for field, samples in sorted(counters.items()):
+            name = f"{METRIC_PREFIX}_{field}_total"
+            lines.append(f"# TYPE {name} counter")
+            lines.extend(f"{name}{_labels(labels)} {value:g}" for labels, value in samples)
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """Drop every recorded sample and counter (the trace file is kept)."""
+        with self._lock:
+            self._ops.clear()
+
+
+def _labels(labels, **extra):
+    items = {**labels, **extra}
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in items.values())
+    return "{" + ",".join(f'{k}="{v}"' for k, v in zip(items, escaped)) + "}"
+
+
+_registry = MetricsRegistry()
+
+
+def get_registry():
+    """Return the process-wide registry."""
+    return _registry
+
+
+@contextmanager
+def timed(name, **labels):
+    """Time the enclosed block as operation ``name``.
+
+    Yields a dict the block can fill with span fields: ``cached`` and
+    ``error`` flags, and numeric sizes or token counts. An exception marks the
+    span as an error and is re-raised.
+    """
+    span = {}
+    started = time.perf_counter()
+    try:
+        yield span
+    except Exception:
+        span["error"] = True
+        raise
+    finally:
+        _registry.record(name, time.perf_counter() - started, labels=labels, **span)
+
+
+def instrument(name=None, **labels):
+    """Decorator form of ``timed``; the operation name defaults to the function name."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(name or func.__name__, **labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+#############################################
+# Prometheus Endpoint
+#############################################
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = _registry.prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port=METRICS_PORT, host="127.0.0.1"):
+    """Serve ``/metrics`` on a daemon thread (once per process); no-op without a port."""
+    global _server
+    if not port:
+        return None
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, int(port)), _MetricsHandler)
+            threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+        return _server
@@ -0,0 +1,229 @@
+"""PDF text extraction in sandboxed worker processes, with content-hash caching.
+
+Uploads are untrusted, so they are never parsed in the server process.
+Parsing runs in the resource-limited workers of ``pdf_sandbox``, under a
+wall-clock timeout per document and a memory cap per worker. A document that
+breaks a limit fails with ``PDFLimitError`` and does not affect other
+sessions. Small documents are parsed by one worker in a single round trip.
+Large ones are split into page ranges that are parsed in parallel, always
+leaving a worker free for other uploads (the budget is shared by all split
+documents, not counted per document), and the page texts are assembled
+with a single join, separated by form feeds (``prompt_budget.PAGE_BREAK``) so
+later cleaning can recognise running page headers and footers.
+
+Pages with no text layer (scans) are sent through the OCR fallback in
+``pdf_ocr``, in the same sandbox workers. A document that still yields no
+text is rejected with ``PDFNoTextError`` rather than returned as an empty
+string, so no model call is spent on an empty resume.
+
+Extracted text is cached by the SHA-256 of the file bytes in the process-wide
+shared cache. Re-uploading or re-running on the same document, even from
+another session, never parses it twice, and concurrent uploads of the same
+file share one extraction. Failures caused by the file itself are cached
+too, for ``PDF_FAILURE_TTL`` seconds: a file that timed out while being
+parsed, broke the memory cap or has no text is rejected again right away on
+every rerun instead of going back to the sandbox. ``PDFBusyError`` (no
+worker was free before the deadline) is never cached.
+"""
+import hashlib
+import io
+import os
+import time
+from collections import deque
+
+from pdf_ocr import OCR_ENABLED, OCR_TIMEOUT, needs_ocr, ocr_page
+from pdf_sandbox import SandboxBusyError, SandboxError, SandboxTimeoutError, get_sandbox_pool
+from prompt_budget import PAGE_BREAK
+from shared_cache import get_shared_cache
+
+MAX_PDF_BYTES = 20 * 1024 * 1024
+MAX_PDF_PAGES = 200
+PDF_TIMEOUT = float(os.environ.get("RESUME_ANALYZER_PDF_TIMEOUT", 20))
+PARALLEL_MIN_PAGES = 8
+PAGES_PER_TASK = 4
+PDF_FAILURE_TTL = float(os.environ.get("RESUME_ANALYZER_PDF_FAILURE_TTL", 600))
+
+
+class PDFLimitError(ValueError):
+    """Raised when a PDF exceeds the configured size, page, time or memory limits, or has no text."""
+
+
+class PDFTimeoutError(PDFLimitError):
+    """Raised when a PDF could not be parsed within the time limit."""
+
+
+class PDFExtractionError(PDFLimitError):
+    """Raised when a PDF is malformed or exceeded the parser's memory limit."""
+
+
+class PDFBusyError(PDFTimeoutError):
+    """Raised when the sandbox workers were too busy to parse a PDF before its deadline."""
+
+
+class PDFNoTextError(PDFLimitError):
+    """Raised when no text could be extracted from a PDF, even with OCR."""
+
+
+def read_file_bytes(file):
+    """Return the raw bytes of an upload, path, bytes object or binary file object."""
+    if isinstance(file, (bytes, bytearray)):
+        return bytes(file)
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "rb") as fh:
+            return fh.read()
+    if hasattr(file, "getvalue"):
+        return file.getvalue()
+    if hasattr(file, "seek"):
+        file.seek(0)
+    data = file.read()
+    if hasattr(file, "seek"):
+        file.seek(0)
+    return data
+
+
+def content_hash(data):
+    """Return the cache key for a document's bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def _open_reader(data):
+    # PyPDF2 is imported on first use so that starting the app does not pay for it.
+    from PyPDF2 import PdfReader
+
+    return PdfReader(io.BytesIO(data))
+
+
+def _extract_page_range(data, start, stop):
+    """Extract the text of pages ``start:stop`` (runs in a sandbox worker)."""
+    reader = _open_reader(data)
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def _load_parser():
+    """Import the parser (runs in a sandbox worker)."""
+    from PyPDF2 import PdfReader  # noqa: F401
+
+
+def warm_up_workers():
+    """Start the sandbox workers and load the parser in each, ahead of the first upload."""
+    pool = get_sandbox_pool()
+    for future in [pool.submit(_load_parser) for _ in range(pool.workers)]:
+        future.result()
+
+
+def _open_document(data, max_pages):
+    """Return ``(page_count, page_texts)`` (runs in a sandbox worker).
+
+    Small documents are extracted right away; for large or over-limit ones
+    ``page_texts`` is ``None`` and only the page count is returned.
+    """
+    reader = _open_reader(data)
+    page_count = len(reader.pages)
+    if page_count > max_pages or page_count >= PARALLEL_MIN_PAGES:
+        return page_count, None
+    return page_count, [page.extract_text() or "" for page in reader.pages]
+
+
+def _extract_pages(data, max_pages, deadline):
+    pool = get_sandbox_pool()
+    page_count, page_texts = pool.submit(_open_document, data, max_pages, deadline=deadline).result()
+    if page_count > max_pages:
+        raise PDFLimitError(f"PDF has {page_count} pages; the limit is {max_pages}.")
+    if page_texts is not None:
+        return page_texts
+    ranges = [(data, start, min(start + PAGES_PER_TASK, page_count))
+              for start in range(0, page_count, PAGES_PER_TASK)]
+    return [text for texts in _run_windowed(pool, _extract_page_range, ranges, deadline) for text in texts]
+
+
+def _run_windowed(pool, func, task_args, deadline):
+    """Run ``func(*args)`` in the sandbox for every entry of ``task_args``; return the results in order."""
+    pending = deque()
+    results = []
+    try:
+        for args in task_args:
+            # Results already in are collected first, so a failed task stops
+            # the document before more of it is queued.
+            while pending and pending[0].done():
+                results.append(pending.popleft().result())
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+            if not pool.split_slots.acquire(timeout=remaining):
+                raise SandboxBusyError("No sandbox worker became free before the deadline.")
+            try:
+                future = pool.submit(func, *args, deadline=deadline)
+            except BaseException:
+                pool.split_slots.release()
+                raise
+            future.add_done_callback(lambda _: pool.split_slots.release())
+            pending.append(future)
+        while pending:
+            results.append(pending.popleft().result())
+    finally:
+        # After a failure, tasks still queued are dropped instead of run.
+        for future in pending:
+            future.cancel()
+    return results
+
+
+def _ocr_missing_pages(data, page_texts):
+    """OCR the pages without a text layer; return ``(page_texts, error)``.
+
+    On failure the text layer is returned unchanged along with the error.
+    """
+    missing = [index for index, text in enumerate(page_texts) if needs_ocr(text)]
+    if not missing or not OCR_ENABLED:
+        return page_texts, None
+    try:
+        ocr_texts = _run_windowed(get_sandbox_pool(), ocr_page, [(data, index) for index in missing],
+                                  time.monotonic() + OCR_TIMEOUT)
+    except SandboxError as e:
+        return page_texts, e
+    page_texts = list(page_texts)
+    for index, text in zip(missing, ocr_texts):
+        if len(text.strip()) > len(page_texts[index].strip()):
+            page_texts[index] = text
+    return page_texts, None
+
+
+def extract_text(file, max_bytes=MAX_PDF_BYTES, max_pages=MAX_PDF_PAGES, timeout=PDF_TIMEOUT):
+    """Extract the text of a PDF, raising ``PDFLimitError`` for documents that break a limit."""
+    data = read_file_bytes(file)
+    if len(data) > max_bytes:
+        raise PDFLimitError(
+            f"PDF is {len(data) / (1024 * 1024):.1f} MB; the limit is {max_bytes / (1024 * 1024):.0f} MB."
+        )
+
+    def extract():
+        try:
+            page_texts = _extract_pages(data, max_pages, time.monotonic() + timeout)
+        except SandboxBusyError as e:
+            raise PDFBusyError("The server is busy; please upload the PDF again in a moment.") from e
+        except SandboxTimeoutError as e:
+            raise PDFTimeoutError(f"PDF could not be read within {timeout:g}s.") from e
+        except SandboxError as e:
+            raise PDFExtractionError(f"PDF could not be read: {e}") from e
+        page_texts, ocr_error = _ocr_missing_pages(data, page_texts)
+        text = PAGE_BREAK.join(page_texts).strip()
+        if not text and isinstance(ocr_error, SandboxBusyError):
+            raise PDFBusyError("The server is busy and could not OCR this scanned PDF; "
+                               "please upload it again in a moment.") from ocr_error
+        if not text:
+            reason = f" It looks scanned, and OCR failed: {ocr_error}" if ocr_error else ""
+            raise PDFNoTextError(f"No text could be extracted from the PDF.{reason}")
+        return text
+
+    cache = get_shared_cache()
+    digest = content_hash(data)
+    # Only the error type and message are kept: the exception's traceback
+    # would pin the document bytes in memory.
+    failure = cache.get(("pdf_error", digest, max_pages))
+    if failure is not None and time.monotonic() - failure[0] < PDF_FAILURE_TTL:
+        raise failure[1](failure[2])
+    try:
+        return cache.get_or_compute(("pdf_text", digest, max_pages), extract)
+    except PDFBusyError:
+        # Caused by other uploads, not by this file: the next attempt may succeed.
+        raise
+    except PDFLimitError as e:
+        cache.put(("pdf_error", digest, max_pages), (time.monotonic(), type(e), str(e)))
+        raise
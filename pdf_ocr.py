@@ -0,0 +1,121 @@
+"""OCR fallback for scanned (image-only) PDF pages.
+
+Pages whose text layer is empty, or nearly so, are usually scans. Each such
+page is turned into images and run through Tesseract. ``ocr_page`` runs in
+the ``pdf_sandbox`` workers, so OCR gets the same process isolation, time
+limits and memory caps as parsing. The page is rendered with pdf2image
+(Poppler) when it is installed. Otherwise the scanned images embedded in the
+page are used directly, which is what a scanner produces anyway.
+
+OCR output is cached in SQLite by a hash of the page's content stream and
+images, so a page is recognised only once even when it appears in another
+upload. pytesseract, pdf2image and Pillow are optional: without pytesseract,
+``ocr_page`` raises ``OCRUnavailableError`` and scanned pages stay empty.
+"""
+import hashlib
+import io
+import os
+import sqlite3
+import threading
+import time
+
+from response_cache import CACHE_DIR
+from singleton import process_singleton
+
+OCR_ENABLED = os.environ.get("RESUME_ANALYZER_OCR", "1") != "0"
+OCR_LANGUAGES = os.environ.get("RESUME_ANALYZER_OCR_LANG", "eng")
+OCR_TIMEOUT = float(os.environ.get("RESUME_ANALYZER_OCR_TIMEOUT", 90))
+OCR_DPI = 300
+OCR_DB_PATH = os.path.join(CACHE_DIR, "ocr.sqlite3")
+MIN_TEXT_CHARS = 20
+
+
+class OCRUnavailableError(RuntimeError):
+    """Raised when a page needs OCR but no OCR engine is installed."""
+
+
+def needs_ocr(page_text):
+    """Return whether a page's text layer is too thin to be the real content."""
+    return len(page_text.strip()) < MIN_TEXT_CHARS
+
+
+def page_hash(page):
+    """Return the cache key of a page: a hash of its content stream, embedded images and OCR settings."""
+    digest = hashlib.sha256(f"{OCR_LANGUAGES}:{OCR_DPI}".encode("utf-8"))
+    contents = page.get_contents()
+    if contents is not None:
+        digest.update(contents.get_data())
+    for image in page.images:
+        digest.update(image.data)
+    return digest.hexdigest()
+
+
+def _page_images(data, page, index):
+    """Return PIL images of a page: a rendering if pdf2image is installed, else its embedded images."""
+    from PIL import Image
+
+    try:
+        from pdf2image import convert_from_bytes
+    except ImportError:
+        return [Image.open(io.BytesIO(image.data)) for image in page.images]
+    return convert_from_bytes(data, dpi=OCR_DPI, first_page=index + 1, last_page=index + 1)
+
+
+def _can_render():
+    try:
+        import pdf2image  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class OCRCache:
+    """SQLite cache of OCR text by page hash, shared by every worker process."""
+
+    def __init__(self, db_path=OCR_DB_PATH):
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages (key TEXT PRIMARY KEY, text TEXT NOT NULL, created REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT text FROM pages WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set(self, key, text):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO pages (key, text, created) VALUES (?, ?, ?)",
+                               (key, text, time.time()))
+            self._conn.commit()
+
+
+@process_singleton
+def get_ocr_cache():
+    """Return this process's OCR cache connection."""
+    return OCRCache()
+
+
+def ocr_page(data, index):
+    """Return the OCR text of page ``index`` of the PDF ``data`` (runs in a sandbox worker)."""
+    from PyPDF2 import PdfReader
+
+    page = PdfReader(io.BytesIO(data)).pages[index]
+    if not page.images and not _can_render():
+        return ""  # nothing to recognise
+    key = page_hash(page)
+    cache = get_ocr_cache()
+    text = cache.get(key)
+    if text is not None:
+        return text
+    try:
+        import pytesseract
+        images = _page_images(data, page, index)
+    except ImportError:
+        raise OCRUnavailableError("OCR needs the pytesseract and Pillow packages and the Tesseract engine.") from None
+    text = "\n".join(pytesseract.image_to_string(image, lang=OCR_LANGUAGES).strip() for image in images).strip()
+    cache.set(key, text)
+    return text
@@ -0,0 +1,193 @@
+"""Resource-limited worker processes for parsing untrusted documents.
+
+Uploads are parsed outside the server process, so a pathological file can
+only hurt the request that sent it. ``SandboxPool`` keeps a few long-lived
+worker processes, each connected to the server by a pipe. Tasks (a function
+and its arguments) are sent down the pipe and the result comes back the same
+way. Each worker runs under an address-space limit (``RLIMIT_AS``), and every
+task has a wall-clock deadline. A worker that misses the deadline, runs out
+of memory or crashes is killed and replaced, and only that task fails; the
+other workers keep serving everyone else.
+
+Workers are started through the ``forkserver`` method where available, so
+they are forked from a small single-threaded process rather than the
+multi-threaded Streamlit server.
+"""
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from singleton import process_singleton
+
+try:
+    import resource
+except ImportError:  # not available on Windows; workers then run without a memory cap
+    resource = None
+
+# At least two workers, so one stuck document never holds up every upload.
+SANDBOX_WORKERS = max(2, min(4, os.cpu_count() or 1))
+SANDBOX_MEMORY_MB = int(os.environ.get("RESUME_ANALYZER_PDF_MEMORY_MB", 512))
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+class SandboxError(RuntimeError):
+    """Base class for tasks that failed inside the sandbox."""
+
+
+class SandboxTimeoutError(SandboxError):
+    """Raised when a task misses its deadline; its worker is killed."""
+
+
+class SandboxBusyError(SandboxTimeoutError):
+    """Raised when a task's deadline passes before a worker is free to start it.
+
+    Unlike other timeouts this says nothing about the task itself, only
+    about how busy the pool was.
+    """
+
+
+class SandboxMemoryError(SandboxError):
+    """Raised when a task exceeds the worker's memory limit."""
+
+
+class SandboxCrashError(SandboxError):
+    """Raised when a worker process dies while running a task."""
+
+
+class SandboxTaskError(SandboxError):
+    """Raised when a task raises an exception inside the worker."""
+
+
+def _address_space():
+    """Return the current virtual memory size of this process in bytes, or 0 if unknown."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _worker_main(conn, memory_limit_mb):
+    """Serve tasks from ``conn`` until it closes (runs in the worker process)."""
+    if resource is not None and memory_limit_mb:
+        # The cap is headroom on top of what the interpreter already maps, so
+        # it means the same whatever the start method inherited.
+        limit = _address_space() + memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            return
+        if task is None:
+            return
+        func, args = task
+        try:
+            reply = ("ok", func(*args))
+        except MemoryError:
+            reply = ("memory", f"{getattr(func, '__name__', 'task')} exceeded {memory_limit_mb} MB")
+        except Exception as e:
+            reply = ("error", f"{type(e).__name__}: {e}")
+        try:
+            conn.send(reply)
+        except MemoryError:
+            return
+        except Exception as e:  # e.g. a result that cannot be pickled
+            conn.send(("error", f"The result could not be returned: {type(e).__name__}: {e}"))
+        if reply[0] == "memory":
+            # The heap may be fragmented or half-initialised; start afresh.
+            return
+
+
+class _Worker:
+    def __init__(self, context, memory_limit_mb):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, memory_limit_mb),
+                                       name="pdf-sandbox", daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class SandboxPool:
+    """Fixed number of sandboxed worker processes fed from one task queue."""
+
+    def __init__(self, workers=SANDBOX_WORKERS, memory_limit_mb=SANDBOX_MEMORY_MB, start_method=START_METHOD):
+        self.workers = workers
+        self.memory_limit_mb = memory_limit_mb
+        self.restarts = 0
+        # Tasks of documents split across several workers take one of these
+        # slots while queued or running, so together they never occupy every
+        # worker and a new upload always finds one free.
+        self.split_slots = threading.BoundedSemaphore(max(1, workers - 1))
+        self._context = multiprocessing.get_context(start_method)
+        self._tasks = queue.Queue()
+        self._lock = threading.Lock()
+        # One dispatcher thread per worker process; each starts its process on
+        # its first task and replaces it whenever it has to be killed.
+        for i in range(workers):
+            threading.Thread(target=self._dispatch, name=f"pdf-sandbox-{i}", daemon=True).start()
+
+    def submit(self, func, *args, deadline=None):
+        """Queue ``func(*args)`` for a worker; return a ``Future``.
+
+        ``func`` must be importable by the worker (a module-level function).
+        ``deadline`` is a ``time.monotonic()`` value; a task still queued or
+        running at the deadline fails with ``SandboxTimeoutError``.
+        """
+        future = Future()
+        self._tasks.put((future, func, args, deadline))
+        return future
+
+    def _dispatch(self):
+        worker = None
+        while True:
+            future, func, args, deadline = self._tasks.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                future.set_exception(SandboxBusyError("No worker was free before the document's deadline."))
+                continue
+            if worker is None:
+                worker = _Worker(self._context, self.memory_limit_mb)
+            try:
+                worker.conn.send((func, args))
+                if not worker.conn.poll(remaining):
+                    raise SandboxTimeoutError("Parsing took longer than the time limit and was stopped.")
+                status, payload = worker.conn.recv()
+            except SandboxTimeoutError as e:
+                worker = self._replace(worker)
+                future.set_exception(e)
+                continue
+            except (EOFError, OSError):
+                worker = self._replace(worker)
+                future.set_exception(SandboxCrashError(
+                    f"The parser process exited unexpectedly (memory limit {self.memory_limit_mb} MB)."))
+                continue
+            if status == "ok":
+                future.set_result(payload)
+            elif status == "memory":
+                worker = self._replace(worker)
+                future.set_exception(SandboxMemoryError(payload))
+            else:
+                future.set_exception(SandboxTaskError(payload))
+
+    def _replace(self, worker):
+        worker.kill()
+        with self._lock:
+            self.restarts += 1
+        return None
+
+
+@process_singleton
+def get_sandbox_pool():
+    """Return the process-wide sandbox pool."""
+    return SandboxPool()
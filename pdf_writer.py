@@ -0,0 +1,104 @@
+"""Minimal, dependency-free writer for plain-text PDFs.
+
+Text is laid out in Helvetica on US Letter pages, wrapped to the page width
+and flowed onto as many pages as it needs. The document is produced as a
+stream of byte chunks: each page is emitted as soon as it is laid out, and
+the page tree and cross-reference table are written at the end, so memory
+use does not grow with the length of the document. Characters outside
+Latin-1 are replaced with ``?``.
+"""
+import textwrap
+
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+MARGIN = 72
+FONT_SIZE = 10
+LEADING = 14
+WRAP_WIDTH = 95
+LINES_PER_PAGE = (PAGE_HEIGHT - 2 * MARGIN) // LEADING
+
+_CATALOG, _PAGES, _FONT = 1, 2, 3
+
+
+def _escape(line):
+    line = line.encode("latin-1", errors="replace").decode("latin-1")
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _wrap(text):
+    for paragraph in text.splitlines() or [""]:
+        paragraph = paragraph.expandtabs(4).rstrip()
+        yield from textwrap.wrap(paragraph, WRAP_WIDTH, replace_whitespace=False) or [""]
+
+
+def _iter_pages(texts):
+    """Yield the lines of each physical page; every text starts on a new page."""
+    for text in texts:
+        page = []
+        for line in _wrap(text):
+            page.append(line)
+            if len(page) == LINES_PER_PAGE:
+                yield page
+                page = []
+        if page:
+            yield page
+
+
+def iter_pdf(texts):
+    """Yield the bytes of a PDF showing each text in ``texts``, starting each on a new page."""
+    offsets = {}
+    position = 0
+
+    def emit(number, body):
+        nonlocal position
+        offsets[number] = position
+        chunk = f"{number} 0 obj\n".encode("latin-1") + body + b"\nendobj\n"
+        position += len(chunk)
+        return chunk
+
+    header = b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"
+    position = len(header)
+    yield header
+    yield emit(_CATALOG, f"<< /Type /Catalog /Pages {_PAGES} 0 R >>".encode("latin-1"))
+    yield emit(_FONT, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+
+    page_numbers = []
+    next_number = _FONT + 1
+    for lines in _iter_pages(texts):
+        content_number, page_number = next_number, next_number + 1
+        next_number += 2
+        operations = [f"BT /F1 {FONT_SIZE} Tf {LEADING} TL {MARGIN} {PAGE_HEIGHT - MARGIN} Td"]
+        operations += [f"({_escape(line)}) Tj T*" for line in lines]
+        operations.append("ET")
+        stream = "\n".join(operations).encode("latin-1")
+        yield emit(content_number, f"<< /Length {len(stream)} >>\nstream\n".encode("latin-1") + stream + b"\nendstream")
+        yield emit(page_number, (
+            f"<< /Type /Page /Parent {_PAGES} 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}]"
+            f" /Resources << /Font << /F1 {_FONT} 0 R >> >> /Contents {content_number} 0 R >>"
+        ).encode("latin-1"))
+        page_numbers.append(page_number)
+
+    if not page_numbers:
+        # A PDF needs at least one page; emit a blank one.
+        yield from _blank_page(emit, next_number, page_numbers)
+        next_number += 1
+    kids = " ".join(f"{n} 0 R" for n in page_numbers)
+    yield emit(_PAGES, f"<< /Type /Pages /Kids [{kids}] /Count {len(page_numbers)} >>".encode("latin-1"))
+
+    xref_position = position
+    xref = [f"xref\n0 {next_number}\n", "0000000000 65535 f \n"]
+    xref += [f"{offsets[n]:010d} 00000 n \n" for n in range(1, next_number)]
+    xref.append(f"trailer\n<< /Size {next_number} /Root {_CATALOG} 0 R >>\nstartxref\n{xref_position}\n%%EOF\n")
+    yield "".join(xref).encode("latin-1")
+
+
+def _blank_page(emit, number, page_numbers):
+    page_numbers.append(number)
+    yield emit(number, (
+        f"<< /Type /Page /Parent {_PAGES} 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] /Resources << >> >>"
+    ).encode("latin-1"))
+
+
+def build_pdf(texts):
+    """Return a complete PDF (bytes) showing each text in ``texts`` from a new page."""
+    return b"".join(iter_pdf(texts))
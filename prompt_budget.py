@@ -0,0 +1,206 @@
+"""Prompt token budgeting and resume compression.
+
+Before a resume or job description is interpolated into a prompt it is
+cleaned (whitespace collapsed, boilerplate and running page headers and
+footers dropped) and, if it is still over budget, truncated section by
+section in priority order: skills and experience survive longest, headers
+and publications go first.
+Token counts for every call are recorded so they can be reported in the UI.
+"""
+import json
+import math
+import re
+import threading
+import time
+from collections import Counter, deque
+
+from skill_extractor import segment_sections
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("o200k_base")
+except Exception:  # tiktoken is optional; fall back to a character heuristic.
+    _ENCODING = None
+
+CHARS_PER_TOKEN = 4
+RESUME_TOKEN_BUDGET = 1500
+JOB_DESCRIPTION_TOKEN_BUDGET = 1000
+SMALL_SECTION_TOKENS = 120
+USAGE_LOG_SIZE = 200
+TRUNCATION_MARKER = "[...]"
+# Page separator in extracted text (see pdf_extract).
+PAGE_BREAK = "\f"
+# How many lines at the top and bottom of a page may be a running header or footer.
+PAGE_EDGE_LINES = 2
+
+# Highest priority first; sections not listed rank last.
+SECTION_PRIORITY = ["skills", "experience", "projects", "education", "certifications",
+                    "summary", "achievements", "header", "publications"]
+
+BOILERPLATE_RE = re.compile(
+    r"^(references (are )?available (up)?on request\.?"
+    r"|page \d+( of \d+)?"
+    r"|\d{1,3} ?/ ?\d{1,3}"
+    r"|curriculum vitae|resume|cv"
+    r"|i hereby declare.*"
+    r"|declaration)$",
+    re.IGNORECASE,
+)
+DECORATION_RE = re.compile(r"^[\W_]+$")
+INLINE_SPACE_RE = re.compile(r"[ \t\u00a0]+")
+LEADING_SPACE_RE = re.compile(r"^[ \t]+", re.MULTILINE)
+BLANK_LINES_RE = re.compile(r"\n{3,}")
+DIGITS_RE = re.compile(r"\d+")
+
+
+def estimate_tokens(text):
+    """Return the (estimated) number of tokens in ``text``."""
+    if not text:
+        return 0
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _page_lines(page):
+    lines = []
+    for raw_line in page.splitlines():
+        line = INLINE_SPACE_RE.sub(" ", raw_line).strip()
+        if not (BOILERPLATE_RE.match(line) or DECORATION_RE.match(line)):
+            lines.append(line)
+    return lines
+
+
+def _edge_keys(lines):
+    """Return ``{index: key}`` for the first and last ``PAGE_EDGE_LINES`` non-blank lines of a page."""
+    filled = [index for index, line in enumerate(lines) if line]
+    edges = filled[:PAGE_EDGE_LINES] + filled[-PAGE_EDGE_LINES:]
+    # Page numbers inside a header ("Jane Doe - 2") differ from page to page.
+    return {index: DIGITS_RE.sub("#", lines[index].lower()) for index in edges}
+
+
+def clean_text(text):
+    """Collapse whitespace and drop boilerplate, decoration-only lines and running headers/footers.
+
+    A line is a running header or footer when it recurs at the top or bottom
+    of two or more pages; only its first occurrence is kept. Other repeated
+    lines, such as the same job title at two employers, are left alone.
+    """
+    pages = [_page_lines(page) for page in text.split(PAGE_BREAK)]
+    edges = [_edge_keys(lines) for lines in pages]
+    recurring = Counter(key for page_edges in edges for key in set(page_edges.values()))
+    seen = set()
+    kept = []
+    for lines, page_edges in zip(pages, edges):
+        for index, line in enumerate(lines):
+            if not line:
+                if kept and kept[-1]:
+                    kept.append("")
+                continue
+            key = page_edges.get(index)
+            if key is not None and recurring[key] > 1:
+                if key in seen:
+                    continue
+                seen.add(key)
+            kept.append(line)
+    return "\n".join(kept).strip()
+
+
+def truncate_to_budget(text, max_tokens):
+    """Cut ``text`` at a line (or word) boundary so it fits ``max_tokens``."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    kept = []
+    used = estimate_tokens(TRUNCATION_MARKER)
+    for line in text.splitlines():
+        cost = estimate_tokens(line) + 1
+        if used + cost > max_tokens:
+            remaining = max_tokens - used
+            if remaining > 8:
+                kept.append(line[:remaining * CHARS_PER_TOKEN].rsplit(" ", 1)[0])
+            break
+        kept.append(line)
+        used += cost
+    kept.append(TRUNCATION_MARKER)
+    return "\n".join(kept)
+
+
+def compress_resume(resume_text, max_tokens=RESUME_TOKEN_BUDGET):
+    """Return a cleaned resume that fits ``max_tokens``, keeping high-priority sections whole."""
+    cleaned = clean_text(resume_text)
+    if estimate_tokens(cleaned) <= max_tokens:
+        return cleaned
+
+    sections = []
+    for order, (name, start, end) in enumerate(segment_sections(cleaned)):
+        body = cleaned[start:end].strip()
+        if body:
+            sections.append({"order": order, "name": name, "body": body})
+
+    def priority(section):
+        name = section["name"]
+        return SECTION_PRIORITY.index(name) if name in SECTION_PRIORITY else len(SECTION_PRIORITY)
+
+    ordered = sorted(sections, key=priority)
+    for section in ordered:
+        section["label"] = "" if section["name"] == "header" else section["name"].upper() + ":\n"
+        section["cost"] = estimate_tokens(section["label"]) + estimate_tokens(section["body"]) + 1
+
+    remaining = max_tokens
+    for position, section in enumerate(ordered):
+        # Hold back room for short lower-priority sections (name, education)
+        # so one long Experience section cannot crowd them out entirely.
+        reserve = sum(min(other["cost"], SMALL_SECTION_TOKENS) for other in ordered[position + 1:])
+        allowance = max(remaining - reserve, 0)
+        label_cost = estimate_tokens(section["label"])
+        if section["cost"] <= allowance:
+            section["text"] = section["label"] + section["body"]
+            remaining -= section["cost"]
+        elif allowance > label_cost + 16:
+            section["text"] = section["label"] + truncate_to_budget(section["body"], allowance - label_cost)
+            remaining -= allowance
+        else:
+            section["text"] = ""
+    return "\n\n".join(s["text"] for s in sorted(sections, key=lambda s: s["order"]) if s["text"])
+
+
+def compress_job_description(job_description, max_tokens=JOB_DESCRIPTION_TOKEN_BUDGET):
+    """Return a cleaned job description that fits ``max_tokens``."""
+    return truncate_to_budget(clean_text(job_description), max_tokens)
+
+
+def normalize_prompt(prompt):
+    """Strip code indentation and blank-line runs from a prompt template."""
+    return BLANK_LINES_RE.sub("\n\n", LEADING_SPACE_RE.sub("", prompt)).strip()
+
+
+def compact_json(data):
+    """Serialize ``data`` without indentation or padding."""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+#############################################
+# Usage Reporting
+#############################################
+_usage_log = deque(maxlen=USAGE_LOG_SIZE)
+_usage_lock = threading.Lock()
+
+
+def record_usage(label, prompt, response, cached=False):
+    """Record prompt/response token counts for one generation call."""
+    entry = {
+        "time": time.time(),
+        "label": label or "generate_response",
+        "prompt_tokens": estimate_tokens(prompt),
+        "response_tokens": estimate_tokens(response),
+        "cached": cached,
+    }
+    with _usage_lock:
+        _usage_log.append(entry)
+    return entry
+
+
+def get_usage_log():
+    """Return the recorded calls, most recent last."""
+    with _usage_lock:
+        return list(_usage_log)
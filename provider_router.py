@@ -0,0 +1,263 @@
+"""Hedged routing across several providers or models.
+
+``HedgedRouter`` is itself a ``Provider``, so ``AsyncLLMClient`` uses it like
+any other backend. Each request goes to the route with the best recent
+latency. If that route has not answered (or, for streams, produced its first
+chunk) within a percentile of its own recent latencies, a hedged duplicate is
+sent to the next route. The first successful answer wins and the other
+request is cancelled. A route that fails is replaced by the next one right
+away. Latencies and failures are tracked per route and feed both the route
+order and the hedge delay.
+
+Routes are configured with ``RESUME_ANALYZER_ROUTES``, a comma-separated list
+of ``provider`` or ``provider:model`` entries, e.g. ``g4f:gpt-4o,g4f:gpt-4o-mini``.
+"""
+import asyncio
+import os
+import threading
+from collections import deque
+
+import numpy as np
+
+from providers import Provider, get_provider
+
+ROUTES_ENV = "RESUME_ANALYZER_ROUTES"
+HEDGE_PERCENTILE = 90
+DEFAULT_HEDGE_DELAY = 2.0
+MIN_HEDGE_DELAY = 0.05
+MAX_HEDGE_DELAY = 30.0
+MIN_SAMPLES = 5
+LATENCY_WINDOW = 200
+FAILURE_PENALTY = 10.0
+MAX_HEDGES = 1
+
+
+class EmptyStreamError(RuntimeError):
+    """Raised when a route's stream ends without producing any text."""
+
+
+class Route:
+    """One provider, optionally pinned to a model that overrides the requested one."""
+
+    def __init__(self, provider, model=None):
+        self.provider = provider
+        self.model = model
+        self.name = f"{provider.name}:{model}" if model else provider.name
+
+
+class LatencyTracker:
+    """Recent latencies, wins and failures per route and request kind."""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self._window = window
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._counts = {}
+
+    def _count(self, route, kind, field):
+        counts = self._counts.setdefault((route, kind), {"requests": 0, "wins": 0, "hedged": 0, "failures": 0})
+        counts[field] += 1
+
+    def started(self, route, kind, hedged=False):
+        with self._lock:
+            self._count(route, kind, "requests")
+            if hedged:
+                self._count(route, kind, "hedged")
+
+    def succeeded(self, route, kind, seconds):
+        with self._lock:
+            self._samples.setdefault((route, kind), deque(maxlen=self._window)).append(seconds)
+            self._count(route, kind, "wins")
+
+    def lost(self, route, kind, seconds):
+        """Record a request cancelled after ``seconds``: its latency was at least that long."""
+        with self._lock:
+            self._samples.setdefault((route, kind), deque(maxlen=self._window)).append(seconds)
+
+    def failed(self, route, kind):
+        with self._lock:
+            # A failure counts as a slow sample so routing steers away from it.
+            self._samples.setdefault((route, kind), deque(maxlen=self._window)).append(FAILURE_PENALTY)
+            self._count(route, kind, "failures")
+
+    def percentile(self, route, kind, q):
+        """Return the ``q``-th percentile latency, or ``None`` with too few samples."""
+        with self._lock:
+            samples = list(self._samples.get((route, kind), ()))
+        if len(samples) < MIN_SAMPLES:
+            return None
+        return float(np.percentile(samples, q))
+
+    def score(self, route, kind):
+        """Return the ordering score of a route (lower is better; unmeasured routes go first)."""
+        return self.percentile(route, kind, 50) or 0.0
+
+    def stats(self):
+        """Return one dict per route and request kind with counts and latency percentiles."""
+        with self._lock:
+            keys = sorted(set(self._counts) | set(self._samples))
+            rows = []
+            for route, kind in keys:
+                samples = np.array(self._samples.get((route, kind), ()))
+                p50, p95 = np.percentile(samples, [50, 95]) if len(samples) else (np.nan, np.nan)
+                rows.append({"route": route, "kind": kind,
+                             **self._counts.get((route, kind), {}),
+                             "p50_s": float(p50), "p95_s": float(p95)})
+            return rows
+
+
+class HedgedRouter(Provider):
+    """Provider that races hedged requests across ``routes``."""
+
+    name = "router"
+
+    def __init__(self, routes, hedge_percentile=HEDGE_PERCENTILE, max_hedges=MAX_HEDGES, tracker=None):
+        if not routes:
+            raise ValueError("HedgedRouter needs at least one route.")
+        self.routes = list(routes)
+        self.hedge_percentile = hedge_percentile
+        self.max_hedges = max_hedges
+        self.tracker = tracker or LatencyTracker()
+
+    def warm_up(self):
+        for route in self.routes:
+            route.provider.warm_up()
+
+    def ordered_routes(self, kind):
+        """Return the routes best-first by recent median latency (stable for ties)."""
+        return sorted(self.routes, key=lambda route: self.tracker.score(route.name, kind))
+
+    def hedge_delay(self, route, kind):
+        """Return how long to wait for ``route`` before sending a hedged duplicate."""
+        delay = self.tracker.percentile(route.name, kind, self.hedge_percentile)
+        if delay is None:
+            return DEFAULT_HEDGE_DELAY
+        return min(max(delay, MIN_HEDGE_DELAY), MAX_HEDGE_DELAY)
+
+    async def _race(self, kind, start, discard):
+        """Run ``start(route)`` on the best route, hedging and failing over; return the first success.
+
+        ``start`` returns an awaitable for a route's answer; ``discard`` is
+        called with each route whose request lost or was cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        routes = self.ordered_routes(kind)
+        pending = {}
+        launched = 0
+        hedges = 0
+        errors = []
+
+        def launch(hedged=False):
+            nonlocal launched
+            route = routes[launched]
+            launched += 1
+            self.tracker.started(route.name, kind, hedged)
+            pending[asyncio.ensure_future(start(route))] = (route, loop.time())
+
+        launch()
+        try:
+            while pending or launched < len(routes):
+                if not pending:
+                    # Everything in flight failed: fail over immediately.
+                    launch()
+                    continue
+                timeout = None
+                if hedges < self.max_hedges and launched < len(routes):
+                    # Hedge against the newest request in flight (after a
+                    # failover that is not the first route), timed from its launch.
+                    route, started = max(pending.values(), key=lambda entry: entry[1])
+                    timeout = max(self.hedge_delay(route, kind) - (loop.time() - started), 0.0)
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedges += 1
+                    launch(hedged=True)
+                    continue
+                winner = None
+                for task in done:
+                    route, started = pending.pop(task)
+                    error = task.exception()
+                    if error is not None:
+                        self.tracker.failed(route.name, kind)
+                        errors.append(error)
+                    elif winner is None:
+                        self.tracker.succeeded(route.name, kind, loop.time() - started)
+                        winner = (route, task.result())
+                    else:
+                        self.tracker.lost(route.name, kind, loop.time() - started)
+                        discard(route)
+                if winner is not None:
+                    return winner
+            raise errors[-1] if errors else RuntimeError("No provider route answered.")
+        finally:
+            for task, (route, started) in pending.items():
+                task.cancel()
+                self.tracker.lost(route.name, kind, loop.time() - started)
+                discard(route)
+
+    async def complete(self, messages, model, temperature, top_p):
+        async def start(route):
+            text = await route.provider.complete(messages, route.model or model, temperature, top_p)
+            if not text:
+                raise EmptyStreamError(f"{route.name} returned an empty response.")
+            return text
+
+        _, text = await self._race("complete", start, lambda route: None)
+        return text
+
+    async def stream(self, messages, model, temperature, top_p):
+        # Streams race on their first chunk; the winner's stream then continues
+        # on its own and the losing streams are closed. Iterators are keyed by
+        # route object, since two routes may share a name.
+        iterators = {}
+
+        async def start(route):
+            iterator = route.provider.stream(messages, route.model or model, temperature, top_p).__aiter__()
+            iterators[route] = iterator
+            while True:
+                try:
+                    chunk = await iterator.__anext__()
+                except StopAsyncIteration:
+                    raise EmptyStreamError(f"{route.name} returned an empty stream.") from None
+                if chunk:
+                    return chunk
+
+        def discard(route):
+            iterator = iterators.pop(route, None)
+            if iterator is not None and hasattr(iterator, "aclose"):
+                asyncio.ensure_future(_close_quietly(iterator))
+
+        route, first_chunk = await self._race("stream", start, discard)
+        iterator = iterators.pop(route)
+        try:
+            yield first_chunk
+            async for chunk in iterator:
+                yield chunk
+        finally:
+            if hasattr(iterator, "aclose"):
+                await iterator.aclose()
+
+
+async def _close_quietly(iterator):
+    try:
+        await iterator.aclose()
+    except Exception:
+        pass
+
+
+def parse_routes(spec):
+    """Build routes from a ``provider[:model],...`` specification."""
+    routes = []
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if entry:
+            name, _, model = entry.partition(":")
+            routes.append(Route(get_provider(name), model or None))
+    return routes
+
+
+def build_default_provider():
+    """Return a ``HedgedRouter`` when ``RESUME_ANALYZER_ROUTES`` is set, else the single default provider."""
+    spec = os.environ.get(ROUTES_ENV)
+    if spec:
+        return HedgedRouter(parse_routes(spec))
+    return get_provider()
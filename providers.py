@@ -0,0 +1,199 @@
+"""Chat-completion providers behind ``llm_client.AsyncLLMClient``.
+
+A provider turns a list of chat messages into text, either all at once
+(``complete``) or as a stream of chunks (``stream``). Retries, deadlines and
+concurrency limits stay in the client, so providers only talk to a backend.
+
+- ``G4FProvider`` calls the live g4f network providers (the default).
+- ``FakeProvider`` answers locally and deterministically with configurable
+  latency, time-to-first-chunk and chunking, for benchmarks and offline runs.
+
+Set ``RESUME_ANALYZER_PROVIDER=fake`` to run the app without network access;
+``RESUME_ANALYZER_FAKE_LATENCY`` sets the fake provider's latency in seconds.
+"""
+import asyncio
+import hashlib
+import inspect
+import json
+import os
+import random
+import re
+
+PROVIDER_ENV = "RESUME_ANALYZER_PROVIDER"
+FAKE_LATENCY_ENV = "RESUME_ANALYZER_FAKE_LATENCY"
+DEFAULT_PROVIDER = "g4f"
+
+
+def _message_text(response):
+    if isinstance(response, str):
+        return response
+    return response.choices[0].message.content or ""
+
+
+def _chunk_text(chunk):
+    if isinstance(chunk, str):
+        return chunk
+    try:
+        return chunk.choices[0].delta.content or ""
+    except (AttributeError, IndexError):
+        # Non-text events such as finish reasons or usage reports.
+        return ""
+
+
+class Provider:
+    """Interface for chat-completion backends."""
+
+    name = "provider"
+
+    async def complete(self, messages, model, temperature, top_p):
+        """Return the full completion text for ``messages``."""
+        raise NotImplementedError
+
+    async def stream(self, messages, model, temperature, top_p):
+        """Yield completion text chunks for ``messages``."""
+        raise NotImplementedError
+        yield  # pragma: no cover - makes this an async generator
+
+    def warm_up(self):
+        """Load whatever the first request would otherwise wait for (libraries, clients)."""
+
+
+class G4FProvider(Provider):
+    """Live completions through ``g4f.client.AsyncClient``."""
+
+    name = "g4f"
+
+    def __init__(self):
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            from g4f.client import AsyncClient
+            self._client = AsyncClient()
+        return self._client
+
+    def warm_up(self):
+        self._get_client()
+
+    async def complete(self, messages, model, temperature, top_p):
+        response = await self._get_client().chat.completions.create(
+            model=model, messages=messages, temperature=temperature, top_p=top_p
+        )
+        return _message_text(response)
+
+    async def stream(self, messages, model, temperature, top_p):
+        chunks = self._get_client().chat.completions.create(
+            model=model, messages=messages, temperature=temperature, top_p=top_p, stream=True
+        )
+        if inspect.isawaitable(chunks):
+            chunks = await chunks
+        async for chunk in chunks:
+            text = _chunk_text(chunk)
+            if text:
+                yield text
+
+
+#############################################
+# Deterministic Local Provider
+#############################################
+_SKILL_LIST_RE = re.compile(r"key technical skills are: (.+?)\. For each", re.IGNORECASE)
+_QUESTION_COUNT_RE = re.compile(r"generate (\d+) multiple-choice questions", re.IGNORECASE)
+
+
+def fake_quiz(skills, questions_per_skill=3):
+    """Return a valid quiz (as JSON text) for ``skills``, in the format the app asks for."""
+    difficulties = ("easy", "medium", "hard")
+    return json.dumps([
+        {
+            "skill": skill,
+            "questions": [
+                {
+                    "question": f"Which statement about {skill} is correct? (#{i + 1})",
+                    "options": {"a": f"Correct fact {i + 1} about {skill}", "b": "A common misconception",
+                                "c": "An unrelated statement", "d": "None of the above"},
+                    "correct": "abcd"[i % 4],
+                    "difficulty": difficulties[i % len(difficulties)],
+                }
+                for i in range(questions_per_skill)
+            ],
+        }
+        for skill in skills
+    ], indent=2)
+
+
+def fake_reply(prompt):
+    """Return a deterministic, plausibly shaped answer for one of the app's prompts."""
+    # Other prompts may embed quiz JSON (e.g. learning recommendations), so
+    # only the MCQ instruction itself marks a quiz request.
+    count_match = _QUESTION_COUNT_RE.search(prompt)
+    if count_match:
+        skills_match = _SKILL_LIST_RE.search(prompt)
+        skills = [s.strip() for s in skills_match.group(1).split(",")] if skills_match else ["Python", "SQL"]
+        return fake_quiz(skills, int(count_match.group(1)))
+    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    first_line = next((line for line in prompt.splitlines() if line.strip()), "")[:120]
+    paragraphs = [
+        f"**Summary.** This is a simulated response ({digest[:12]}) to: {first_line}",
+        "**Strengths.** The candidate shows relevant experience, a clear progression of "
+        "responsibilities and hands-on use of the listed technologies.",
+        "**Suggestions.** Quantify achievements, align the skills section with the role's "
+        "keywords and add links to recent projects.",
+    ]
+    return "\n\n".join(paragraphs)
+
+
+class FakeProvider(Provider):
+    """Deterministic local stand-in for a network provider.
+
+    ``latency`` is the total time for a completion; a stream delivers its
+    first chunk after ``first_chunk_latency`` and spreads the rest of the
+    latency over chunks of ``chunk_size`` characters. ``failure_rate`` makes
+    a seeded fraction of calls raise ``ConnectionError`` to exercise retries.
+    ``responder`` maps a prompt to the reply text (default: ``fake_reply``).
+    """
+
+    name = "fake"
+
+    def __init__(self, latency=0.05, first_chunk_latency=None, chunk_size=40,
+                 failure_rate=0.0, seed=0, responder=fake_reply):
+        self.latency = latency
+        self.first_chunk_latency = latency / 4 if first_chunk_latency is None else first_chunk_latency
+        self.chunk_size = chunk_size
+        self.failure_rate = failure_rate
+        self.responder = responder
+        self.calls = 0
+        self._random = random.Random(seed)
+
+    def _begin(self):
+        self.calls += 1
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            raise ConnectionError("Simulated provider failure.")
+
+    async def complete(self, messages, model, temperature, top_p):
+        self._begin()
+        await asyncio.sleep(self.latency)
+        return self.responder(messages[-1]["content"])
+
+    async def stream(self, messages, model, temperature, top_p):
+        self._begin()
+        text = self.responder(messages[-1]["content"])
+        chunks = [text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size)] or [""]
+        await asyncio.sleep(self.first_chunk_latency)
+        per_chunk = max(self.latency - self.first_chunk_latency, 0.0) / max(len(chunks) - 1, 1)
+        for index, chunk in enumerate(chunks):
+            if index:
+                await asyncio.sleep(per_chunk)
+            yield chunk
+
+
+PROVIDERS = {"g4f": G4FProvider, "fake": FakeProvider}
+
+
+def get_provider(name=None):
+    """Create the provider named by ``name`` or ``RESUME_ANALYZER_PROVIDER`` (default: g4f)."""
+    name = (name or os.environ.get(PROVIDER_ENV) or DEFAULT_PROVIDER).lower()
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown provider {name!r}; expected one of {', '.join(PROVIDERS)}.")
+    if name == "fake" and os.environ.get(FAKE_LATENCY_ENV):
+        return FakeProvider(latency=float(os.environ[FAKE_LATENCY_ENV]))
+    return PROVIDERS[name]()
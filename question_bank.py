@@ -0,0 +1,133 @@
+"""Local bank of validated quiz questions, shared across candidates.
+
+Questions are stored in SQLite keyed by a normalised skill name (aliases from
+the skills taxonomy map to their canonical skill, so "python3" and "Python"
+share one pool) and tagged with a difficulty. A quiz for a skill the bank
+already covers is assembled from stored questions without a model call; only
+unseen skills need to be generated. Identical questions are stored once.
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from mcq_parser import DEFAULT_DIFFICULTY, DIFFICULTIES
+from response_cache import CACHE_DIR
+from singleton import process_singleton
+from skill_extractor import SKILLS_TAXONOMY
+
+BANK_DB_PATH = os.path.join(CACHE_DIR, "question_bank.sqlite3")
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_ALIASES = {
+    alias.lower(): canonical.lower()
+    for canonical, (_, aliases) in SKILLS_TAXONOMY.items()
+    for alias in [canonical, *aliases]
+}
+
+
+def normalize_skill(name):
+    """Return the bank key for a skill name (case-, whitespace- and alias-insensitive)."""
+    key = _WHITESPACE_RE.sub(" ", name).strip().lower()
+    return _ALIASES.get(key, key)
+
+
+def normalize_difficulty(value):
+    """Return ``value`` if it is a known difficulty tag, else the default."""
+    value = str(value or "").strip().lower()
+    return value if value in DIFFICULTIES else DEFAULT_DIFFICULTY
+
+
+class QuestionBank:
+    """SQLite store of quiz questions keyed by normalised skill and difficulty."""
+
+    def __init__(self, db_path=BANK_DB_PATH):
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS questions ("
+            " fingerprint TEXT PRIMARY KEY,"
+            " skill_key TEXT NOT NULL,"
+            " skill TEXT NOT NULL,"
+            " difficulty TEXT NOT NULL,"
+            " question TEXT NOT NULL,"
+            " options TEXT NOT NULL,"
+            " correct TEXT NOT NULL,"
+            " added REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS questions_skill ON questions (skill_key, difficulty)")
+        self._conn.commit()
+
+    def add(self, skill, questions):
+        """Store validated questions for ``skill``; return how many were new."""
+        skill_key = normalize_skill(skill)
+        rows = []
+        for q in questions:
+            fingerprint = hashlib.sha256(
+                json.dumps([skill_key, q["question"].lower()], ensure_ascii=False).encode("utf-8")
+            ).hexdigest()
+            rows.append((fingerprint, skill_key, skill, normalize_difficulty(q.get("difficulty")),
+                         q["question"], json.dumps(q["options"], ensure_ascii=False), q["correct"], time.time()))
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO questions"
+                " (fingerprint, skill_key, skill, difficulty, question, options, correct, added)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    def count(self, skill):
+        """Return the number of stored questions for ``skill``."""
+        with self._lock:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM questions WHERE skill_key = ?", (normalize_skill(skill),)
+            ).fetchone()
+            return count
+
+    def sample(self, skill, count, difficulty=None):
+        """Return up to ``count`` random questions for ``skill``, easiest first.
+
+        Without a ``difficulty`` the sample is spread across the difficulty
+        levels; any shortfall is filled from whatever else the bank holds.
+        """
+        skill_key = normalize_skill(skill)
+        levels = [normalize_difficulty(difficulty)] if difficulty else list(DIFFICULTIES)
+        picked = []
+        with self._lock:
+            for level_index, level in enumerate(levels):
+                # Share what is still needed evenly over the remaining levels;
+                # later levels pick up any shortfall from earlier ones.
+                wanted = count - len(picked)
+                share = wanted if level_index == len(levels) - 1 else -(-wanted // (len(levels) - level_index))
+                picked += self._conn.execute(
+                    "SELECT question, options, correct, difficulty FROM questions"
+                    " WHERE skill_key = ? AND difficulty = ? ORDER BY RANDOM() LIMIT ?",
+                    (skill_key, level, share),
+                ).fetchall()
+            if len(picked) < count:
+                taken = [row[0] for row in picked]
+                placeholders = ",".join("?" * len(taken))
+                picked += self._conn.execute(
+                    "SELECT question, options, correct, difficulty FROM questions"
+                    f" WHERE skill_key = ? AND question NOT IN ({placeholders}) ORDER BY RANDOM() LIMIT ?",
+                    (skill_key, *taken, count - len(picked)),
+                ).fetchall()
+        questions = [
+            {"question": question, "options": json.loads(options), "correct": correct, "difficulty": level}
+            for question, options, correct, level in picked
+        ]
+        questions.sort(key=lambda q: DIFFICULTIES.index(q["difficulty"]))
+        return questions
+
+
+@process_singleton
+def get_question_bank():
+    """Return the process-wide question bank."""
+    return QuestionBank()
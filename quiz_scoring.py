@@ -0,0 +1,101 @@
+"""Vectorized quiz scoring and aggregation.
+
+A quiz is flattened once into an answer-key table (one row per question).
+Scoring a submission is then a single column comparison, and per-skill
+results are a group-by instead of a loop that updates nested dicts. The same
+operations work on a flat table of many attempts, which is how
+``score_attempts`` scores thousands of stored attempts in one pass for
+cohort analytics.
+"""
+import numpy as np
+
+RATING_THRESHOLDS = [40, 60, 80]
+RATING_LABELS = ["Needs Improvement", "Average", "Good", "Excellent"]
+RESULT_COLUMNS = ["skill", "question", "user_answer", "correct_answer", "status"]
+
+
+def question_key(skill_name, index):
+    """Return the session-state key that holds the answer to a quiz question."""
+    return f"{skill_name.replace(' ', '_')}_{index}"
+
+
+def performance_rating(percentage):
+    """Map a percentage (scalar or array) to its performance rating label(s)."""
+    labels = np.array(RATING_LABELS)[np.searchsorted(RATING_THRESHOLDS, percentage, side="right")]
+    return labels if np.ndim(percentage) else str(labels)
+
+
+def answer_key_table(mcq_data):
+    """Flatten a quiz into one row per question: skill, key, question, correct answer, difficulty."""
+    import pandas as pd
+
+    rows = [
+        (block.get("skill", "Unknown Skill"), index, question.get("question", "No question provided"),
+         str(question.get("correct", "")).lower(), question.get("difficulty"))
+        for block in mcq_data
+        for index, question in enumerate(block.get("questions", []))
+    ]
+    table = pd.DataFrame(rows, columns=["skill", "index", "question", "correct_answer", "difficulty"])
+    table.insert(1, "key", [question_key(skill, index) for skill, index in zip(table["skill"], table["index"])])
+    return table
+
+
+def _mark(table):
+    """Add ``is_correct`` and ``status`` columns to a table with user and correct answers."""
+    is_correct = table["user_answer"].eq(table["correct_answer"]).to_numpy()
+    return table.assign(is_correct=is_correct, status=np.where(is_correct, "Correct", "Incorrect"))
+
+
+def skill_breakdown(results, by=("skill",)):
+    """Aggregate marked results into correct/total/percentage per ``by`` group."""
+    grouped = results.groupby(list(by), sort=False)["is_correct"].agg(correct="sum", total="size").reset_index()
+    grouped["correct"] = grouped["correct"].astype(int)
+    grouped["percentage"] = grouped["correct"] / grouped["total"] * 100
+    return grouped
+
+
+def score_quiz(mcq_data, answers):
+    """Score one submission; ``answers`` maps ``question_key`` to the chosen option.
+
+    Returns a dict with ``score``, ``total``, ``percentage``, ``rating``, the
+    per-question ``results`` table and the per-skill ``skills`` table.
+    """
+    table = answer_key_table(mcq_data)
+    table["user_answer"] = [answers.get(key) for key in table["key"]]
+    results = _mark(table)
+    score = int(results["is_correct"].sum())
+    total = len(results)
+    percentage = score / total * 100 if total else 0.0
+    return {
+        "score": score,
+        "total": total,
+        "percentage": percentage,
+        "rating": performance_rating(percentage),
+        "results": results,
+        "skills": skill_breakdown(results),
+    }
+
+
+def flatten_attempts(attempts):
+    """Build a flat answer table from ``{attempt_id: detailed_results}`` (as stored after a quiz)."""
+    import pandas as pd
+
+    # One DataFrame construction for all rows; building a frame per attempt
+    # and concatenating dominates the cost for large cohorts.
+    rows = [(attempt_id, *(result.get(column) for column in RESULT_COLUMNS))
+            for attempt_id, results in attempts.items() for result in results]
+    return pd.DataFrame(rows, columns=["attempt_id", *RESULT_COLUMNS])
+
+
+def score_attempts(answers):
+    """Score many attempts at once from a flat table.
+
+    ``answers`` needs ``attempt_id``, ``skill``, ``user_answer`` and
+    ``correct_answer`` columns (one row per answered question). Returns
+    ``(attempt_scores, skill_scores)``: per-attempt score, total, percentage
+    and rating, and per-attempt, per-skill correct/total/percentage.
+    """
+    results = _mark(answers.assign(correct_answer=answers["correct_answer"].astype(str).str.lower()))
+    attempt_scores = skill_breakdown(results, by=("attempt_id",)).rename(columns={"correct": "score"})
+    attempt_scores["rating"] = performance_rating(attempt_scores["percentage"].to_numpy())
+    return attempt_scores, skill_breakdown(results, by=("attempt_id", "skill"))
@@ -0,0 +1,141 @@
+"""Incremental report assembly with streaming TXT, HTML and PDF output.
+
+A report is a list of ``Section`` objects. Each section carries a cheap
+fingerprint of its input and a ``render`` callable that produces its text
+lazily, as a generator of chunks. Writers pull one chunk at a time and write
+it straight to a file or stream; nothing is concatenated up front. Rendered
+artifacts are kept in the shared cache under the fingerprints of their
+sections, so a rerun that changes no section serves the previous bytes
+without rendering anything.
+"""
+import hashlib
+import html
+
+from pdf_writer import iter_pdf
+from shared_cache import get_shared_cache
+
+FORMATS = {
+    "txt": ("text/plain", "resume_report.txt"),
+    "html": ("text/html", "resume_report.html"),
+    "pdf": ("application/pdf", "resume_report.pdf"),
+}
+PREVIEW_CHARS = 4000
+
+HTML_HEAD = (
+    "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>{title}</title>"
+    "<style>body{{font-family:sans-serif;max-width:860px;margin:2em auto;}}"
+    "pre{{white-space:pre-wrap;font-family:inherit;}}h2{{border-bottom:1px solid #ccc;}}</style>"
+    "</head><body>\n<h1>{title}</h1>\n"
+)
+
+
+class Section:
+    """One report section: a title, an input fingerprint and a lazy text renderer."""
+
+    def __init__(self, name, title, fingerprint, render):
+        self.name = name
+        self.title = title
+        self.fingerprint = fingerprint
+        self.render = render
+
+
+def fingerprint(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def text_section(name, title, text):
+    """Return a section that shows ``text`` as is."""
+    return Section(name, title, fingerprint(text), lambda: iter((text,)))
+
+
+def quiz_section(quiz_results):
+    """Return the quiz results section; each answered question is rendered on demand."""
+    def render():
+        yield f"Score: {quiz_results['score']} out of {quiz_results['total']}\n"
+        yield "Detailed Results:\n"
+        for result in quiz_results["detailed_results"]:
+            yield (f"- [{result['status']}] {result['skill']}: {result['question']}\n"
+                   f"  Your answer: {result['user_answer'] or '-'}; correct answer: {result['correct_answer']}\n")
+
+    # Every submission has its own attempt id, so the results never need hashing.
+    key = quiz_results.get("attempt_id") or fingerprint(repr(quiz_results["detailed_results"]))
+    return Section("quiz_results", "Quiz Results", key, render)
+
+
+def report_key(sections, fmt):
+    """Return the cache key of a report: its format and the fingerprints of its sections."""
+    digest = hashlib.sha256(fmt.encode("utf-8"))
+    for section in sections:
+        digest.update(f"\0{section.name}\0{section.fingerprint}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+#############################################
+# Writers
+#############################################
+def iter_text(sections):
+    """Yield the plain-text report in chunks."""
+    for i, section in enumerate(sections):
+        if i:
+            yield "\n\n"
+        yield f"----- {section.title.upper()} -----\n"
+        yield from section.render()
+
+
+def iter_html(sections, title="Resume Report"):
+    """Yield a standalone HTML report in chunks."""
+    yield HTML_HEAD.format(title=html.escape(title))
+    for section in sections:
+        yield f"<section id=\"{section.name}\"><h2>{html.escape(section.title)}</h2>\n<pre>"
+        for chunk in section.render():
+            yield html.escape(chunk)
+        yield "</pre></section>\n"
+    yield "</body></html>\n"
+
+
+def iter_report_pdf(sections):
+    """Yield the bytes of a PDF report; each section starts on a new page."""
+    # pdf_writer lays out one section text at a time, so only the section
+    # being rendered is held in memory.
+    texts = (f"{section.title.upper()}\n\n" + "".join(section.render()) for section in sections)
+    return iter_pdf(texts)
+
+
+def iter_report(sections, fmt):
+    """Yield the report in ``fmt`` (``txt``, ``html`` or ``pdf``) as bytes chunks."""
+    if fmt == "pdf":
+        yield from iter_report_pdf(sections)
+        return
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown report format: {fmt}")
+    chunks = iter_html(sections) if fmt == "html" else iter_text(sections)
+    for chunk in chunks:
+        yield chunk.encode("utf-8")
+
+
+def write_report(sections, fmt, fh):
+    """Stream the report to the binary file object ``fh``; return the number of bytes written."""
+    written = 0
+    for chunk in iter_report(sections, fmt):
+        fh.write(chunk)
+        written += len(chunk)
+    return written
+
+
+def build_report(sections, fmt):
+    """Return the report bytes, rendering only if a section changed since the last build."""
+    return get_shared_cache().get_or_compute(("report", report_key(sections, fmt)),
+                                             lambda: b"".join(iter_report(sections, fmt)))
+
+
+def preview_text(sections, limit=PREVIEW_CHARS):
+    """Return the first ``limit`` characters of the plain-text report, rendering no more than that."""
+    parts = []
+    size = 0
+    for chunk in iter_text(sections):
+        parts.append(chunk[:limit - size])
+        size += len(parts[-1])
+        if size >= limit:
+            parts.append("\n...")
+            break
+    return "".join(parts)
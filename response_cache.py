@@ -0,0 +1,164 @@
+"""Content-addressed cache for LLM responses.
+
+Responses are keyed on a hash of (model, prompt, temperature, top_p) and kept
+in two tiers: a small in-memory LRU for the current process and a SQLite file
+that survives restarts. Both tiers honour a TTL; the disk tier is also capped
+by entry count and evicts least-recently-used rows.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from singleton import process_singleton
+
+CACHE_DIR = os.environ.get(
+    "RESUME_ANALYZER_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"),
+)
+CACHE_DB_PATH = os.path.join(CACHE_DIR, "responses.sqlite3")
+MEMORY_MAX_ENTRIES = 256
+DISK_MAX_ENTRIES = 5000
+TTL_SECONDS = 7 * 24 * 60 * 60
+EVICT_EVERY_N_WRITES = 50
+
+
+def make_key(model, prompt, temperature, top_p):
+    """Return the content hash used as the cache key for a generation request."""
+    payload = json.dumps([model, prompt, temperature, top_p], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier (memory LRU + SQLite) response cache with TTL and size eviction."""
+
+    def __init__(self, db_path=CACHE_DB_PATH, memory_max_entries=MEMORY_MAX_ENTRIES,
+                 disk_max_entries=DISK_MAX_ENTRIES, ttl=TTL_SECONDS):
+        self.db_path = db_path
+        self.memory_max_entries = memory_max_entries
+        self.disk_max_entries = disk_max_entries
+        self.ttl = ttl
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = None
+        if db_path:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " created REAL NOT NULL,"
+                " accessed REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+            self._conn.commit()
+
+    def _expired(self, created, now):
+        return self.ttl is not None and now - created > self.ttl
+
+    def get(self, key):
+        """Return the cached response for ``key`` or ``None`` on a miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created, value = entry
+                if not self._expired(created, now):
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return value
+                del self._memory[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value, created FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, created = row
+                    if not self._expired(created, now):
+                        self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+                        self._conn.commit()
+                        self._remember(key, created, value)
+                        self.disk_hits += 1
+                        return value
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        """Store ``value`` under ``key`` in both tiers."""
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, value)
+            if self._conn is None:
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            self._conn.commit()
+            self._writes += 1
+            if self._writes % EVICT_EVERY_N_WRITES == 0:
+                self._evict_disk(now)
+
+    def _remember(self, key, created, value):
+        self._memory[key] = (created, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_max_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self, now):
+        if self.ttl is not None:
+            self._conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        overflow = count - self.disk_max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY accessed ASC LIMIT ?)",
+                (overflow,),
+            )
+        self._conn.commit()
+
+    def clear(self):
+        """Drop every cached response and reset the counters."""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM responses")
+                self._conn.commit()
+            self.memory_hits = self.disk_hits = self.misses = 0
+
+    def stats(self):
+        """Return hit/miss counters and tier sizes."""
+        with self._lock:
+            disk_entries = 0
+            if self._conn is not None:
+                (disk_entries,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "hits": hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries,
+            }
+
+
+@process_singleton
+def get_response_cache():
+    """Return the process-wide cache."""
+    return ResponseCache()
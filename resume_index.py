@@ -0,0 +1,238 @@
+"""Persistent, incrementally updatable index of extracted resumes.
+
+An index is a directory holding:
+
+- ``vectors.f32``: one dense float32 row of hashed features per resume,
+  appended as resumes are added and read back through ``numpy.memmap``;
+- ``meta.sqlite3``: a ``resumes`` table with each row's id, name, content
+  fingerprint, text and extracted skills, and a ``terms`` table mapping every
+  word and skill feature to the rows whose resume contains it.
+
+Ranking a job description against the whole pool is one matrix-vector product
+over the memory-mapped rows plus keyword coverage (see ``match_scoring``).
+Coverage is read from the exact ``terms`` sets, not the hashed vectors, where
+collisions would report absent keywords as present. Re-adding a resume with
+the same id replaces the previous version; unchanged resumes are skipped.
+
+Usage:
+    python resume_index.py add RESUMES [--index DIR]
+    python resume_index.py query JOB_DESCRIPTION [--top 10] [--index DIR]
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+import numpy as np
+
+from match_scoring import blend_scores, jd_keywords, keyword_features, match_result, vectorize
+from singleton import process_singleton
+from skill_extractor import top_skill_names
+
+INDEX_DIR = os.environ.get(
+    "RESUME_ANALYZER_INDEX_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "resume_index"),
+)
+# The pool holds every indexed candidate's name and scores, so the app only
+# shows it to operators who opt in; applicants never see other candidates.
+APPLICANT_POOL_ENABLED = os.environ.get("RESUME_ANALYZER_APPLICANT_POOL", "0") == "1"
+INDEX_DIM = 4096
+VECTOR_DTYPE = np.float32
+# Bumped when stored data gains something older indexes must be backfilled with.
+SCHEMA_VERSION = 1
+
+
+class ResumeIndex:
+    """Memory-mapped resume vectors with SQLite metadata."""
+
+    def __init__(self, path=INDEX_DIR, dim=INDEX_DIM):
+        self.path = path
+        self.dim = dim
+        os.makedirs(path, exist_ok=True)
+        self._vectors_path = os.path.join(path, "vectors.f32")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(path, "meta.sqlite3"), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS resumes ("
+            " row INTEGER PRIMARY KEY,"
+            " doc_id TEXT NOT NULL,"
+            " name TEXT NOT NULL,"
+            " fingerprint TEXT NOT NULL,"
+            " text TEXT NOT NULL,"
+            " skills TEXT NOT NULL,"
+            " added REAL NOT NULL,"
+            " active INTEGER NOT NULL DEFAULT 1)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS resumes_doc_id ON resumes (doc_id, active)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS terms ("
+            " term TEXT NOT NULL,"
+            " row INTEGER NOT NULL,"
+            " PRIMARY KEY (term, row)) WITHOUT ROWID"
+        )
+        (version,) = self._conn.execute("PRAGMA user_version").fetchone()
+        if version < SCHEMA_VERSION:
+            # Indexes built before the terms table existed: derive it from the stored texts.
+            for row, text in self._conn.execute("SELECT row, text FROM resumes WHERE active = 1").fetchall():
+                self._insert_terms(row, text)
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._conn.commit()
+        self._vectors = None
+        self._active_mask = None
+
+    def __len__(self):
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM resumes WHERE active = 1").fetchone()
+            return count
+
+    def _row_count(self):
+        (rows,) = self._conn.execute("SELECT COALESCE(MAX(row) + 1, 0) FROM resumes").fetchone()
+        return rows
+
+    def _insert_terms(self, row, text):
+        self._conn.executemany("INSERT OR IGNORE INTO terms (term, row) VALUES (?, ?)",
+                               ((term, row) for term in keyword_features(text)))
+
+    def add(self, doc_id, name, text):
+        """Add or replace a resume; return ``False`` if an identical version is already indexed."""
+        fingerprint = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        vector = vectorize([text], n_features=self.dim).toarray()[0].astype(VECTOR_DTYPE)
+        skills = json.dumps(top_skill_names(text, limit=30))
+        with self._lock:
+            existing = self._conn.execute(
+                "SELECT row, fingerprint FROM resumes WHERE doc_id = ? AND active = 1", (doc_id,)
+            ).fetchone()
+            if existing is not None and existing[1] == fingerprint:
+                return False
+            row = self._row_count()
+            # The vector file is only trusted up to the row count recorded in
+            # SQLite, so a crash between these two writes leaves it consistent.
+            with open(self._vectors_path, "r+b" if os.path.exists(self._vectors_path) else "wb") as fh:
+                fh.seek(row * self.dim * np.dtype(VECTOR_DTYPE).itemsize)
+                fh.write(vector.tobytes())
+                fh.flush()
+                os.fsync(fh.fileno())
+            if existing is not None:
+                self._conn.execute("UPDATE resumes SET active = 0 WHERE row = ?", (existing[0],))
+            self._conn.execute(
+                "INSERT INTO resumes (row, doc_id, name, fingerprint, text, skills, added) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (row, doc_id, name, fingerprint, text, skills, time.time()),
+            )
+            self._insert_terms(row, text)
+            self._conn.commit()
+            self._vectors = None
+            return True
+
+    def remove(self, doc_id):
+        """Deactivate a resume; its vector row is skipped by future queries."""
+        with self._lock:
+            self._conn.execute("UPDATE resumes SET active = 0 WHERE doc_id = ?", (doc_id,))
+            self._conn.commit()
+            self._vectors = None
+
+    def _load(self):
+        if self._vectors is None:
+            rows = self._row_count()
+            if rows == 0:
+                self._vectors = np.zeros((0, self.dim), dtype=VECTOR_DTYPE)
+            else:
+                self._vectors = np.memmap(self._vectors_path, dtype=VECTOR_DTYPE, mode="r",
+                                          shape=(rows, self.dim))
+            mask = np.zeros(rows, dtype=bool)
+            active = [r for (r,) in self._conn.execute("SELECT row FROM resumes WHERE active = 1")]
+            mask[active] = True
+            self._active_mask = mask
+        return self._vectors, self._active_mask
+
+    def _keyword_presence(self, keywords, rows):
+        """Return a boolean ``rows x len(keywords)`` array of which keywords each indexed resume contains."""
+        present = np.zeros((rows, len(keywords)), dtype=bool)
+        columns = {feature: column for column, (_, feature) in enumerate(keywords)}
+        if columns:
+            placeholders = ",".join("?" * len(columns))
+            hits = self._conn.execute(f"SELECT term, row FROM terms WHERE term IN ({placeholders})",
+                                      list(columns)).fetchall()
+            if hits:
+                terms, term_rows = zip(*hits)
+                present[np.asarray(term_rows), [columns[term] for term in terms]] = True
+        return present
+
+    def top_k(self, jd_text, k=10):
+        """Return the ``k`` best-matching indexed resumes for a job description."""
+        jd_vector = vectorize([jd_text], n_features=self.dim).toarray()[0].astype(VECTOR_DTYPE)
+        keywords = jd_keywords(jd_text)
+        with self._lock:
+            vectors, active = self._load()
+            if not active.any():
+                return []
+            similarity = vectors @ jd_vector
+            present = self._keyword_presence(keywords, len(active))
+            scores, coverage = blend_scores(similarity, present)
+            scores = np.where(active, scores, -np.inf)
+            k = min(k, int(active.sum()))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            placeholders = ",".join("?" * len(top))
+            meta = {
+                row: (doc_id, name, skills)
+                for row, doc_id, name, skills in self._conn.execute(
+                    f"SELECT row, doc_id, name, skills FROM resumes WHERE row IN ({placeholders})",
+                    [int(r) for r in top],
+                )
+            }
+        results = []
+        for row in top:
+            doc_id, name, skills = meta[int(row)]
+            result = match_result(scores[row], similarity[row], coverage[row], keywords, present[row])
+            result.update({"doc_id": doc_id, "name": name, "skills": json.loads(skills)})
+            results.append(result)
+        return results
+
+
+@process_singleton
+def get_resume_index():
+    """Return the process-wide index."""
+    return ResumeIndex()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and query the persistent resume index.")
+    parser.add_argument("--index", default=INDEX_DIR, help="Index directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add_cmd = commands.add_parser("add", help="Index a directory or zip archive of PDF/TXT resumes")
+    add_cmd.add_argument("resumes")
+    query_cmd = commands.add_parser("query", help="Rank indexed resumes against a job description")
+    query_cmd.add_argument("job_description")
+    query_cmd.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    # Imported here because batch_analyze loads the Streamlit app module.
+    from batch_analyze import iter_resume_sources, read_document
+
+    index = ResumeIndex(args.index)
+    if args.command == "add":
+        added = 0
+        for name, load in iter_resume_sources(args.resumes):
+            try:
+                text = read_document(name, load())
+            except Exception as e:
+                print(f"[error] {name}: {e}", file=sys.stderr)
+                continue
+            if text.strip() and index.add(name, name, text):
+                added += 1
+        print(f"Indexed {added} new or changed resumes ({len(index)} total).", file=sys.stderr)
+    else:
+        with open(args.job_description, "rb") as fh:
+            jd_text = read_document(args.job_description, fh.read())
+        for rank, result in enumerate(index.top_k(jd_text, args.top), start=1):
+            print(f"{rank:>3}. {result['score']:5.1f}  {result['name']}  "
+                  f"missing: {', '.join(result['missing_keywords']) or '-'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""Process-wide cache shared by every Streamlit session.
+
+Each browser session has its own ``st.session_state``, but all sessions run
+in one server process. Results that depend only on their inputs (PDF text,
+job-description analyses, generated quiz questions) are kept here once for
+everyone. Lookups are single-flight: while one caller computes a value,
+other callers asking for the same key wait for that result instead of
+starting their own computation. Streamed text gets the same treatment
+through ``iter_or_compute``. Entries are evicted least-recently-used
+once their estimated total size exceeds the memory cap.
+"""
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from singleton import process_singleton
+
+SHARED_CACHE_MAX_BYTES = int(float(os.environ.get("RESUME_ANALYZER_SHARED_CACHE_MB", 128)) * 1024 * 1024)
+
+
+def estimate_size(value):
+    """Return the approximate memory footprint of a cached value in bytes."""
+    if isinstance(value, (str, bytes, bytearray)):
+        return sys.getsizeof(value)
+    try:
+        return sys.getsizeof(json.dumps(value, ensure_ascii=False, default=str))
+    except (TypeError, ValueError):
+        return sys.getsizeof(value)
+
+
+class SharedCache:
+    """Thread-safe LRU cache with single-flight computation and a byte budget."""
+
+    def __init__(self, max_bytes=SHARED_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.waits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Return the cached value for ``key`` without computing it."""
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key][0]
+
+    def put(self, key, value):
+        """Store ``value`` under ``key``, evicting old entries to stay under the cap."""
+        size = estimate_size(value)
+        with self._lock:
+            self._store(key, value, size)
+
+    def _store(self, key, value, size):
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)[1]
+        self._entries[key] = (value, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def get_or_compute(self, key, compute, cache_if=None):
+        """Return the value for ``key``, calling ``compute()`` at most once across concurrent callers.
+
+        Exceptions from ``compute`` reach every waiting caller and nothing is
+        cached. Values for which ``cache_if(value)`` is false are handed to
+        the waiting callers but not kept.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._inflight[key] = Future()
+                owner = True
+                self.misses += 1
+            else:
+                owner = False
+                self.waits += 1
+        if not owner:
+            return future.result()
+
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+        size = estimate_size(value)
+        with self._lock:
+            del self._inflight[key]
+            if cache_if is None or cache_if(value):
+                self._store(key, value, size)
+        future.set_result(value)
+        return value
+
+    def iter_or_compute(self, key, produce, cache_if=None):
+        """Yield the value for ``key`` in chunks, streaming ``produce()`` at most once across concurrent callers.
+
+        ``produce`` returns an iterable of text chunks. The first caller
+        yields them as they arrive and caches their concatenation; callers
+        that ask while it is streaming wait and receive the whole text as a
+        single chunk. If the stream fails or is closed early, nothing is
+        cached and the waiting callers get the error.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                value = self._entries[key][0]
+                future = None
+            else:
+                future = self._inflight.get(key)
+                owner = future is None
+                if owner:
+                    future = self._inflight[key] = Future()
+                    self.misses += 1
+                else:
+                    self.waits += 1
+        if future is None:
+            yield value
+            return
+        if not owner:
+            yield future.result()
+            return
+
+        parts = []
+        try:
+            for chunk in produce():
+                parts.append(chunk)
+                yield chunk
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e if isinstance(e, Exception)
+                                 else RuntimeError("The shared computation was stopped before it finished."))
+            raise
+        value = "".join(parts)
+        size = estimate_size(value)
+        with self._lock:
+            del self._inflight[key]
+            if cache_if is None or cache_if(value):
+                self._store(key, value, size)
+        future.set_result(value)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.waits + self.misses
+            return {
+                "hits": self.hits,
+                "waits": self.waits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hit_rate": (self.hits + self.waits) / lookups if lookups else 0.0,
+            }
+
+
+@process_singleton
+def get_shared_cache():
+    """Return the process-wide shared cache."""
+    return SharedCache()
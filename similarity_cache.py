@@ -0,0 +1,190 @@
+"""Near-duplicate cache for generations over resumes and job descriptions.
+
+The exact-prompt cache in ``response_cache`` misses a resume re-uploaded with
+a one-word edit, or two job descriptions that differ only in boilerplate.
+This cache fingerprints the normalised input texts with MinHash over word
+3-shingles and finds earlier inputs with a similar fingerprint through
+locality-sensitive hashing (banded signatures indexed in SQLite). Each match
+carries its estimated Jaccard similarity; for multi-input generations (resume
+plus job description) the lowest per-input similarity counts, so a different
+candidate never matches on a shared job description alone.
+
+Every entry belongs to an owner (in the app, the uploading session), and a
+lookup only sees the caller's own entries: an analysis is never reused for,
+or fed into the refresh of, someone else's resume.
+
+Callers decide what to do with a match: at or above ``REUSE_THRESHOLD`` the
+earlier result can be served as is, and at or above ``REFRESH_THRESHOLD`` it
+can be updated from a diff of the inputs instead of generated from scratch.
+"""
+import difflib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from prompt_budget import clean_text
+from response_cache import CACHE_DIR
+from singleton import process_singleton
+
+SIMILARITY_ENABLED = os.environ.get("RESUME_ANALYZER_SIMILARITY_CACHE", "1") != "0"
+SIMILARITY_DB_PATH = os.path.join(CACHE_DIR, "similarity.sqlite3")
+REUSE_THRESHOLD = float(os.environ.get("RESUME_ANALYZER_SIMILARITY_REUSE", 0.9))
+REFRESH_THRESHOLD = float(os.environ.get("RESUME_ANALYZER_SIMILARITY_REFRESH", 0.6))
+NUM_PERMUTATIONS = 128
+BANDS = 32
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+SHINGLE_SIZE = 3
+MAX_ENTRIES = 5000
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_rng = np.random.default_rng(20240601)
+# Multipliers below 2**31 keep ``a * hash + b`` inside uint64 for 32-bit hashes.
+_PERM_A = _rng.integers(1, 1 << 31, NUM_PERMUTATIONS, dtype=np.uint64)
+_PERM_B = _rng.integers(0, 1 << 61, NUM_PERMUTATIONS, dtype=np.uint64)
+_WORD_RE = re.compile(r"\w+")
+
+
+def shingles(text):
+    """Return the set of word 3-shingles of the normalised text."""
+    words = _WORD_RE.findall(clean_text(text).lower())
+    if len(words) < SHINGLE_SIZE:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def minhash(text):
+    """Return the MinHash signature (uint64 array) of ``text``, or ``None`` for empty text."""
+    grams = shingles(text)
+    if not grams:
+        return None
+    hashes = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+    permuted = (np.outer(_PERM_A, hashes) + _PERM_B[:, None]) % _MERSENNE_PRIME
+    return permuted.min(axis=1)
+
+
+def estimate_similarity(signature_a, signature_b):
+    """Estimate the Jaccard similarity of two inputs from their signatures."""
+    return float(np.mean(signature_a == signature_b))
+
+
+def band_keys(signature):
+    """Return one LSH key per band; similar signatures share at least one key with high probability."""
+    bands = signature.reshape(BANDS, ROWS_PER_BAND)
+    return [band * (1 << 32) + zlib.crc32(bands[band].tobytes()) for band in range(BANDS)]
+
+
+def input_diff(old_text, new_text, context=1):
+    """Return a compact unified diff between two versions of an input."""
+    diff = difflib.unified_diff(clean_text(old_text).splitlines(), clean_text(new_text).splitlines(),
+                                "previous", "current", n=context, lineterm="")
+    return "\n".join(diff)
+
+
+class SimilarityCache:
+    """MinHash/LSH index of earlier generations, persisted in SQLite."""
+
+    def __init__(self, db_path=SIMILARITY_DB_PATH, max_entries=MAX_ENTRIES):
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._stats = {"reused": 0, "refreshed": 0, "misses": 0}
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " kind TEXT NOT NULL,"
+            " inputs TEXT NOT NULL,"
+            " signatures BLOB NOT NULL,"
+            " result TEXT NOT NULL,"
+            " created REAL NOT NULL,"
+            " owner TEXT)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(entries)")}
+        if "owner" not in columns:
+            # Entries from before owners existed belong to nobody and never match.
+            self._conn.execute("ALTER TABLE entries ADD COLUMN owner TEXT")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS bands (kind TEXT NOT NULL, key INTEGER NOT NULL, entry INTEGER NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS bands_lookup ON bands (kind, key)")
+        self._conn.commit()
+
+    @staticmethod
+    def _signatures(inputs):
+        signatures = [minhash(text) for text in inputs]
+        if any(signature is None for signature in signatures):
+            return None
+        return np.stack(signatures)
+
+    def lookup(self, kind, inputs, owner):
+        """Return ``owner``'s most similar earlier generation of ``kind`` as a dict, or ``None``.
+
+        The dict holds the earlier ``inputs`` and ``result`` and the
+        estimated ``similarity`` (the minimum over the inputs).
+        """
+        signatures = self._signatures(inputs)
+        if signatures is None:
+            return None
+        keys = band_keys(signatures[0])
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, inputs, signatures, result FROM entries WHERE owner = ? AND id IN ("
+                f" SELECT DISTINCT entry FROM bands WHERE kind = ? AND key IN ({','.join('?' * len(keys))}))",
+                (owner, kind, *keys),
+            ).fetchall()
+        best = None
+        for entry_id, stored_inputs, blob, result in rows:
+            stored = np.frombuffer(blob, dtype=np.uint64).reshape(-1, NUM_PERMUTATIONS)
+            if stored.shape != signatures.shape:
+                continue
+            similarity = min(estimate_similarity(a, b) for a, b in zip(signatures, stored))
+            if best is None or similarity > best["similarity"]:
+                best = {"id": entry_id, "inputs": json.loads(stored_inputs), "result": result,
+                        "similarity": similarity}
+        return best
+
+    def store(self, kind, inputs, result, owner):
+        """Index ``result`` as ``owner``'s generation of ``kind`` for ``inputs``."""
+        signatures = self._signatures(inputs)
+        if signatures is None:
+            return
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO entries (kind, inputs, signatures, result, created, owner) VALUES (?, ?, ?, ?, ?, ?)",
+                (kind, json.dumps(inputs, ensure_ascii=False), signatures.tobytes(), result, time.time(), owner),
+            )
+            entry_id = cursor.lastrowid
+            self._conn.executemany(
+                "INSERT INTO bands (kind, key, entry) VALUES (?, ?, ?)",
+                [(kind, key, entry_id) for key in band_keys(signatures[0])],
+            )
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+            if count > self.max_entries:
+                cutoff = entry_id - self.max_entries
+                self._conn.execute("DELETE FROM bands WHERE entry <= ?", (cutoff,))
+                self._conn.execute("DELETE FROM entries WHERE id <= ?", (cutoff,))
+            self._conn.commit()
+
+    def record(self, outcome):
+        """Count one lookup outcome: ``reused``, ``refreshed`` or ``misses``."""
+        with self._lock:
+            self._stats[outcome] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = sum(stats.values())
+        stats["lookups"] = lookups
+        stats["hit_rate"] = (stats["reused"] + stats["refreshed"]) / lookups if lookups else 0.0
+        stats["reuse_rate"] = stats["reused"] / lookups if lookups else 0.0
+        return stats
+
+
+@process_singleton
+def get_similarity_cache():
+    """Return the process-wide similarity cache."""
+    return SimilarityCache()
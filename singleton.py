@@ -0,0 +1,41 @@
+"""Process-wide singletons that survive Streamlit reruns.
+
+Streamlit re-executes the page script on every interaction, but imported
+modules stay loaded, so state that must outlive a rerun (caches, pools,
+queues, database connections) lives at module level. ``process_singleton``
+turns a zero-argument factory into a thread-safe accessor that builds the
+object on first use and returns the same instance afterwards.
+"""
+import functools
+import threading
+
+
+def process_singleton(factory):
+    """Decorate ``factory`` so that calling it returns one shared instance per process.
+
+    The accessor also gets ``replace(instance)``, to install a different
+    instance (e.g. a client backed by another provider), and ``reset()``, to
+    drop the instance so the next call builds a fresh one.
+    """
+    lock = threading.Lock()
+    instance = []
+
+    @functools.wraps(factory)
+    def get():
+        with lock:
+            if not instance:
+                instance.append(factory())
+            return instance[0]
+
+    def replace(value):
+        with lock:
+            instance[:] = [value]
+        return value
+
+    def reset():
+        with lock:
+            instance.clear()
+
+    get.replace = replace
+    get.reset = reset
+    return get
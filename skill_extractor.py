@@ -0,0 +1,371 @@
+"""Local, model-free extraction of skills and resume sections.
+
+Skills are matched against a compiled taxonomy with an Aho-Corasick automaton,
+so every alias is found in a single pass over the text regardless of how many
+aliases the taxonomy holds. The resume is also segmented into sections
+(Education, Experience, Skills, ...) by recognising header lines, and each
+skill match is attributed to the section it appears in.
+"""
+import re
+from collections import deque
+
+from singleton import process_singleton
+
+#############################################
+# Skills Taxonomy
+#############################################
+# canonical name -> (category, aliases). Aliases are matched case-insensitively
+# on word boundaries; the canonical name is always an alias of itself.
+SKILLS_TAXONOMY = {
+    # Programming languages
+    "Python": ("Programming Languages", ["python3", "python 3"]),
+    "Java": ("Programming Languages", ["java 8", "java 11", "java 17"]),
+    "JavaScript": ("Programming Languages", ["js", "ecmascript", "es6"]),
+    "TypeScript": ("Programming Languages", ["ts"]),
+    "C++": ("Programming Languages", ["cpp"]),
+    "C#": ("Programming Languages", ["c sharp", "csharp"]),
+    "Go": ("Programming Languages", ["golang"]),
+    "R": ("Programming Languages", []),
+    "C": ("Programming Languages", []),
+    "Rust": ("Programming Languages", []),
+    "Kotlin": ("Programming Languages", []),
+    "Swift": ("Programming Languages", []),
+    "Ruby": ("Programming Languages", []),
+    "PHP": ("Programming Languages", []),
+    "Scala": ("Programming Languages", []),
+    "MATLAB": ("Programming Languages", []),
+    "Bash": ("Programming Languages", ["shell scripting", "bash scripting"]),
+    "SQL": ("Databases", ["t-sql", "pl/sql", "plsql"]),
+    # Web
+    "HTML": ("Web Development", ["html5"]),
+    "CSS": ("Web Development", ["css3", "sass", "scss"]),
+    "React": ("Web Development", ["react.js", "reactjs"]),
+    "Angular": ("Web Development", ["angularjs", "angular.js"]),
+    "Vue.js": ("Web Development", ["vue", "vuejs"]),
+    "Node.js": ("Web Development", ["nodejs"]),
+    "Express": ("Web Development", ["express.js", "expressjs"]),
+    "Django": ("Web Development", []),
+    "Flask": ("Web Development", []),
+    "FastAPI": ("Web Development", []),
+    "Spring Boot": ("Web Development", ["spring framework", "spring mvc"]),
+    "REST APIs": ("Web Development", ["restful", "rest api", "restful apis", "restful services"]),
+    "GraphQL": ("Web Development", []),
+    "Streamlit": ("Web Development", []),
+    # Data & ML
+    "Machine Learning": ("Data Science & ML", ["ml"]),
+    "Deep Learning": ("Data Science & ML", []),
+    "Natural Language Processing": ("Data Science & ML", ["nlp"]),
+    "Computer Vision": ("Data Science & ML", ["opencv"]),
+    "Data Analysis": ("Data Science & ML", ["data analytics"]),
+    "Statistics": ("Data Science & ML", ["statistical analysis"]),
+    "Pandas": ("Data Science & ML", []),
+    "NumPy": ("Data Science & ML", []),
+    "scikit-learn": ("Data Science & ML", ["sklearn", "scikit learn"]),
+    "TensorFlow": ("Data Science & ML", ["keras"]),
+    "PyTorch": ("Data Science & ML", []),
+    "Hugging Face": ("Data Science & ML", ["huggingface"]),
+    "Large Language Models": ("Data Science & ML", ["llm", "llms", "gpt"]),
+    "Tableau": ("Data Science & ML", []),
+    "Power BI": ("Data Science & ML", ["powerbi"]),
+    "Excel": ("Data Science & ML", ["microsoft excel", "ms excel"]),
+    "Apache Spark": ("Data Engineering", ["spark", "pyspark"]),
+    "Hadoop": ("Data Engineering", []),
+    "Kafka": ("Data Engineering", ["apache kafka"]),
+    "Airflow": ("Data Engineering", ["apache airflow"]),
+    "ETL": ("Data Engineering", ["data pipelines"]),
+    # Databases
+    "MySQL": ("Databases", []),
+    "PostgreSQL": ("Databases", ["postgres"]),
+    "MongoDB": ("Databases", ["mongo"]),
+    "Redis": ("Databases", []),
+    "SQLite": ("Databases", []),
+    "Oracle Database": ("Databases", ["oracle db"]),
+    "Elasticsearch": ("Databases", ["elastic search"]),
+    # Cloud & DevOps
+    "AWS": ("Cloud & DevOps", ["amazon web services", "ec2", "aws lambda"]),
+    "Azure": ("Cloud & DevOps", ["microsoft azure"]),
+    "Google Cloud": ("Cloud & DevOps", ["gcp", "google cloud platform"]),
+    "Docker": ("Cloud & DevOps", ["dockerfile"]),
+    "Kubernetes": ("Cloud & DevOps", ["k8s"]),
+    "Terraform": ("Cloud & DevOps", []),
+    "CI/CD": ("Cloud & DevOps", ["jenkins", "github actions", "gitlab ci"]),
+    "Linux": ("Cloud & DevOps", ["unix", "ubuntu"]),
+    "Git": ("Cloud & DevOps", ["github", "gitlab", "version control"]),
+    # Mobile
+    "Android": ("Mobile Development", []),
+    "iOS": ("Mobile Development", []),
+    "Flutter": ("Mobile Development", ["dart"]),
+    "React Native": ("Mobile Development", []),
+    # Practices & soft skills
+    "Agile": ("Practices", ["scrum", "kanban"]),
+    "Unit Testing": ("Practices", ["pytest", "junit", "test driven development", "tdd"]),
+    "Microservices": ("Practices", []),
+    "Data Structures": ("Practices", ["algorithms", "data structures and algorithms", "dsa"]),
+    "Object-Oriented Programming": ("Practices", ["oop", "object oriented programming"]),
+    "Communication": ("Soft Skills", ["communication skills"]),
+    "Leadership": ("Soft Skills", ["team lead", "team leadership"]),
+    "Project Management": ("Soft Skills", ["jira"]),
+    "Problem Solving": ("Soft Skills", ["problem-solving"]),
+}
+
+# Skill names that are also ordinary words or letters, mapped to their
+# canonical skill. They are matched case-sensitively, exactly as written, so
+# that "go to", "excel in" or "express ideas" do not count; a skill's other
+# aliases are still matched case-insensitively.
+CASE_SENSITIVE_TERMS = {
+    "Go": "Go", "R": "R", "C": "C", "Rust": "Rust", "Dart": "Flutter",
+    "Excel": "Excel", "Express": "Express", "Swift": "Swift", "Ruby": "Ruby", "Spark": "Apache Spark",
+}
+# Terms that are common English words even when capitalised ("Swift learner",
+# "Ruby Tuesday"), or letters that are also initials, grades and labels
+# ("Saranya R", "Vitamin C", "team C"). Outside a Skills section they only
+# count inside a comma or bullet list of other skills, e.g. "Python, Excel
+# and SQL".
+COMMON_WORD_TERMS = {"Excel", "Express", "Swift", "Ruby", "Spark", "Go", "R", "C"}
+# Terms this short are also grades, initials and parts of compounds ("Go-to",
+# "R&D", "Grade: C"); they do not count next to "-" or "&" or after "grade",
+# and a single letter does not count as an initial ("John C. Smith").
+SHORT_TERM_LENGTH = 2
+
+SECTION_HEADERS = {
+    "summary": ["summary", "professional summary", "profile", "objective", "career objective", "about me"],
+    "education": ["education", "academic background", "academics", "educational qualifications", "qualifications"],
+    "experience": ["experience", "work experience", "professional experience", "employment history",
+                   "work history", "internships", "internship"],
+    "skills": ["skills", "technical skills", "key skills", "core competencies", "technologies", "tools"],
+    "projects": ["projects", "academic projects", "personal projects"],
+    "certifications": ["certifications", "certificates", "licenses and certifications", "courses"],
+    "achievements": ["achievements", "awards", "honors", "accomplishments"],
+    "publications": ["publications", "research"],
+}
+MAX_HEADER_LENGTH = 40
+SKILLS_SECTION_BONUS = 2
+
+
+#############################################
+# Aho-Corasick Automaton
+#############################################
+class AhoCorasick:
+    """Multi-pattern matcher that finds every pattern occurrence in one pass."""
+
+    def __init__(self, patterns):
+        # Each state is a dict of transitions; outputs[state] lists (pattern, value).
+        self._goto = [{}]
+        self._fail = [0]
+        self._outputs = [[]]
+        for pattern, value in patterns:
+            self._add(pattern, value)
+        self._build()
+
+    def _add(self, pattern, value):
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+        self._outputs[state].append((pattern, value))
+
+    def _build(self):
+        pending = deque(self._goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for char, next_state in self._goto[state].items():
+                pending.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                if self._fail[next_state] == next_state:
+                    self._fail[next_state] = 0
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+
+    def iter_matches(self, text):
+        """Yield ``(start, end, pattern, value)`` for every match in ``text``."""
+        state = 0
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for pattern, value in outputs[state]:
+                yield index - len(pattern) + 1, index + 1, pattern, value
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == "_"
+
+
+def _on_word_boundary(text, start, end):
+    before = text[start - 1] if start > 0 else " "
+    after = text[end] if end < len(text) else " "
+    # A trailing "." only counts as punctuation, so "Node.js." and "AWS." still match.
+    # "@" joins the parts of an address, so "ml@acme.com" is not Machine Learning.
+    return not _is_word_char(before) and not _is_word_char(after) and after not in "+#@" and before != "@"
+
+
+_GRADE_RE = re.compile(r"\bgrade\s*:?\s*$", re.IGNORECASE)
+_INITIAL_RE = re.compile(r"\.\s+[A-Z][a-z]")
+_EMAIL_RE = re.compile(r"[^\s@]+@[^\s@]+")
+_LIST_GAP_RE = re.compile(r"^(?:[\s,;/|()&*\u2022\u25aa\u00b7-]|\band\b|\bor\b)*$", re.IGNORECASE)
+
+
+def _in_compound(text, start, end):
+    """Return whether a short term is part of a compound, a grade or an initial, like "Go-to", "R&D",
+    "Grade: C" or "K. C. Rao"."""
+    before = text[start - 1] if start > 0 else " "
+    after = text[end] if end < len(text) else " "
+    if end - start == 1 and _INITIAL_RE.match(text, end):
+        return True
+    return before in "-&" or after in "-&" or bool(_GRADE_RE.search(text[max(0, start - 10):start]))
+
+
+@process_singleton
+def _get_matchers():
+    """Compile the taxonomy once per process."""
+    sensitive_lowered = {term.lower() for term in CASE_SENSITIVE_TERMS}
+    insensitive = []
+    for canonical, (_, aliases) in SKILLS_TAXONOMY.items():
+        insensitive.extend((alias.lower(), canonical) for alias in [canonical] + aliases
+                           if alias.lower() not in sensitive_lowered)
+    sensitive = list(CASE_SENSITIVE_TERMS.items())
+    return AhoCorasick(insensitive), AhoCorasick(sensitive)
+
+
+#############################################
+# Section Segmentation
+#############################################
+_HEADER_LOOKUP = {alias: section for section, aliases in SECTION_HEADERS.items() for alias in aliases}
+_HEADER_CLEAN_RE = re.compile(r"[^a-z& ]+")
+
+
+def _header_section(line):
+    stripped = line.strip()
+    if not stripped or len(stripped) > MAX_HEADER_LENGTH:
+        return None
+    key = " ".join(_HEADER_CLEAN_RE.sub(" ", stripped.lower()).split())
+    return _HEADER_LOOKUP.get(key)
+
+
+def segment_sections(resume_text):
+    """Split a resume into ``[(section, start, end)]`` spans keyed by recognised headers.
+
+    Text before the first header is attributed to ``"header"``.
+    """
+    spans = []
+    current, current_start = "header", 0
+    offset = 0
+    for line in resume_text.splitlines(keepends=True):
+        section = _header_section(line)
+        if section is not None:
+            if offset > current_start:
+                spans.append((current, current_start, offset))
+            current, current_start = section, offset + len(line)
+        offset += len(line)
+    if offset > current_start:
+        spans.append((current, current_start, offset))
+    return spans
+
+
+def extract_sections(resume_text, spans=None):
+    """Return ``{section: text}`` with repeated sections concatenated."""
+    if spans is None:
+        spans = segment_sections(resume_text)
+    sections = {}
+    for section, start, end in spans:
+        chunk = resume_text[start:end].strip()
+        if chunk:
+            sections[section] = (sections[section] + "\n" + chunk) if section in sections else chunk
+    return sections
+
+
+#############################################
+# Skill Extraction
+#############################################
+def _section_at(spans, position):
+    for section, start, end in spans:
+        if start <= position < end:
+            return section
+    return "header"
+
+
+def _in_skill_list(text, matches, index):
+    """Return whether ``matches[index]`` is separated from a neighbouring skill only by list punctuation."""
+    start, end = matches[index][:2]
+    if index > 0 and _LIST_GAP_RE.match(text[matches[index - 1][1]:start]):
+        return True
+    return index + 1 < len(matches) and bool(_LIST_GAP_RE.match(text[end:matches[index + 1][0]]))
+
+
+def extract_skills(resume_text, spans=None):
+    """Return detected skills ordered by relevance.
+
+    Each item is ``{"name", "category", "count", "sections"}``; mentions in a
+    Skills section weigh more than passing mentions elsewhere.
+    """
+    if spans is None:
+        spans = segment_sections(resume_text)
+    insensitive, sensitive = _get_matchers()
+    # Email addresses are blanked out (keeping offsets), so no part of one is a skill.
+    resume_text = _EMAIL_RE.sub(lambda match: " " * len(match.group()), resume_text)
+    lowered = resume_text.lower()
+    matches = []
+    for text, matcher in ((lowered, insensitive), (resume_text, sensitive)):
+        for start, end, pattern, canonical in matcher.iter_matches(text):
+            if not _on_word_boundary(text, start, end):
+                continue
+            if matcher is sensitive and len(pattern) <= SHORT_TERM_LENGTH and _in_compound(text, start, end):
+                continue
+            matches.append((start, end, canonical, matcher is sensitive and pattern in COMMON_WORD_TERMS))
+
+    # Keep the longest match at each position and drop matches nested inside it,
+    # so "React.js" counts as React and not also as "js".
+    matches.sort(key=lambda m: (m[0], m[0] - m[1]))
+    kept = []
+    covered_until = 0
+    for match in matches:
+        if match[0] < covered_until:
+            continue
+        covered_until = match[1]
+        kept.append(match)
+
+    found = {}
+    for i, (start, end, canonical, common_word) in enumerate(kept):
+        section = _section_at(spans, start)
+        if common_word and section != "skills" and not _in_skill_list(resume_text, kept, i):
+            continue
+        entry = found.setdefault(canonical, {
+            "name": canonical,
+            "category": SKILLS_TAXONOMY[canonical][0],
+            "count": 0,
+            "sections": [],
+        })
+        entry["count"] += 1
+        if section not in entry["sections"]:
+            entry["sections"].append(section)
+
+    def relevance(entry):
+        bonus = SKILLS_SECTION_BONUS if "skills" in entry["sections"] else 0
+        return (-(entry["count"] + bonus), entry["name"].lower())
+
+    return sorted(found.values(), key=relevance)
+
+
+def extract_profile(resume_text):
+    """Return skills, skills grouped by category, and section texts for a resume."""
+    spans = segment_sections(resume_text)
+    skills = extract_skills(resume_text, spans)
+    by_category = {}
+    for skill in skills:
+        by_category.setdefault(skill["category"], []).append(skill["name"])
+    return {"skills": skills, "skills_by_category": by_category,
+            "sections": extract_sections(resume_text, spans)}
+
+
+def top_skill_names(resume_text, limit=10):
+    """Return the names of the ``limit`` most relevant skills in a resume."""
+    return [skill["name"] for skill in extract_skills(resume_text)[:limit]]
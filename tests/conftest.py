@@ -0,0 +1,24 @@
+"""Test setup: import the app modules from the repository root, keep every cache
+in a throwaway directory and answer model calls with ``FakeProvider``."""
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Set before any app module is imported, since they read these at import time.
+os.environ["RESUME_ANALYZER_CACHE_DIR"] = tempfile.mkdtemp(prefix="resume-analyzer-tests-")
+os.environ["RESUME_ANALYZER_PROVIDER"] = "fake"
+os.environ["RESUME_ANALYZER_WARMUP"] = "0"
+
+import pytest  # noqa: E402
+
+from shared_cache import get_shared_cache  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fresh_shared_cache():
+    """Give every test an empty process-wide cache."""
+    get_shared_cache.reset()
+    yield get_shared_cache()
+    get_shared_cache.reset()
@@ -0,0 +1,66 @@
+import threading
+
+import pytest
+
+from job_queue import DONE, FAILED, JobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / "jobs.sqlite3"), workers=2)
+
+
+def test_same_key_returns_the_existing_job(queue):
+    release = threading.Event()
+    calls = []
+
+    def task():
+        calls.append(1)
+        release.wait(5)
+        return "result"
+
+    first = queue.submit("analysis", "key", task)
+    second = queue.submit("analysis", "key", task)
+    release.set()
+    assert first == second
+    job = queue.wait(first)
+    assert (job["status"], job["result"]) == (DONE, "result")
+    # A finished job is reused too.
+    assert queue.submit("analysis", "key", task) == first
+    assert len(calls) == 1
+
+
+def test_different_keys_run_separately(queue):
+    first = queue.submit("analysis", "one", lambda: "1")
+    second = queue.submit("analysis", "two", lambda: "2")
+    assert first != second
+    assert {job["result"] for job in queue.iter_finished([first, second])} == {"1", "2"}
+
+
+def test_failed_jobs_are_retried(queue):
+    def fail():
+        raise RuntimeError("provider down")
+
+    failed = queue.submit("analysis", "key", fail)
+    job = queue.wait(failed)
+    assert (job["status"], job["error"]) == (FAILED, "provider down")
+    retried = queue.submit("analysis", "key", lambda: "ok")
+    assert retried != failed
+    assert queue.wait(retried)["result"] == "ok"
+
+
+def test_streamed_results_are_joined(queue):
+    job = queue.wait(queue.submit("analysis", "key", lambda: iter(["Hello", ", ", "world "])))
+    assert job["result"] == "Hello, world"
+
+
+def test_unfinished_jobs_fail_after_restart(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    release = threading.Event()
+    first = JobQueue(path, workers=1)
+    job_id = first.submit("analysis", "key", lambda: release.wait(5) and "late")
+    restarted = JobQueue(path, workers=1)
+    job = restarted.get(job_id)
+    release.set()
+    assert job["status"] == FAILED
+    assert job["error"] == "Interrupted by a server restart."
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from llm_client import AsyncLLMClient, LLMTimeoutError
+from providers import FakeProvider
+
+
+class FlakyProvider(FakeProvider):
+    """``FakeProvider`` whose first ``failures`` requests raise ``error`` right away."""
+
+    def __init__(self, failures=1, error=TimeoutError, **kwargs):
+        super().__init__(latency=0.01, **kwargs)
+        self.failures = failures
+        self.error = error
+
+    def _begin(self):
+        super()._begin()
+        if self.calls <= self.failures:
+            raise self.error("Connection timeout to host")
+
+
+def complete(client, timeout=None):
+    return asyncio.run(client.complete("Analyze this resume.", "gpt-4o", 0.7, 1.0, timeout=timeout))
+
+
+def stream(client, timeout=None):
+    async def run():
+        return "".join([chunk async for chunk in client.stream("Analyze this resume.", "gpt-4o", 0.7, 1.0,
+                                                               timeout=timeout)])
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("call", [complete, stream])
+def test_provider_timeout_is_retried_before_the_deadline(call):
+    provider = FlakyProvider(failures=1)
+    assert call(AsyncLLMClient(provider), timeout=30).startswith("**Summary.**")
+    assert provider.calls == 2
+
+
+@pytest.mark.parametrize("call", [complete, stream])
+def test_provider_timeouts_stop_after_max_retries(call):
+    provider = FlakyProvider(failures=10)
+    with pytest.raises(TimeoutError) as raised:
+        call(AsyncLLMClient(provider, max_retries=2), timeout=30)
+    assert not isinstance(raised.value, LLMTimeoutError)
+    assert provider.calls == 3
+
+
+@pytest.mark.parametrize("call", [complete, stream])
+def test_deadline_raises_llm_timeout(call):
+    provider = FakeProvider(latency=5.0, first_chunk_latency=5.0)
+    with pytest.raises(LLMTimeoutError):
+        call(AsyncLLMClient(provider), timeout=0.2)
+    assert provider.calls == 1
+
+
+def test_other_transient_errors_are_retried():
+    provider = FlakyProvider(failures=2, error=ConnectionError)
+    assert complete(AsyncLLMClient(provider), timeout=30)
+    assert provider.calls == 3
+
+
+def test_programming_errors_are_not_retried():
+    provider = FlakyProvider(failures=1, error=ValueError)
+    with pytest.raises(ValueError):
+        complete(AsyncLLMClient(provider), timeout=30)
+    assert provider.calls == 1
@@ -0,0 +1,71 @@
+import asyncio
+import json
+
+from mcq_parser import parse_mcq_output, validate_question
+from providers import FakeProvider, fake_quiz
+
+QUIZ_PROMPT = ("The candidate's key technical skills are: Python, SQL. For each skill, "
+               "generate 3 multiple-choice questions.")
+
+
+def test_parses_fake_provider_quiz():
+    reply = asyncio.run(FakeProvider(latency=0).complete([{"role": "user", "content": QUIZ_PROMPT}],
+                                                         "fake", 0.7, 1.0))
+    parsed = parse_mcq_output(reply)
+    assert [block["skill"] for block in parsed["blocks"]] == ["Python", "SQL"]
+    assert all(len(block["questions"]) == 3 for block in parsed["blocks"])
+    assert parsed["incomplete_skills"] == [] and parsed["errors"] == []
+
+
+def test_fenced_output_with_prose():
+    text = "Here is your quiz:\n```json\n" + fake_quiz(["Docker"]) + "\n```\nGood luck!"
+    parsed = parse_mcq_output(text)
+    assert [block["skill"] for block in parsed["blocks"]] == ["Docker"]
+    assert parsed["errors"] == []
+
+
+def test_unterminated_fence():
+    parsed = parse_mcq_output("```json\n" + fake_quiz(["Git"]))
+    assert [block["skill"] for block in parsed["blocks"]] == ["Git"]
+
+
+def test_truncated_output_salvages_complete_questions():
+    full = fake_quiz(["Python", "SQL"])
+    # Cut inside the second question of the second skill.
+    cut = full.index("(#2)", full.index('"skill": "SQL"'))
+    parsed = parse_mcq_output(full[:cut])
+    blocks = {block["skill"]: block["questions"] for block in parsed["blocks"]}
+    assert len(blocks["Python"]) == 3
+    assert len(blocks["SQL"]) == 1
+    assert parsed["incomplete_skills"] == ["SQL"]
+    assert any("Recovered 1 question(s) for SQL" in error for error in parsed["errors"])
+
+
+def test_broken_block_does_not_stop_later_blocks():
+    good = json.loads(fake_quiz(["Python", "SQL"]))
+    text = "[" + json.dumps(good[0])[:-40] + ", " + json.dumps(good[1]) + "]"
+    parsed = parse_mcq_output(text)
+    assert "SQL" in [block["skill"] for block in parsed["blocks"]]
+    assert "Python" in parsed["incomplete_skills"]
+
+
+def test_invalid_questions_are_dropped():
+    quiz = json.loads(fake_quiz(["Linux"]))
+    quiz[0]["questions"][1]["correct"] = "z"
+    quiz[0]["questions"][2]["options"] = {"a": "only one"}
+    parsed = parse_mcq_output(json.dumps(quiz))
+    assert len(parsed["blocks"][0]["questions"]) == 1
+    assert parsed["incomplete_skills"] == ["Linux"]
+    assert "Dropped 2 invalid question(s) for Linux." in parsed["errors"]
+
+
+def test_answer_key_and_difficulty_are_normalised():
+    question = validate_question({"question": "Pick one", "options": {"A": "x", "B": "y"},
+                                  "correct": "(B) y", "difficulty": "Impossible"})
+    assert question == {"question": "Pick one", "options": {"a": "x", "b": "y"}, "correct": "b",
+                        "difficulty": "medium"}
+
+
+def test_no_quiz_found():
+    assert parse_mcq_output("Sorry, I cannot help with that.")["errors"] == [
+        "No quiz questions were found in the model output."]
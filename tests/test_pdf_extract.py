@@ -0,0 +1,97 @@
+import pytest
+
+import pdf_extract
+from pdf_extract import PDFBusyError, PDFLimitError, PDFNoTextError, PDFTimeoutError, extract_text
+from pdf_sandbox import SandboxBusyError, SandboxTimeoutError
+from pdf_writer import build_pdf
+from prompt_budget import PAGE_BREAK
+
+
+def test_round_trip():
+    text = extract_text(build_pdf(["Jane Doe\nPython developer", "Second page (with parentheses)"]))
+    first, second = text.split(PAGE_BREAK)
+    assert "Jane Doe" in first and "Python developer" in first
+    assert "Second page (with parentheses)" in second
+
+
+def test_large_document_is_split_and_reassembled():
+    pages = [f"Page number {i} mentions skill{i}" for i in range(pdf_extract.PARALLEL_MIN_PAGES * 2 + 1)]
+    text = extract_text(build_pdf(pages))
+    parts = text.split(PAGE_BREAK)
+    assert len(parts) == len(pages)
+    assert all(f"skill{i}" in part for i, part in enumerate(parts))
+
+
+def test_accepts_paths_and_file_objects(tmp_path):
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(build_pdf(["From a file"]))
+    assert "From a file" in extract_text(str(path))
+    with open(path, "rb") as fh:
+        assert "From a file" in extract_text(fh)
+
+
+def test_size_and_page_limits():
+    data = build_pdf(["one", "two", "three"])
+    with pytest.raises(PDFLimitError, match="limit is 0 MB"):
+        extract_text(data, max_bytes=10)
+    with pytest.raises(PDFLimitError, match="3 pages; the limit is 2"):
+        extract_text(data, max_pages=2)
+
+
+def test_malformed_pdf():
+    with pytest.raises(pdf_extract.PDFExtractionError):
+        extract_text(b"%PDF-1.4\nthis is not a pdf")
+
+
+def test_failures_are_cached(monkeypatch):
+    blank = build_pdf(["", ""])
+    with pytest.raises(PDFNoTextError):
+        extract_text(blank)
+    monkeypatch.setattr(pdf_extract, "_extract_pages", lambda *args: pytest.fail("extracted again"))
+    with pytest.raises(PDFNoTextError):
+        extract_text(blank)
+
+
+def test_cached_failures_expire(monkeypatch):
+    blank = build_pdf(["", ""])
+    with pytest.raises(PDFNoTextError):
+        extract_text(blank)
+    monkeypatch.setattr(pdf_extract, "PDF_FAILURE_TTL", 0)
+    monkeypatch.setattr(pdf_extract, "_extract_pages", lambda *args: ["now readable"])
+    assert extract_text(blank) == "now readable"
+
+
+def test_parse_timeouts_are_cached(monkeypatch):
+    def timeout(*args):
+        raise SandboxTimeoutError("Parsing took longer than the time limit and was stopped.")
+
+    data = build_pdf(["slow"])
+    monkeypatch.setattr(pdf_extract, "_extract_pages", timeout)
+    with pytest.raises(PDFTimeoutError):
+        extract_text(data)
+    monkeypatch.setattr(pdf_extract, "_extract_pages", lambda *args: pytest.fail("extracted again"))
+    with pytest.raises(PDFTimeoutError):
+        extract_text(data)
+
+
+def test_busy_workers_are_not_cached(monkeypatch):
+    def busy(*args):
+        raise SandboxBusyError("No worker was free before the document's deadline.")
+
+    data = build_pdf(["valid resume"])
+    monkeypatch.setattr(pdf_extract, "_extract_pages", busy)
+    with pytest.raises(PDFBusyError):
+        extract_text(data)
+    monkeypatch.undo()
+    assert extract_text(data) == "valid resume"
+
+
+def test_busy_ocr_is_not_cached(monkeypatch):
+    data = build_pdf(["", ""])
+    monkeypatch.setattr(pdf_extract, "_extract_pages", lambda *args: ["", ""])
+    monkeypatch.setattr(pdf_extract, "_ocr_missing_pages",
+                        lambda data, texts: (texts, SandboxBusyError("No sandbox worker became free.")))
+    with pytest.raises(PDFBusyError):
+        extract_text(data)
+    monkeypatch.setattr(pdf_extract, "_ocr_missing_pages", lambda data, texts: (["scanned text", ""], None))
+    assert extract_text(data) == "scanned text"
@@ -0,0 +1,96 @@
+import threading
+import time
+
+import pytest
+
+import pdf_extract
+from pdf_sandbox import SandboxBusyError, SandboxMemoryError, SandboxPool, SandboxTaskError, SandboxTimeoutError
+
+
+@pytest.fixture(scope="module")
+def pool():
+    return SandboxPool(workers=2, memory_limit_mb=64)
+
+
+def test_result(pool):
+    assert pool.submit(sum, [1, 2, 3]).result() == 6
+
+
+def test_timeout_replaces_the_worker(pool):
+    restarts = pool.restarts
+    started = time.monotonic()
+    with pytest.raises(SandboxTimeoutError):
+        pool.submit(time.sleep, 30, deadline=time.monotonic() + 0.5).result()
+    assert time.monotonic() - started < 10
+    assert pool.restarts == restarts + 1
+    assert pool.submit(sum, [1, 2]).result() == 3
+
+
+def test_expired_deadline_is_not_run(pool):
+    with pytest.raises(SandboxBusyError):
+        pool.submit(time.sleep, 30, deadline=time.monotonic() - 1).result()
+
+
+def test_parse_timeout_is_not_reported_as_busy(pool):
+    with pytest.raises(SandboxTimeoutError) as raised:
+        pool.submit(time.sleep, 30, deadline=time.monotonic() + 0.5).result()
+    assert not isinstance(raised.value, SandboxBusyError)
+
+
+def test_waiting_for_a_split_slot_is_busy(pool):
+    slots = [pool.split_slots.acquire(timeout=5) for _ in range(pool.workers - 1)]
+    assert all(slots)
+    try:
+        with pytest.raises(SandboxBusyError):
+            pdf_extract._run_windowed(pool, len, [("x",)], time.monotonic() + 0.2)
+    finally:
+        for _ in slots:
+            pool.split_slots.release()
+
+
+def test_memory_limit(pool):
+    restarts = pool.restarts
+    with pytest.raises(SandboxMemoryError):
+        pool.submit(bytearray, 1024 ** 3).result()
+    assert pool.restarts == restarts + 1
+    assert pool.submit(len, "still works").result() == 11
+
+
+def test_task_errors_keep_the_worker(pool):
+    restarts = pool.restarts
+    with pytest.raises(SandboxTaskError, match="ValueError"):
+        pool.submit(int, "not a number").result()
+    assert pool.restarts == restarts
+
+
+def test_split_documents_leave_a_worker_free(pool):
+    in_flight = []
+    peak = []
+    lock = threading.Lock()
+
+    def track(_):
+        with lock:
+            in_flight.pop()
+
+    submit = pool.submit
+
+    def counting_submit(func, *args, deadline=None):
+        future = submit(func, *args, deadline=deadline)
+        with lock:
+            in_flight.append(1)
+            peak.append(len(in_flight))
+        future.add_done_callback(track)
+        return future
+
+    pool.submit = counting_submit
+    try:
+        threads = [threading.Thread(target=pdf_extract._run_windowed,
+                                    args=(pool, time.sleep, [(0.05,)] * 6, time.monotonic() + 20))
+                   for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        del pool.submit
+    assert max(peak) <= pool.workers - 1
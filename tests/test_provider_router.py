@@ -0,0 +1,186 @@
+import asyncio
+import time
+
+import pytest
+
+from provider_router import DEFAULT_HEDGE_DELAY, FAILURE_PENALTY, MIN_SAMPLES, HedgedRouter, LatencyTracker, Route, parse_routes
+from providers import FakeProvider
+
+MESSAGES = [{"role": "user", "content": "Analyze this resume."}]
+
+
+class TrackedProvider(FakeProvider):
+    """``FakeProvider`` with a fixed reply that counts requests cancelled or streams closed early."""
+
+    def __init__(self, reply, **kwargs):
+        super().__init__(responder=lambda prompt: reply, **kwargs)
+        self.cancelled = 0
+        self.closed = 0
+
+    async def complete(self, *args):
+        try:
+            return await super().complete(*args)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+    async def stream(self, *args):
+        finished = False
+        try:
+            async for chunk in super().stream(*args):
+                yield chunk
+            finished = True
+        finally:
+            if not finished:
+                self.closed += 1
+
+
+def measured(tracker, route, kind, *samples):
+    for seconds in samples:
+        tracker.succeeded(route.name, kind, seconds)
+
+
+def complete(router):
+    async def run():
+        started = time.monotonic()
+        text = await router.complete(MESSAGES, "gpt-4o", 0.7, 1.0)
+        # Let cancelled requests unwind before the loop is inspected.
+        await asyncio.sleep(0.05)
+        return text, time.monotonic() - started
+
+    return asyncio.run(run())
+
+
+def stream(router):
+    async def run():
+        chunks = [chunk async for chunk in router.stream(MESSAGES, "gpt-4o", 0.7, 1.0)]
+        await asyncio.sleep(0.05)
+        return "".join(chunks)
+
+    return asyncio.run(run())
+
+
+def counts(tracker, route, kind):
+    return next(row for row in tracker.stats() if row["route"] == route.name and row["kind"] == kind)
+
+
+def test_slow_route_is_hedged_and_the_loser_cancelled():
+    slow = Route(TrackedProvider("slow", latency=2.0), "slow")
+    fast = Route(TrackedProvider("fast", latency=0.05), "fast")
+    tracker = LatencyTracker()
+    measured(tracker, slow, "complete", *[0.1] * MIN_SAMPLES)
+    measured(tracker, fast, "complete", *[0.2] * MIN_SAMPLES)
+    router = HedgedRouter([slow, fast], tracker=tracker)
+    assert router.ordered_routes("complete") == [slow, fast]
+
+    text, elapsed = complete(router)
+    assert text == "fast"
+    assert elapsed < 1.0
+    assert slow.provider.cancelled == 1
+    assert counts(tracker, fast, "complete")["hedged"] == 1
+    # The cancelled request still counts as a (slow) latency sample.
+    assert len(tracker._samples[(slow.name, "complete")]) == MIN_SAMPLES + 1
+
+
+def test_no_hedge_when_the_first_route_answers_in_time():
+    first = Route(TrackedProvider("first", latency=0.01), "first")
+    second = Route(TrackedProvider("second", latency=0.01), "second")
+    text, _ = complete(HedgedRouter([first, second]))
+    assert text == "first"
+    assert second.provider.calls == 0
+
+
+def test_failing_route_fails_over_without_waiting_for_the_hedge_delay():
+    broken = Route(TrackedProvider("broken", failure_rate=1.0), "broken")
+    healthy = Route(TrackedProvider("healthy", latency=0.05), "healthy")
+    router = HedgedRouter([broken, healthy])
+    text, elapsed = complete(router)
+    assert text == "healthy"
+    assert elapsed < DEFAULT_HEDGE_DELAY / 2
+    assert counts(router.tracker, broken, "complete")["failures"] == 1
+
+
+def test_empty_reply_fails_over():
+    empty = Route(TrackedProvider("", latency=0.01), "empty")
+    full = Route(TrackedProvider("full", latency=0.01), "full")
+    assert complete(HedgedRouter([empty, full]))[0] == "full"
+
+
+def test_last_error_is_raised_when_every_route_fails():
+    routes = [Route(TrackedProvider("x", failure_rate=1.0), name) for name in ("a", "b")]
+    with pytest.raises(ConnectionError):
+        complete(HedgedRouter(routes))
+
+
+def test_hedge_after_failover_uses_the_route_in_flight():
+    broken = Route(TrackedProvider("broken", failure_rate=1.0), "broken")
+    slow = Route(TrackedProvider("slow", latency=2.0), "slow")
+    fast = Route(TrackedProvider("fast", latency=0.05), "fast")
+    tracker = LatencyTracker()
+    # The failing route's own hedge delay is long; the route that replaces it is quick to hedge.
+    measured(tracker, broken, "complete", *[0.01] * 8, 5.0, 5.0)
+    measured(tracker, slow, "complete", *[0.1] * MIN_SAMPLES)
+    measured(tracker, fast, "complete", *[0.2] * MIN_SAMPLES)
+    router = HedgedRouter([broken, slow, fast], tracker=tracker)
+    assert router.ordered_routes("complete") == [broken, slow, fast]
+    assert router.hedge_delay(broken, "complete") >= 4.0
+
+    text, elapsed = complete(router)
+    assert text == "fast"
+    assert elapsed < 1.0
+    assert slow.provider.cancelled == 1
+
+
+def test_latency_tracker_reorders_routes():
+    first = Route(TrackedProvider("first"), "first")
+    second = Route(TrackedProvider("second"), "second")
+    tracker = LatencyTracker()
+    router = HedgedRouter([first, second], tracker=tracker)
+    assert router.ordered_routes("complete") == [first, second]
+    measured(tracker, first, "complete", *[1.0] * MIN_SAMPLES)
+    measured(tracker, second, "complete", *[0.2] * MIN_SAMPLES)
+    assert router.ordered_routes("complete") == [second, first]
+    # Kinds are tracked separately.
+    assert router.ordered_routes("stream") == [first, second]
+    for _ in range(MIN_SAMPLES + 1):
+        tracker.failed(second.name, "complete")
+    assert tracker.score(second.name, "complete") == FAILURE_PENALTY
+    assert router.ordered_routes("complete") == [first, second]
+
+
+def test_hedge_delay_is_clamped_percentile():
+    route = Route(TrackedProvider("x"), "x")
+    tracker = LatencyTracker()
+    router = HedgedRouter([route], tracker=tracker)
+    assert router.hedge_delay(route, "complete") == DEFAULT_HEDGE_DELAY
+    measured(tracker, route, "complete", *[0.001] * MIN_SAMPLES)
+    assert router.hedge_delay(route, "complete") == pytest.approx(0.05)
+    measured(tracker, route, "complete", *[100.0] * 50)
+    assert router.hedge_delay(route, "complete") == 30.0
+
+
+def test_stream_hedge_keeps_the_winner_and_closes_the_loser():
+    # Both routes share the provider name "fake", so streams must be told apart by route.
+    slow = Route(TrackedProvider("slow stream " * 10, latency=2.0, first_chunk_latency=2.0))
+    fast = Route(TrackedProvider("fast stream " * 10, latency=0.1, first_chunk_latency=0.02, chunk_size=7))
+    assert slow.name == fast.name
+    tracker = LatencyTracker()
+    measured(tracker, slow, "stream", *[0.05] * MIN_SAMPLES)
+    router = HedgedRouter([slow, fast], tracker=tracker)
+
+    assert stream(router) == "fast stream " * 10
+    assert slow.provider.closed == 1
+    assert fast.provider.closed == 0
+
+
+def test_routes_need_at_least_one_entry():
+    with pytest.raises(ValueError):
+        HedgedRouter([])
+
+
+def test_parse_routes():
+    routes = parse_routes("fake:gpt-4o, fake ,")
+    assert [route.name for route in routes] == ["fake:gpt-4o", "fake"]
+    assert [route.model for route in routes] == ["gpt-4o", None]
+    assert all(isinstance(route.provider, FakeProvider) for route in routes)
+
@@ -0,0 +1,53 @@
+import json
+
+import pandas as pd
+
+from providers import fake_quiz
+from quiz_scoring import flatten_attempts, performance_rating, question_key, score_attempts, score_quiz
+
+QUIZ = json.loads(fake_quiz(["Python", "Machine Learning"], questions_per_skill=2))
+
+
+def test_score_quiz():
+    answers = {question_key("Python", 0): "a", question_key("Python", 1): "a",
+               question_key("Machine Learning", 0): "a"}
+    result = score_quiz(QUIZ, answers)
+    assert (result["score"], result["total"], result["percentage"]) == (2, 4, 50.0)
+    assert result["rating"] == "Average"
+    skills = result["skills"].set_index("skill")
+    assert skills.loc["Python", "correct"] == 1
+    assert skills.loc["Machine Learning", "correct"] == 1
+    assert result["results"]["status"].tolist() == ["Correct", "Incorrect", "Correct", "Incorrect"]
+
+
+def test_unanswered_quiz():
+    result = score_quiz(QUIZ, {})
+    assert (result["score"], result["total"], result["rating"]) == (0, 4, "Needs Improvement")
+
+
+def test_question_keys_have_no_spaces():
+    assert question_key("Machine Learning", 1) == "Machine_Learning_1"
+
+
+def test_performance_rating_thresholds():
+    assert [performance_rating(p) for p in (0, 40, 59.9, 60, 80, 100)] == [
+        "Needs Improvement", "Average", "Average", "Good", "Excellent", "Excellent"]
+    assert performance_rating(pd.Series([10.0, 90.0]).to_numpy()).tolist() == ["Needs Improvement", "Excellent"]
+
+
+def test_score_attempts_matches_score_quiz():
+    submissions = {
+        "first": {question_key("Python", 0): "a", question_key("Machine Learning", 1): "b"},
+        "second": {question_key("Python", 1): "a"},
+    }
+    stored = {attempt_id: score_quiz(QUIZ, answers)["results"].to_dict("records")
+              for attempt_id, answers in submissions.items()}
+    # Stored answer keys may be upper-case.
+    stored["second"][0]["correct_answer"] = "A"
+    attempts, skills = score_attempts(flatten_attempts(stored))
+    attempts = attempts.set_index("attempt_id")
+    for attempt_id, answers in submissions.items():
+        expected = score_quiz(QUIZ, answers)
+        assert attempts.loc[attempt_id, "score"] == expected["score"]
+        assert attempts.loc[attempt_id, "rating"] == expected["rating"]
+    assert len(skills) == 4
@@ -0,0 +1,77 @@
+import io
+
+import pytest
+
+import report_builder
+from pdf_extract import extract_text
+from report_builder import (build_report, iter_html, iter_text, preview_text, quiz_section, text_section,
+                            write_report)
+
+QUIZ_RESULTS = {
+    "attempt_id": "attempt-1",
+    "score": 1,
+    "total": 2,
+    "detailed_results": [
+        {"skill": "Python", "question": "What is a list?", "user_answer": "a", "correct_answer": "a",
+         "status": "Correct"},
+        {"skill": "SQL", "question": "What is a JOIN?", "user_answer": None, "correct_answer": "b",
+         "status": "Incorrect"},
+    ],
+}
+
+
+def sections():
+    return [text_section("resume_analysis", "Resume Analysis", "Strong <Python> skills."),
+            quiz_section(QUIZ_RESULTS)]
+
+
+def test_text_report():
+    text = "".join(iter_text(sections()))
+    assert text.startswith("----- RESUME ANALYSIS -----\nStrong <Python> skills.\n\n----- QUIZ RESULTS -----\n")
+    assert "Score: 1 out of 2" in text
+    assert "Your answer: -; correct answer: b" in text
+
+
+def test_html_report_escapes_text():
+    html = "".join(iter_html(sections()))
+    assert "Strong &lt;Python&gt; skills." in html
+    assert '<section id="quiz_results">' in html
+    assert html.endswith("</body></html>\n")
+
+
+@pytest.mark.parametrize("fmt", ["txt", "html", "pdf"])
+def test_write_report_streams_every_byte(fmt):
+    fh = io.BytesIO()
+    written = write_report(sections(), fmt, fh)
+    assert written == len(fh.getvalue()) > 0
+    assert fh.getvalue() == build_report(sections(), fmt)
+
+
+def test_pdf_report_can_be_read_back():
+    text = extract_text(build_report(sections(), "pdf"))
+    assert "RESUME ANALYSIS" in text and "QUIZ RESULTS" in text
+    assert "What is a JOIN?" in text
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        write_report(sections(), "docx", io.BytesIO())
+
+
+def test_unchanged_sections_are_not_rendered_again(monkeypatch):
+    first = build_report(sections(), "txt")
+    monkeypatch.setattr(report_builder, "iter_report", lambda *args: pytest.fail("report was re-rendered"))
+    assert build_report(sections(), "txt") == first
+
+
+def test_changed_section_is_rendered():
+    first = build_report(sections(), "txt")
+    changed = [text_section("resume_analysis", "Resume Analysis", "Updated."), quiz_section(QUIZ_RESULTS)]
+    assert build_report(changed, "txt") != first
+
+
+def test_preview_is_truncated():
+    long = [text_section("resume_analysis", "Resume Analysis", "x" * 10000)]
+    preview = preview_text(long, limit=100)
+    assert len(preview) == 100 + len("\n...")
+    assert preview.endswith("\n...")
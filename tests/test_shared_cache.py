@@ -0,0 +1,162 @@
+import threading
+import time
+
+import pytest
+
+from shared_cache import SharedCache
+
+
+def test_single_flight():
+    cache = SharedCache()
+    calls = []
+    started = threading.Event()
+
+    def compute():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return "value"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute("key", compute)))
+               for _ in range(5)]
+    threads[0].start()
+    started.wait()
+    for thread in threads[1:]:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ["value"] * 5
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert (stats["misses"], stats["waits"]) == (1, 4)
+    assert cache.get_or_compute("key", compute) == "value" and len(calls) == 1
+
+
+def test_errors_reach_waiters_and_are_not_cached():
+    cache = SharedCache()
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.1)
+        raise ValueError("boom")
+
+    errors = []
+
+    def call():
+        try:
+            cache.get_or_compute("key", fail)
+        except ValueError as e:
+            errors.append(str(e))
+
+    first = threading.Thread(target=call)
+    first.start()
+    started.wait()
+    second = threading.Thread(target=call)
+    second.start()
+    first.join()
+    second.join()
+    assert errors == ["boom", "boom"]
+    assert cache.get_or_compute("key", lambda: "ok") == "ok"
+
+
+def test_cache_if():
+    cache = SharedCache()
+    assert cache.get_or_compute("key", lambda: "", cache_if=bool) == ""
+    assert cache.get("key") is None
+
+
+def test_lru_eviction_by_size():
+    cache = SharedCache(max_bytes=300)
+    cache.put("a", "x" * 100)
+    cache.put("b", "y" * 100)
+    cache.get("a")
+    cache.put("c", "z" * 100)
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_oversized_values_are_not_kept():
+    cache = SharedCache(max_bytes=10)
+    cache.put("big", "x" * 100)
+    assert cache.get("big") is None
+
+
+@pytest.mark.parametrize("value", ["text", b"bytes", {"a": [1, 2]}, ("tuple", object)])
+def test_any_value_can_be_stored(value):
+    cache = SharedCache()
+    cache.put("key", value)
+    assert cache.get("key") is value
+
+
+def test_streams_are_single_flight():
+    cache = SharedCache()
+    calls = []
+    started = threading.Event()
+
+    def produce():
+        calls.append(1)
+        started.set()
+        for chunk in ("Hello", ", ", "world"):
+            time.sleep(0.05)
+            yield chunk
+
+    leader = cache.iter_or_compute("key", produce)
+    assert next(leader) == "Hello"
+    started.wait()
+    follower_chunks = []
+    follower = threading.Thread(target=lambda: follower_chunks.extend(cache.iter_or_compute("key", produce)))
+    follower.start()
+    assert list(leader) == [", ", "world"]
+    follower.join()
+    assert follower_chunks == ["Hello, world"]
+    assert list(cache.iter_or_compute("key", produce)) == ["Hello, world"]
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert (stats["misses"], stats["waits"], stats["hits"]) == (1, 1, 1)
+
+
+def test_unfinished_streams_are_not_cached():
+    cache = SharedCache()
+    stream = cache.iter_or_compute("key", lambda: iter(["partial", " text"]))
+    assert next(stream) == "partial"
+    stream.close()
+    assert cache.get("key") is None
+    assert list(cache.iter_or_compute("key", lambda: iter(["full text"]))) == ["full text"]
+
+
+def test_stream_errors_reach_waiters():
+    cache = SharedCache()
+
+    def produce():
+        yield "partial"
+        time.sleep(0.1)
+        raise ConnectionError("provider down")
+
+    errors = []
+
+    def wait():
+        try:
+            list(cache.iter_or_compute("key", produce))
+        except ConnectionError as e:
+            errors.append(str(e))
+
+    leader = cache.iter_or_compute("key", produce)
+    assert next(leader) == "partial"
+    follower = threading.Thread(target=wait)
+    follower.start()
+    time.sleep(0.02)
+    with pytest.raises(ConnectionError):
+        list(leader)
+    follower.join()
+    assert errors == ["provider down"]
+    assert cache.get("key") is None
+
+
+def test_stream_cache_if():
+    cache = SharedCache()
+    assert list(cache.iter_or_compute("key", lambda: iter(["Error: rate limited"]),
+                                      cache_if=lambda text: not text.startswith("Error"))) == ["Error: rate limited"]
+    assert cache.get("key") is None
@@ -0,0 +1,40 @@
+import threading
+
+import pytest
+
+import app
+from llm_client import get_llm_client, use_provider
+from providers import FakeProvider
+
+
+@pytest.fixture
+def provider():
+    previous = get_llm_client()
+    provider = use_provider(FakeProvider(latency=0.3, first_chunk_latency=0.05)).provider
+    yield provider
+    get_llm_client.replace(previous)
+
+
+def test_concurrent_streams_from_different_sessions_share_one_model_call(provider):
+    resume = "Jane Doe\nSkills\nPython, SQL, Docker\nShared stream test resume"
+    results = {}
+
+    def analyze(owner):
+        results[owner] = "".join(app.analyze_resume(resume, stream=True, owner=owner))
+
+    threads = [threading.Thread(target=analyze, args=(owner,)) for owner in ("first", "second", "third")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert provider.calls == 1
+    assert len(set(results.values())) == 1
+    assert results["first"].startswith("**Summary.**")
+
+
+def test_identical_analyses_share_one_model_call(provider):
+    resume = "John Roe\nSkills\nJava, Kubernetes\nShared completion test resume"
+    first = app.analyze_resume(resume, owner="first")
+    second = "".join(app.analyze_resume(resume, stream=True, owner="second"))
+    assert first == second.strip()
+    assert provider.calls == 1
@@ -0,0 +1,83 @@
+import pytest
+
+from skill_extractor import AhoCorasick, extract_profile, extract_skills, segment_sections
+
+
+def names(text):
+    return {skill["name"] for skill in extract_skills(text)}
+
+
+def test_aho_corasick_finds_overlapping_patterns():
+    matcher = AhoCorasick([("he", 1), ("she", 2), ("his", 3), ("hers", 4)])
+    matches = {(start, end, value) for start, end, _, value in matcher.iter_matches("ushers")}
+    assert matches == {(1, 4, 2), (2, 4, 1), (2, 6, 4)}
+
+
+def test_aho_corasick_without_matches():
+    assert list(AhoCorasick([("abc", None)]).iter_matches("ababab")) == []
+
+
+def test_aliases_map_to_canonical_names():
+    assert {"Python", "JavaScript", "Go"} <= names("Built services in python3, ES6 and golang.")
+
+
+def test_longest_match_wins():
+    found = names("Frontend in React.js and Node.js.")
+    assert "JavaScript" not in found
+
+
+def test_word_boundaries():
+    assert "Java" not in names("Wrote JavaScript widgets.")
+    assert {"C++", "C#"} <= names("Skills: C++, C#")
+
+
+@pytest.mark.parametrize("text", [
+    "Known as the go-to person for onboarding.",
+    "Led the R&D budget review.",
+    "Final exam Grade: C",
+    "I excel in customer service and express ideas clearly.",
+    "Swift learner who enjoys new challenges.",
+    "Shift supervisor at Ruby Tuesday.",
+    "Saranya R",
+    "K. C. Rao",
+    "Vitamin C",
+    "Led team C to the finals.",
+    "Contact: ml@acme.com",
+    "Let's go. Go team!",
+])
+def test_common_words_are_not_skills(text):
+    assert names(text) == set()
+
+
+def test_initials_are_not_skills():
+    skills = extract_skills("John C. Smith\nPython and SQL developer")
+    assert [skill["name"] for skill in skills] == ["Python", "SQL"]
+
+
+@pytest.mark.parametrize("text", [
+    "Skills\nC\nR\nGo\n",
+    "Languages: Python, C, R and Go.",
+    "Projects\n- Python\n- C\n- R\n- Go\n",
+    "Projects\n\u2022 Python\n\u2022 C\n\u2022 R\n\u2022 Go\n",
+])
+def test_letters_count_in_skill_lists(text):
+    assert {"C", "R", "Go"} <= names(text)
+
+
+def test_common_word_terms_count_in_skills_section_and_lists():
+    assert {"Excel", "Swift"} <= names("Skills\nExcel\nSwift\n")
+    assert "Excel" in names("Reporting with Python, Excel and SQL.")
+
+
+def test_skills_section_mentions_rank_first():
+    text = "Experience\nUsed Docker and Docker daily.\nSkills\nPython\n"
+    skills = extract_skills(text)
+    assert skills[0]["name"] == "Python"
+    assert skills[0]["sections"] == ["skills"]
+
+
+def test_sections():
+    text = "Jane Doe\nEducation\nBSc Computer Science\nWork Experience\nEngineer at Acme\n"
+    assert [name for name, _, _ in segment_sections(text)][-2:] == ["education", "experience"]
+    profile = extract_profile(text)
+    assert "BSc Computer Science" in profile["sections"]["education"]
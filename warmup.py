@@ -0,0 +1,57 @@
+"""Background warm-up of heavy dependencies after the first page render.
+
+The app imports pandas, Plotly, SciPy, PyArrow and the model provider's
+client lazily, in the code paths that use them, and starts the PDF sandbox
+workers on the first upload, so a new server process renders its first page
+without waiting for any of them. Once that render is done the app calls
+``start_warmup``, which loads them on a daemon thread; the first page that
+needs one usually finds it ready. Each step is
+recorded as a ``warmup`` metrics span, so the Metrics page also shows what
+the cold start would have cost. Set ``RESUME_ANALYZER_WARMUP=0`` to disable.
+"""
+import importlib
+import os
+import threading
+
+from llm_client import get_llm_client
+from metrics import timed
+from pdf_extract import warm_up_workers
+
+WARMUP_ENABLED = os.environ.get("RESUME_ANALYZER_WARMUP", "1") != "0"
+WARMUP_MODULES = ("pandas", "plotly.express", "scipy.sparse", "pyarrow.parquet")
+
+_started = False
+_started_lock = threading.Lock()
+
+
+def warm_up():
+    """Import the heavy modules and prepare the model provider; failures are left for the real call."""
+    for module in WARMUP_MODULES:
+        try:
+            with timed("warmup", label=module):
+                importlib.import_module(module)
+        except Exception:
+            pass
+    try:
+        with timed("warmup", label="pdf_sandbox"):
+            warm_up_workers()
+    except Exception:
+        pass
+    try:
+        with timed("warmup", label="provider"):
+            get_llm_client().provider.warm_up()
+    except Exception:
+        pass
+
+
+def start_warmup():
+    """Start ``warm_up`` on a background thread, once per process; return whether it was started."""
+    global _started
+    if not WARMUP_ENABLED:
+        return False
+    with _started_lock:
+        if _started:
+            return False
+        _started = True
+    threading.Thread(target=warm_up, name="warmup", daemon=True).start()
+    return True